@@ -1,22 +1,86 @@
 import logging
+import time
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.core.exceptions import BadRequest
 from django.http import Http404
 from django.shortcuts import render
 
+from core.request_memo import request_memo
 from datahub_client.exceptions import ConnectivityError
+from datahub_client.metrics import request_timings
 
 logger = logging.getLogger(__name__)
 
 
-class CustomErrorMiddleware:
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that can run under both WSGI and ASGI, so that async views
+    are not moved onto a thread to pass through it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         return self.get_response(request)
 
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+
+class RequestMemoMiddleware(AsyncCapableMiddleware):
+    """
+    Lets catalogue lookups, such as subject areas, be shared by everything that
+    handles a request rather than repeated by the form, service and view.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_memo():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with request_memo():
+            return await self.get_response(request)
+
+
+class ServerTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Reports how long a request spent on graphql queries and parsing in the
+    Server-Timing header, so the cause of a slow page can be seen in the browser.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with request_timings() as timings:
+            response = self.get_response(request)
+        return self._add_header(response, timings, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with request_timings() as timings:
+            response = await self.get_response(request)
+        return self._add_header(response, timings, start)
+
+    def _add_header(self, response, timings, start):
+        timings.add("total", time.perf_counter() - start)
+        response["Server-Timing"] = timings.server_timing()
+        return response
+
+
+class CustomErrorMiddleware(AsyncCapableMiddleware):
     def process_exception(self, request, exception):
         logger.exception(exception)
         if settings.DEBUG:
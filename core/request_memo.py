@@ -0,0 +1,34 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+_request_memo: ContextVar[dict[str, Any] | None] = ContextVar("request_memo", default=None)
+
+
+@contextmanager
+def request_memo() -> Iterator[dict[str, Any]]:
+    """
+    Start a memo that lasts until the end of the block, e.g. for the duration of a request.
+    """
+    memo: dict[str, Any] = {}
+    token = _request_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _request_memo.reset(token)
+
+
+def memoize(key: str, compute: Callable[[], Any]) -> Any:
+    """
+    Return the value stored under `key` in the current request's memo, computing it
+    on first use. Values are computed every time when there is no active memo,
+    e.g. in management commands.
+    """
+    memo = _request_memo.get()
+    if memo is None:
+        return compute()
+
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
@@ -57,6 +57,7 @@ if os.environ.get("AZURE_AUTH_ENABLED", "true") != "false":
 MIDDLEWARE: list[str] = [
     "django.middleware.gzip.GZipMiddleware",
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
+    "core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -65,6 +66,7 @@ MIDDLEWARE: list[str] = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.RequestMemoMiddleware",
     "core.middleware.CustomErrorMiddleware",
     "waffle.middleware.WaffleMiddleware",
     # Prometheus needs to be the last middleware in the list.
@@ -152,6 +154,41 @@ STATICFILES_FINDERS = (
 CATALOGUE_URL = os.environ.get("CATALOGUE_URL")
 CATALOGUE_TOKEN = os.environ.get("CATALOGUE_TOKEN")
 
+# Each worker process shares one catalogue client and keep-alive connection pool
+# between its threads. The pool should be at least as large as the number of threads.
+CATALOGUE_POOL_CONNECTIONS = int(os.environ.get("CATALOGUE_POOL_CONNECTIONS", 10))
+CATALOGUE_POOL_MAXSIZE = int(os.environ.get("CATALOGUE_POOL_MAXSIZE", 10))
+# The async views are not limited by the number of threads, so their connections to GMS
+# are capped separately.
+CATALOGUE_ASYNC_MAX_CONNECTIONS = int(os.environ.get("CATALOGUE_ASYNC_MAX_CONNECTIONS", 100))
+CATALOGUE_TIMEOUT_SECONDS = float(os.environ.get("CATALOGUE_TIMEOUT_SECONDS", 30))
+CATALOGUE_RETRY_MAX_TIMES = int(os.environ.get("CATALOGUE_RETRY_MAX_TIMES", 4))
+# Rebuild the client (reconnecting to GMS) once it is older than this. 0 disables recycling.
+CATALOGUE_CLIENT_MAX_AGE_SECONDS = int(os.environ.get("CATALOGUE_CLIENT_MAX_AGE_SECONDS", 3600))
+# Send graphql queries to GMS as hashes rather than full text. This falls back to
+# full text if GMS does not support persisted queries.
+CATALOGUE_PERSISTED_QUERIES = os.environ.get("CATALOGUE_PERSISTED_QUERIES", "false") in TRUTHY_VALUES
+# Check the graphql query files are well formed when the app starts
+CATALOGUE_VALIDATE_GRAPHQL_ON_STARTUP = (
+    os.environ.get("CATALOGUE_VALIDATE_GRAPHQL_ON_STARTUP", "false") in TRUTHY_VALUES
+)
+
+# GMS responses are logged at DEBUG level, cut to this many characters, for this
+# fraction of queries. The full responses to the queries named in
+# CATALOGUE_RESPONSE_LOG_QUERIES (space separated, e.g. "search getTags") are
+# logged at INFO level, for troubleshooting.
+CATALOGUE_RESPONSE_LOG_MAX_CHARS = int(os.environ.get("CATALOGUE_RESPONSE_LOG_MAX_CHARS", 2000))
+CATALOGUE_RESPONSE_LOG_SAMPLE_RATE = float(os.environ.get("CATALOGUE_RESPONSE_LOG_SAMPLE_RATE", 1.0))
+CATALOGUE_RESPONSE_LOG_QUERIES = frozenset(os.environ.get("CATALOGUE_RESPONSE_LOG_QUERIES", "").split())
+
+# Independent GMS queries for a page (e.g. search results and entity type counts)
+# are sent in parallel from a bounded per-worker thread pool.
+CATALOGUE_CONCURRENT_QUERIES = os.environ.get("CATALOGUE_CONCURRENT_QUERIES", "true") in TRUTHY_VALUES
+CATALOGUE_QUERY_MAX_WORKERS = int(os.environ.get("CATALOGUE_QUERY_MAX_WORKERS", 8))
+# Bulk work such as exports runs on its own smaller pool, capped below the size of the
+# query pool, so that it cannot hold up queries for interactive pages.
+CATALOGUE_BULK_QUERY_MAX_WORKERS = int(os.environ.get("CATALOGUE_BULK_QUERY_MAX_WORKERS", 2))
+
 ENV = os.environ.get("ENV")
 
 DATABASES = {
@@ -173,6 +210,12 @@ GOV_UK_SUFFIX = "GOV.UK"
 
 MAX_RESULTS = 10_000
 
+# Tables, schemas and charts listed per page on database, schema and dashboard pages
+DETAILS_ENTITIES_PER_PAGE = int(os.environ.get("DETAILS_ENTITIES_PER_PAGE", 50))
+
+# Log everything in development, but not per-request debug output in production
+DJANGO_LOG_LEVEL = os.environ.get("DJANGO_LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
+
 LOGGING = {
     "version": 1,  # the dictConfig format version
     "disable_existing_loggers": False,  # retain the default loggers
@@ -191,11 +234,11 @@ LOGGING = {
     },
     "root": {
         "handlers": ["console"],
-        "level": os.environ.get("DJANGO_LOG_LEVEL", "DEBUG"),
+        "level": DJANGO_LOG_LEVEL,
     },
     "loggers": {
         "django": {
-            "level": os.environ.get("DJANGO_LOG_LEVEL", "DEBUG"),
+            "level": DJANGO_LOG_LEVEL,
             "handlers": ["console"],
             "propagate": False,
         },
@@ -205,6 +248,63 @@ LOGGING = {
 # Cache Configuration
 CACHES = generate_cache_configuration()
 
+# The catalogue version changes whenever an entity displayed in the catalogue is ingested,
+# added or removed. It is polled from GMS in the background at most this often, and the
+# catalogue caches below are keyed on it, so they roll over soon after each ingestion.
+CATALOGUE_VERSION_POLL_SECONDS = int(os.environ.get("CATALOGUE_VERSION_POLL_SECONDS", 60))
+CATALOGUE_VERSION_MAX_AGE_SECONDS = int(os.environ.get("CATALOGUE_VERSION_MAX_AGE_SECONDS", 86400))
+
+# Parsed entity details are cached in the shared cache. Entries older than the revalidate
+# period are checked against the entity's lastIngested timestamp before being served,
+# unless the catalogue version has not changed since. Set an entity type's TTL to 0 to
+# disable caching for it.
+CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS = int(os.environ.get("CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS", 86400))
+CATALOGUE_DETAILS_CACHE_REVALIDATE_SECONDS = int(os.environ.get("CATALOGUE_DETAILS_CACHE_REVALIDATE_SECONDS", 60))
+# Urns that GMS reports as not existing are remembered for this long, so repeated
+# requests for bad links return 404 without querying GMS.
+CATALOGUE_MISSING_ENTITY_CACHE_TTL_SECONDS = int(os.environ.get("CATALOGUE_MISSING_ENTITY_CACHE_TTL_SECONDS", 300))
+# Entity names used to label breadcrumbs and parent entities
+CATALOGUE_ENTITY_HEADERS_CACHE_TTL_SECONDS = int(os.environ.get("CATALOGUE_ENTITY_HEADERS_CACHE_TTL_SECONDS", 86400))
+CATALOGUE_DETAILS_CACHE_TTL_SECONDS: dict[str, int] = {
+    "table": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+    "database": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+    "schema": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+    "chart": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+    "dashboard": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+    "publication_collection": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+    "publication_dataset": CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+}
+
+# Subject areas and search tags are served from the cache for the soft TTL, then served
+# stale while a single worker refreshes them, until they are evicted after the hard TTL.
+# They also go stale when the catalogue version changes.
+CATALOGUE_OPTIONS_CACHE_SOFT_TTL_SECONDS = int(os.environ.get("CATALOGUE_OPTIONS_CACHE_SOFT_TTL_SECONDS", 3600))
+CATALOGUE_OPTIONS_CACHE_HARD_TTL_SECONDS = int(os.environ.get("CATALOGUE_OPTIONS_CACHE_HARD_TTL_SECONDS", 86400))
+CATALOGUE_OPTIONS_CACHE_BACKGROUND_REFRESH = (
+    os.environ.get("CATALOGUE_OPTIONS_CACHE_BACKGROUND_REFRESH", "false") in TRUTHY_VALUES
+)
+
+# Entity type counts do not change when paging through or re-sorting search results,
+# so they are cached per query, filters and catalogue version.
+CATALOGUE_ENTITY_TYPE_COUNTS_CACHE_TTL_SECONDS = int(
+    os.environ.get("CATALOGUE_ENTITY_TYPE_COUNTS_CACHE_TTL_SECONDS", 3600)
+)
+
+# Search facets and tags do not change from page to page either, so they are fetched
+# in a separate query and cached per query, filters, entity types and catalogue version.
+# Set to 0 to fetch them with each page of results instead.
+CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS = int(
+    os.environ.get("CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS", 3600)
+)
+
+# The precompute_browse_pages command builds this many pages of the home page and each
+# subject area browse, which are served until the catalogue version changes.
+CATALOGUE_BROWSE_PRECOMPUTE_PAGES = int(os.environ.get("CATALOGUE_BROWSE_PRECOMPUTE_PAGES", 3))
+CATALOGUE_BROWSE_PAGES_CACHE_TTL_SECONDS = int(os.environ.get("CATALOGUE_BROWSE_PAGES_CACHE_TTL_SECONDS", 86400))
+
+# Bulk exports fetch the details of this many tables at a time, on the bulk query thread pool.
+CATALOGUE_EXPORT_BATCH_SIZE = int(os.environ.get("CATALOGUE_EXPORT_BATCH_SIZE", 20))
+
 ANALYTICS_ID: str = os.environ.get("ANALYTICS_ID", "")
 GOOGLE_TAG_MANAGER_ID: str = os.environ.get("GOOGLE_TAG_MANAGER_ID", "")
 ENABLE_ANALYTICS: bool = (os.environ.get("ENABLE_ANALYTICS") in TRUTHY_VALUES) and ANALYTICS_ID != ""
@@ -0,0 +1,285 @@
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from datahub_client import metrics
+from datahub_client.entities import Entity, EntityHeader
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    """
+    The subset of the Django cache API used by the catalogue client, and by its async methods.
+    The client does not depend on Django, so the backend is passed in by the caller.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any: ...
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None: ...
+
+    async def aget(self, key: str, default: Any = None) -> Any: ...
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+
+    async def aset(self, key: str, value: Any, timeout: float | None = None) -> None: ...
+
+
+def make_cache_key(prefix: str, *parts: str) -> str:
+    """
+    Build a cache key from arbitrary strings such as urns, which can be longer
+    than cache backends allow and contain characters they reject.
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+@dataclass
+class CachedEntity:
+    entity: Entity
+    last_ingested: int | None
+    checked_at: float
+    # The catalogue version when the entity was fetched or last checked
+    catalogue_version: str | None = None
+
+
+class EntityDetailsCache:
+    """
+    Caches parsed entity models returned by the get_*_details methods of the client.
+
+    Entries are stored for a TTL that can be set per entity type. Within
+    `revalidate_after_seconds` of being fetched or checked an entry is served without
+    contacting GMS. After that, the entity's lastIngested timestamp is looked up, which is
+    a much smaller query than fetching the details: if it is unchanged the entry is served
+    again, otherwise the entity is fetched and parsed again.
+
+    If `catalogue_version` is given, it is called to get a token that changes whenever
+    anything in the catalogue is ingested. Entries are then served without checking
+    lastIngested for as long as the token is unchanged, and the entity headers and
+    missing urns are cached under it, so they are forgotten after each ingestion.
+
+    The methods starting with `a` do the same for the client's async methods, using the
+    backend's async API. `catalogue_version` is still called synchronously, so it should
+    not block, e.g. by being read once per request before the async methods are used.
+    """
+
+    key_prefix = "entity_details"
+    missing_key_prefix = "entity_missing"
+    header_key_prefix = "entity_header"
+    # Part of every key, as entries are pickled models. Bump this whenever the entity or
+    # header models change shape, so entries cached by the previous release are ignored
+    schema_version = 1
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: Mapping[str, int] | None = None,
+        default_ttl_seconds: int = 3600,
+        revalidate_after_seconds: int = 60,
+        missing_ttl_seconds: int = 300,
+        header_ttl_seconds: int = 3600,
+        catalogue_version: Callable[[], str | None] | None = None,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds or {}
+        self.default_ttl_seconds = default_ttl_seconds
+        self.revalidate_after_seconds = revalidate_after_seconds
+        self.missing_ttl_seconds = missing_ttl_seconds
+        self.header_ttl_seconds = header_ttl_seconds
+        self.catalogue_version = catalogue_version
+
+    def ttl_for(self, entity_type: str) -> int:
+        return self.ttl_seconds.get(entity_type, self.default_ttl_seconds)
+
+    def _current_version(self) -> str | None:
+        return self.catalogue_version() if self.catalogue_version else None
+
+    def _make_key(self, prefix: str, *parts: str) -> str:
+        return make_cache_key(f"{prefix}:v{self.schema_version}", *parts)
+
+    def _versioned_key(self, prefix: str, version: str | None, *parts: str) -> str:
+        if version:
+            return self._make_key(prefix, *parts, version)
+        return self._make_key(prefix, *parts)
+
+    def key_for(self, entity_type: str, urn: str, variant: str = "") -> str:
+        if variant:
+            return self._make_key(self.key_prefix, entity_type, urn, variant)
+        return self._make_key(self.key_prefix, entity_type, urn)
+
+    def get_or_fetch(
+        self,
+        entity_type: str,
+        urn: str,
+        fetch: Callable[[], tuple[Entity, int | None]],
+        get_last_ingested: Callable[[], int | None],
+        variant: str = "",
+    ) -> Entity:
+        """
+        Return the cached entity for the urn, calling `fetch` to get the entity and its
+        lastIngested timestamp if there is no usable cache entry. Entities fetched with
+        less than the full details are cached separately, under a `variant` of the key.
+        """
+        ttl = self.ttl_for(entity_type)
+        if ttl <= 0:
+            entity, _last_ingested = fetch()
+            return entity
+
+        key = self.key_for(entity_type, urn, variant)
+        cached: CachedEntity | None = self.backend.get(key)
+
+        version = self._current_version()
+        if cached is not None:
+            if self._is_fresh(cached, version, urn):
+                return cached.entity
+
+            if self._revalidate(cached, version, get_last_ingested(), urn):
+                self.backend.set(key, cached, timeout=ttl)
+                return cached.entity
+
+        self._record_miss(cached, urn)
+        entity, last_ingested = fetch()
+        self.backend.set(key, self._entry(entity, last_ingested, version), timeout=ttl)
+        return entity
+
+    async def aget_or_fetch(
+        self,
+        entity_type: str,
+        urn: str,
+        fetch: Callable[[], Awaitable[tuple[Entity, int | None]]],
+        get_last_ingested: Callable[[], Awaitable[int | None]],
+        variant: str = "",
+    ) -> Entity:
+        """
+        Async version of `get_or_fetch`, taking async `fetch` and `get_last_ingested` functions
+        """
+        ttl = self.ttl_for(entity_type)
+        if ttl <= 0:
+            entity, _last_ingested = await fetch()
+            return entity
+
+        key = self.key_for(entity_type, urn, variant)
+        cached: CachedEntity | None = await self.backend.aget(key)
+
+        version = self._current_version()
+        if cached is not None:
+            if self._is_fresh(cached, version, urn):
+                return cached.entity
+
+            if self._revalidate(cached, version, await get_last_ingested(), urn):
+                await self.backend.aset(key, cached, timeout=ttl)
+                return cached.entity
+
+        self._record_miss(cached, urn)
+        entity, last_ingested = await fetch()
+        await self.backend.aset(key, self._entry(entity, last_ingested, version), timeout=ttl)
+        return entity
+
+    def _is_fresh(self, cached: CachedEntity, version: str | None, urn: str) -> bool:
+        """
+        Whether the entry can be served without checking the entity's lastIngested
+        """
+        if version is not None and cached.catalogue_version == version:
+            logger.debug("Entity details cache hit for %s, nothing has been ingested since", urn)
+        elif time.time() - cached.checked_at < self.revalidate_after_seconds:
+            logger.debug("Entity details cache hit for %s", urn)
+        else:
+            return False
+        metrics.record_cache_lookup(self.key_prefix, "hit")
+        return True
+
+    def _revalidate(self, cached: CachedEntity, version: str | None, last_ingested: int | None, urn: str) -> bool:
+        """
+        Mark the entry as checked if the entity has not been ingested since it was fetched.
+        The caller stores the entry again if it has.
+        """
+        if last_ingested is None or last_ingested != cached.last_ingested:
+            return False
+        logger.debug("Entity details cache revalidated for %s", urn)
+        metrics.record_cache_lookup(self.key_prefix, "revalidated")
+        cached.checked_at = time.time()
+        cached.catalogue_version = version
+        return True
+
+    def _record_miss(self, cached: CachedEntity | None, urn: str) -> None:
+        logger.debug("Entity details cache miss for %s", urn)
+        metrics.record_cache_lookup(self.key_prefix, "miss" if cached is None else "stale")
+
+    @staticmethod
+    def _entry(entity: Entity, last_ingested: int | None, version: str | None) -> CachedEntity:
+        return CachedEntity(
+            entity=entity, last_ingested=last_ingested, checked_at=time.time(), catalogue_version=version
+        )
+
+    def is_known_missing(self, entity_type: str, urn: str) -> bool:
+        """
+        Whether the urn was recently looked up as the entity type and found not to exist.
+        This stops crawlers following bad links from sending the same failing queries to
+        GMS. Urns are remembered per entity type, as a link to the wrong type of details
+        page does not mean the entity is missing from its own.
+        """
+        if self.missing_ttl_seconds <= 0:
+            return False
+        return self.backend.get(self._missing_key(entity_type, urn)) is not None
+
+    async def ais_known_missing(self, entity_type: str, urn: str) -> bool:
+        if self.missing_ttl_seconds <= 0:
+            return False
+        return await self.backend.aget(self._missing_key(entity_type, urn)) is not None
+
+    def mark_missing(self, entity_type: str, urn: str) -> None:
+        if self.missing_ttl_seconds > 0:
+            self.backend.set(self._missing_key(entity_type, urn), True, timeout=self.missing_ttl_seconds)
+
+    async def amark_missing(self, entity_type: str, urn: str) -> None:
+        if self.missing_ttl_seconds > 0:
+            await self.backend.aset(self._missing_key(entity_type, urn), True, timeout=self.missing_ttl_seconds)
+
+    def _missing_key(self, entity_type: str, urn: str) -> str:
+        return self._versioned_key(self.missing_key_prefix, self._current_version(), entity_type, urn)
+
+    def get_headers(self, urns: Iterable[str]) -> dict[str, EntityHeader]:
+        """
+        Return the cached headers for the urns. Urns that are not cached are left out.
+        """
+        if self.header_ttl_seconds <= 0:
+            return {}
+
+        keys = self._header_keys(urns)
+        cached = self.backend.get_many(keys)
+        return {keys[key]: header for key, header in cached.items() if header is not None}
+
+    async def aget_headers(self, urns: Iterable[str]) -> dict[str, EntityHeader]:
+        if self.header_ttl_seconds <= 0:
+            return {}
+
+        keys = self._header_keys(urns)
+        cached = await self.backend.aget_many(keys)
+        return {keys[key]: header for key, header in cached.items() if header is not None}
+
+    def set_headers(self, headers: Iterable[EntityHeader]) -> None:
+        if self.header_ttl_seconds <= 0:
+            return
+
+        for key, header in self._header_entries(headers):
+            self.backend.set(key, header, timeout=self.header_ttl_seconds)
+
+    async def aset_headers(self, headers: Iterable[EntityHeader]) -> None:
+        if self.header_ttl_seconds <= 0:
+            return
+
+        for key, header in self._header_entries(headers):
+            await self.backend.aset(key, header, timeout=self.header_ttl_seconds)
+
+    def _header_keys(self, urns: Iterable[str]) -> dict[str, str]:
+        version = self._current_version()
+        return {self._versioned_key(self.header_key_prefix, version, urn): urn for urn in urns}
+
+    def _header_entries(self, headers: Iterable[EntityHeader]) -> list[tuple[str, EntityHeader]]:
+        version = self._current_version()
+        return [(self._versioned_key(self.header_key_prefix, version, header.urn), header) for header in headers]
@@ -1,23 +1,32 @@
 import json
 import logging
 from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
 
-from datahub.configuration.common import ConfigurationError
+from datahub.configuration.common import ConfigurationError, GraphError, OperationalError  # pylint: disable=E0611
 from datahub.ingestion.graph.client import DatahubClientConfig, DataHubGraph
 from datahub.metadata import schema_classes
 
+from datahub_client import metrics
+from datahub_client.cache import EntityDetailsCache
 from datahub_client.entities import (
     Chart,
     ChartEntityMapping,
     CustomEntityProperties,
     Dashboard,
+    DashboardEntityMapping,
     Database,
     DatabaseEntityMapping,
+    EntityHeader,
     EntitySummary,
+    EntitySummaryPage,
     FindMoJdataEntityMapper,
     FindMoJdataEntityType,
     PublicationCollection,
+    PublicationCollectionEntityMapping,
     PublicationDataset,
+    PublicationDatasetEntityMapping,
     RelationshipType,
     Schema,
     SchemaEntityMapping,
@@ -25,20 +34,25 @@ from datahub_client.entities import (
     TableEntityMapping,
     get_entity_type_counts_from_datahub,
 )
-from datahub_client.exceptions import ConnectivityError, EntityDoesNotExist
+from datahub_client.exceptions import CatalogueError, ConnectivityError, EntityDoesNotExist
+from datahub_client.graphql.executor import GraphQLExecutor
 from datahub_client.graphql.loader import get_graphql_query
+from datahub_client.graphql.profiles import QueryProfile, profile_variables
 from datahub_client.parsers import (
     ChartParser,
     DashboardParser,
     DatabaseParser,
+    EntityParser,
     PublicationCollectionParser,
     PublicationDatasetParser,
     SchemaParser,
     TableParser,
+    parse_entity_header,
 )
 from datahub_client.search.search_client import SearchClient
 from datahub_client.search.search_types import (
     MultiSelectFilter,
+    SearchAggregations,
     SearchResponse,
     SortOption,
     SubjectAreaOption,
@@ -65,6 +79,20 @@ DATAHUB_DATA_TYPE_MAPPING = {
 }
 
 
+@dataclass(frozen=True)
+class _DetailsQuery:
+    """
+    How to fetch and parse the details of one type of entity
+    """
+
+    entity_type: str
+    query: str
+    response_key: str
+    parser: type[EntityParser]
+    entity_label: str
+    variables: dict[str, Any] = field(default_factory=dict)
+
+
 class DataHubCatalogueClient:
     """Client for pushing metadata to the DataHub catalogue.
 
@@ -79,12 +107,27 @@ class DataHubCatalogueClient:
     instance of CatalogueError.
     """  # noqa: E501
 
-    def __init__(self, jwt_token, api_url: str, graph=None):
+    def __init__(
+        self,
+        jwt_token,
+        api_url: str,
+        graph=None,
+        timeout_sec: float | None = None,
+        retry_max_times: int | None = None,
+        details_cache: EntityDetailsCache | None = None,
+        persisted_queries: bool = False,
+        async_max_connections: int = 100,
+    ):
         """Create a connection to the DataHub GMS endpoint for class methods to use.
 
         Args:
             jwt_token: client token for interacting with the provided DataHub instance.
             api_url (str, optional): GMS endpoint for the DataHub instance for the client object.
+            timeout_sec (float, optional): connect and read timeout for GMS requests.
+            retry_max_times (int, optional): number of times to retry a failed GMS request.
+            details_cache (EntityDetailsCache, optional): cache for parsed entity details.
+            persisted_queries (bool, optional): send query hashes instead of full query text, if GMS supports it.
+            async_max_connections (int, optional): connections to GMS each event loop can open for the async methods.
         """  # noqa: E501
         if api_url.endswith("/"):
             api_url = api_url[:-1]
@@ -95,22 +138,80 @@ class DataHubCatalogueClient:
         else:
             raise ConnectivityError("api_url is incorrectly formatted")
 
-        self.server_config = DatahubClientConfig(server=self.gms_endpoint, token=jwt_token)
+        self.server_config = DatahubClientConfig(
+            server=self.gms_endpoint,
+            token=jwt_token,
+            timeout_sec=timeout_sec,
+            retry_max_times=retry_max_times,
+        )
 
         try:
             self.graph = graph or DataHubGraph(self.server_config)
         except ConfigurationError as e:
             raise ConnectivityError from e
 
-        self.search_client = SearchClient(self.graph)
+        self.executor = GraphQLExecutor(
+            self.graph, persisted_queries=persisted_queries, async_max_connections=async_max_connections
+        )
+        self.search_client = SearchClient(self.graph, executor=self.executor)
 
         self.database_query = get_graphql_query("getContainerDetails")
         self.schema_query = get_graphql_query("getSchemaDetails")
         self.dataset_query = get_graphql_query("getDatasetDetails")
         self.chart_query = get_graphql_query("getChartDetails")
         self.dashboard_query = get_graphql_query("getDashboardDetails")
+        self.container_entities_query = get_graphql_query("getContainerEntities")
+        self.last_ingested_query = get_graphql_query("getEntityLastIngested")
+        self.entity_headers_query = get_graphql_query("getEntityHeaders")
+        self.catalogue_version_query = get_graphql_query("getCatalogueVersion")
+
+        self.table_details = _DetailsQuery(
+            TableEntityMapping.url_formatted, self.dataset_query, "dataset", TableParser, "Table"
+        )
+        self.chart_details = _DetailsQuery(
+            ChartEntityMapping.url_formatted, self.chart_query, "chart", ChartParser, "Chart"
+        )
+        self.database_details = _DetailsQuery(
+            DatabaseEntityMapping.url_formatted,
+            self.database_query,
+            "container",
+            DatabaseParser,
+            "Database",
+            variables={"includeChildren": False},
+        )
+        self.schema_details = _DetailsQuery(
+            SchemaEntityMapping.url_formatted,
+            self.schema_query,
+            "container",
+            SchemaParser,
+            "Schema",
+            variables={"includeChildren": False},
+        )
+        self.publication_collection_details = _DetailsQuery(
+            PublicationCollectionEntityMapping.url_formatted,
+            self.database_query,
+            "container",
+            PublicationCollectionParser,
+            "Database",
+        )
+        self.publication_dataset_details = _DetailsQuery(
+            PublicationDatasetEntityMapping.url_formatted,
+            self.dataset_query,
+            "dataset",
+            PublicationDatasetParser,
+            "Database",
+        )
+        self.dashboard_details = _DetailsQuery(
+            DashboardEntityMapping.url_formatted, self.dashboard_query, "dashboard", DashboardParser, "Dashboard"
+        )
+
+        self.details_cache = details_cache
 
     def check_entity_exists_by_urn(self, urn: str | None):
+        """
+        Check whether GMS knows about the urn. The get_*_details methods do not need
+        this, as they detect missing entities from the graphql response.
+        """
         if urn is not None:
             exists = self.graph.exists(entity_urn=urn)
         else:
@@ -141,6 +242,24 @@ class DataHubCatalogueClient:
             datahub_subtype_counts,
         )
 
+    async def aget_entity_type_counts(
+        self,
+        query: str = "*",
+        filters: Sequence[MultiSelectFilter] | None = None,
+    ) -> dict[FindMoJdataEntityType, int]:
+        """
+        Async version of `get_entity_type_counts`
+        """
+        datahub_entity_type_counts, datahub_subtype_counts = await self.search_client.aget_entity_type_counts(
+            query=query,
+            filters=filters or [],
+        )
+
+        return get_entity_type_counts_from_datahub(
+            datahub_entity_type_counts,
+            datahub_subtype_counts,
+        )
+
     def search(
         self,
         query: str = "*",
@@ -154,6 +273,8 @@ class DataHubCatalogueClient:
         ),
         filters: Sequence[MultiSelectFilter] | None = None,
         sort: SortOption | None = None,
+        include_facets: bool = True,
+        profile: QueryProfile = QueryProfile.CARD,
     ) -> SearchResponse:
         """
         Wraps the catalogue's search function.
@@ -167,6 +288,72 @@ class DataHubCatalogueClient:
             result_types=result_types,
             filters=filters,
             sort=sort,
+            include_facets=include_facets,
+            profile=profile,
+        )
+
+    async def asearch(
+        self,
+        query: str = "*",
+        count: int = 20,
+        page: str | None = None,
+        result_types: Sequence[FindMoJdataEntityMapper] = (
+            TableEntityMapping,
+            ChartEntityMapping,
+            DatabaseEntityMapping,
+            SchemaEntityMapping,
+        ),
+        filters: Sequence[MultiSelectFilter] | None = None,
+        sort: SortOption | None = None,
+        include_facets: bool = True,
+        profile: QueryProfile = QueryProfile.CARD,
+    ) -> SearchResponse:
+        """
+        Async version of `search`
+        """
+        return await self.search_client.asearch(
+            query=query,
+            count=count,
+            page=page,
+            result_types=result_types,
+            filters=filters or [],
+            sort=sort,
+            include_facets=include_facets,
+            profile=profile,
+        )
+
+    def get_search_aggregations(
+        self,
+        query: str = "*",
+        result_types: Sequence[FindMoJdataEntityMapper] = (
+            TableEntityMapping,
+            ChartEntityMapping,
+            DatabaseEntityMapping,
+            SchemaEntityMapping,
+        ),
+        filters: Sequence[MultiSelectFilter] | None = None,
+    ) -> SearchAggregations:
+        """
+        Wraps the search client's query for the facets and tags of a search's results
+        """
+        return self.search_client.get_search_aggregations(query=query, result_types=result_types, filters=filters)
+
+    async def aget_search_aggregations(
+        self,
+        query: str = "*",
+        result_types: Sequence[FindMoJdataEntityMapper] = (
+            TableEntityMapping,
+            ChartEntityMapping,
+            DatabaseEntityMapping,
+            SchemaEntityMapping,
+        ),
+        filters: Sequence[MultiSelectFilter] | None = None,
+    ) -> SearchAggregations:
+        """
+        Async version of `get_search_aggregations`
+        """
+        return await self.search_client.aget_search_aggregations(
+            query=query, result_types=result_types, filters=filters
         )
 
     def list_subject_areas(
@@ -181,60 +368,265 @@ class DataHubCatalogueClient:
         """Wraps the client's get tags query"""
         return self.search_client.get_tags(count)
 
-    def get_table_details(self, urn) -> Table:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.dataset_query, {"urn": urn})["dataset"]
-            table_object = TableParser().parse_to_entity_object(response, urn)
-            return table_object
+    def get_catalogue_version(self) -> str:
+        """
+        Return a token that changes whenever an entity displayed in the catalogue is
+        ingested, added or removed: the number of displayed entities and the latest time
+        any of them was ingested. A single search sorted by lastIngested fetches just the
+        most recently ingested entity.
+        """
+        response = self.executor.execute(self.catalogue_version_query)["searchAcrossEntities"]
+        results = response["searchResults"]
+        latest = (results[0]["entity"].get("lastIngested") or 0) if results else 0
+        return f"{response['total']}-{latest}"
 
-        raise EntityDoesNotExist(f"Table with urn: {urn} does not exist")
+    def get_last_ingested(self, urn: str) -> int | None:
+        """
+        Return the time the entity's metadata was last ingested, in milliseconds since the epoch.
+        This is much cheaper than fetching the entity's details.
+        """
+        try:
+            response = self.executor.execute(self.last_ingested_query, {"urn": urn})
+        except (GraphError, OperationalError) as e:
+            raise CatalogueError(f"Unable to get lastIngested for {urn}") from e
+        entity = response.get("entity") or {}
+        return entity.get("lastIngested")
+
+    async def aget_last_ingested(self, urn: str) -> int | None:
+        """
+        Async version of `get_last_ingested`
+        """
+        try:
+            response = await self.executor.aexecute(self.last_ingested_query, {"urn": urn})
+        except (GraphError, OperationalError) as e:
+            raise CatalogueError(f"Unable to get lastIngested for {urn}") from e
+        entity = response.get("entity") or {}
+        return entity.get("lastIngested")
+
+    def get_entity_headers(self, urns: Sequence[str]) -> dict[str, EntityHeader]:
+        """
+        Return the names of several entities, keyed by urn, using a single query.
+
+        This is much cheaper than fetching each entity's details, so should be used
+        when only a label is needed, e.g. for breadcrumbs or parent entities.
+        Urns that do not exist are left out of the result.
+        """
+        urns = list(dict.fromkeys(urn for urn in urns if urn))
+        headers = self.details_cache.get_headers(urns) if self.details_cache else {}
+
+        urns_to_fetch = [urn for urn in urns if urn not in headers]
+        if not urns_to_fetch:
+            return headers
+
+        response = self.executor.execute(self.entity_headers_query, {"urns": urns_to_fetch})
+        fetched = [parse_entity_header(entity) for entity in response.get("entities") or [] if entity]
+
+        if self.details_cache:
+            self.details_cache.set_headers(fetched)
+
+        headers.update((header.urn, header) for header in fetched)
+        return headers
+
+    async def aget_entity_headers(self, urns: Sequence[str]) -> dict[str, EntityHeader]:
+        """
+        Async version of `get_entity_headers`
+        """
+        urns = list(dict.fromkeys(urn for urn in urns if urn))
+        headers = await self.details_cache.aget_headers(urns) if self.details_cache else {}
+
+        urns_to_fetch = [urn for urn in urns if urn not in headers]
+        if not urns_to_fetch:
+            return headers
+
+        response = await self.executor.aexecute(self.entity_headers_query, {"urns": urns_to_fetch})
+        fetched = [parse_entity_header(entity) for entity in response.get("entities") or [] if entity]
+
+        if self.details_cache:
+            await self.details_cache.aset_headers(fetched)
+
+        headers.update((header.urn, header) for header in fetched)
+        return headers
+
+    def _get_entity_details(
+        self,
+        urn: str,
+        details: _DetailsQuery,
+        profile: QueryProfile = QueryProfile.FULL,
+        use_cache: bool = True,
+    ):
+        """
+        Fetch and parse an entity in a single round trip to GMS.
+
+        Rather than checking the entity exists first, non-existence is inferred from
+        the graphql response: GMS returns null, an entity with `exists: false`, or a stub
+        without any aspects, such as its platform, for urns it does not know about.
+        """
+        variables = self._details_variables(urn, details, profile)
+
+        def fetch():
+            return self._parse_entity_details(urn, details, self.executor.execute(details.query, variables))
+
+        if self.details_cache is None or not use_cache:
+            entity, _last_ingested = fetch()
+            return entity
+
+        if self.details_cache.is_known_missing(details.entity_type, urn):
+            raise self._does_not_exist(urn, details)
+
+        try:
+            return self.details_cache.get_or_fetch(
+                entity_type=details.entity_type,
+                urn=urn,
+                fetch=fetch,
+                get_last_ingested=lambda: self.get_last_ingested(urn),
+                variant="" if profile == QueryProfile.FULL else profile.value,
+            )
+        except EntityDoesNotExist:
+            self.details_cache.mark_missing(details.entity_type, urn)
+            raise
+
+    async def _aget_entity_details(
+        self,
+        urn: str,
+        details: _DetailsQuery,
+        profile: QueryProfile = QueryProfile.FULL,
+        use_cache: bool = True,
+    ):
+        """
+        Async version of `_get_entity_details`
+        """
+        variables = self._details_variables(urn, details, profile)
+
+        async def fetch():
+            return self._parse_entity_details(urn, details, await self.executor.aexecute(details.query, variables))
+
+        if self.details_cache is None or not use_cache:
+            entity, _last_ingested = await fetch()
+            return entity
+
+        if await self.details_cache.ais_known_missing(details.entity_type, urn):
+            raise self._does_not_exist(urn, details)
+
+        try:
+            return await self.details_cache.aget_or_fetch(
+                entity_type=details.entity_type,
+                urn=urn,
+                fetch=fetch,
+                get_last_ingested=lambda: self.aget_last_ingested(urn),
+                variant="" if profile == QueryProfile.FULL else profile.value,
+            )
+        except EntityDoesNotExist:
+            await self.details_cache.amark_missing(details.entity_type, urn)
+            raise
+
+    @staticmethod
+    def _details_variables(urn: str, details: _DetailsQuery, profile: QueryProfile) -> dict[str, Any]:
+        return {"urn": urn, **details.variables, **profile_variables(details.query, profile)}
+
+    @staticmethod
+    def _does_not_exist(urn: str, details: _DetailsQuery) -> EntityDoesNotExist:
+        return EntityDoesNotExist(f"{details.entity_label} with urn: {urn} does not exist")
+
+    def _parse_entity_details(
+        self, urn: str, details: _DetailsQuery, response: dict[str, Any]
+    ) -> tuple[Any, int | None]:
+        response = response[details.response_key]
+        if not response or response.get("exists") is False or not response.get("platform"):
+            raise self._does_not_exist(urn, details)
+        with metrics.time_parse(details.parser.__name__):
+            entity = details.parser().parse_to_entity_object(response, urn)
+        return entity, response.get("lastIngested")
+
+    def get_table_details(self, urn, profile: QueryProfile = QueryProfile.FULL, use_cache: bool = True) -> Table:
+        """
+        Get the details of a table. Pass a smaller `profile`, such as `QueryProfile.COLUMNS`,
+        if only part of the details are needed, and `use_cache=False` when reading many
+        tables once, e.g. for an export, so they do not push other entities out of the cache.
+        """
+        return self._get_entity_details(urn, self.table_details, profile=profile, use_cache=use_cache)
+
+    async def aget_table_details(self, urn, profile: QueryProfile = QueryProfile.FULL) -> Table:
+        return await self._aget_entity_details(urn, self.table_details, profile=profile)
 
     def get_chart_details(self, urn) -> Chart:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.chart_query, {"urn": urn})["chart"]
-            chart_object = ChartParser().parse_to_entity_object(response, urn)
-            return chart_object
+        return self._get_entity_details(urn, self.chart_details)
 
-        raise EntityDoesNotExist(f"Chart with urn: {urn} does not exist")
+    async def aget_chart_details(self, urn) -> Chart:
+        return await self._aget_entity_details(urn, self.chart_details)
 
     def get_database_details(self, urn: str) -> Database:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.database_query, {"urn": urn})["container"]
-            database_object = DatabaseParser().parse_to_entity_object(response, urn)
-            return database_object
+        """
+        Get the details of a database, without the entities in it, which are listed
+        a page at a time by `list_container_entities`
+        """
+        return self._get_entity_details(urn, self.database_details)
 
-        raise EntityDoesNotExist(f"Database with urn: {urn} does not exist")
+    async def aget_database_details(self, urn: str) -> Database:
+        return await self._aget_entity_details(urn, self.database_details)
 
     def get_schema_details(self, urn: str) -> Schema:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.schema_query, {"urn": urn})["container"]
-            database_object = SchemaParser().parse_to_entity_object(response, urn)
-            return database_object
+        """
+        Get the details of a schema, without the tables in it, which are listed
+        a page at a time by `list_container_entities`
+        """
+        return self._get_entity_details(urn, self.schema_details)
 
-        raise EntityDoesNotExist(f"Schema with urn: {urn} does not exist")
+    async def aget_schema_details(self, urn: str) -> Schema:
+        return await self._aget_entity_details(urn, self.schema_details)
+
+    def list_container_entities(
+        self, urn: str, start: int = 0, count: int = 50, entity_type: str | None = None
+    ) -> EntitySummaryPage:
+        """
+        List a page of the entities in a database or schema that are displayed in the catalogue,
+        sorted by name. GMS filters, sorts and pages the entities, so only one page is fetched
+        however large the container is.
+
+        `entity_type` sets the type of every entity, as for child relationships,
+        rather than reading it from each entity's subtypes.
+        """
+        response = self.executor.execute(self.container_entities_query, {"urn": urn, "start": start, "count": count})
+        return self._parse_container_entities(response, entity_type)
+
+    async def alist_container_entities(
+        self, urn: str, start: int = 0, count: int = 50, entity_type: str | None = None
+    ) -> EntitySummaryPage:
+        """
+        Async version of `list_container_entities`
+        """
+        response = await self.executor.aexecute(
+            self.container_entities_query, {"urn": urn, "start": start, "count": count}
+        )
+        return self._parse_container_entities(response, entity_type)
+
+    @staticmethod
+    def _parse_container_entities(response: dict[str, Any], entity_type: str | None) -> EntitySummaryPage:
+        response = response["searchAcrossEntities"]
+        relations = EntityParser().parse_relations(
+            RelationshipType.CHILD,
+            [response],
+            relation_key="searchResults",
+            entity_type_of_relations=entity_type,
+        )
+        return EntitySummaryPage(total=response["total"], entities=relations[RelationshipType.CHILD])
 
     def get_publication_collection_details(self, urn: str) -> PublicationCollection:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.database_query, {"urn": urn})["container"]
-            publication_collection_object = PublicationCollectionParser().parse_to_entity_object(response, urn)
-            return publication_collection_object
-        raise EntityDoesNotExist(f"Database with urn: {urn} does not exist")
+        return self._get_entity_details(urn, self.publication_collection_details)
+
+    async def aget_publication_collection_details(self, urn: str) -> PublicationCollection:
+        return await self._aget_entity_details(urn, self.publication_collection_details)
 
     def get_publication_dataset_details(self, urn: str) -> PublicationDataset:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.dataset_query, {"urn": urn})["dataset"]
-            publication_dataset_object = PublicationDatasetParser().parse_to_entity_object(response, urn)
-            return publication_dataset_object
+        return self._get_entity_details(urn, self.publication_dataset_details)
 
-        raise EntityDoesNotExist(f"Database with urn: {urn} does not exist")
+    async def aget_publication_dataset_details(self, urn: str) -> PublicationDataset:
+        return await self._aget_entity_details(urn, self.publication_dataset_details)
 
     def get_dashboard_details(self, urn: str) -> Dashboard:
-        if self.check_entity_exists_by_urn(urn):
-            response = self.graph.execute_graphql(self.dashboard_query, {"urn": urn})["dashboard"]
-            dashboard_object = DashboardParser().parse_to_entity_object(response, urn)
-            return dashboard_object
+        return self._get_entity_details(urn, self.dashboard_details)
 
-        raise EntityDoesNotExist(f"Dashboard with urn: {urn} does not exist")
+    async def aget_dashboard_details(self, urn: str) -> Dashboard:
+        return await self._aget_entity_details(urn, self.dashboard_details)
 
     def _get_custom_property_key_value_pairs(
         self,
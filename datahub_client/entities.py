@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Annotated, Literal
 
-from pydantic import AfterValidator, BaseModel, EmailStr, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, Field
 
 from .validators import check_timestamp_is_in_the_past
 
@@ -181,6 +181,9 @@ class ColumnAssertion(BaseModel):
 
 
 class ColumnQualityMetrics(BaseModel):
+    # Instances are shared between columns with the same levels
+    model_config = ConfigDict(frozen=True)
+
     completeness: str = Field(default="na", description="Completeness level")
     consistency: str = Field(default="na", description="Consistency level")
     accuracy: str = Field(default="na", description="Accuracy level")
@@ -425,6 +428,35 @@ class EntitySummary(BaseModel):
     tags: list[TagRef] = Field(description="Any tags associated with the entity")
 
 
+class EntitySummaryPage(BaseModel):
+    """
+    One page of the entities in a container, for details pages that list them a page at a time
+    """
+
+    total: int = Field(description="The number of entities across all pages")
+    entities: list[EntitySummary] = Field(description="The entities on this page")
+
+
+class EntityHeader(BaseModel):
+    """
+    The names of an entity, without any of its other metadata.
+    Used for labelling links to an entity, such as breadcrumbs and parent entities.
+    """
+
+    urn: str = Field(description="The identifier of the entity")
+    name: str = Field(description="The name of the entity in the source system", examples=["prison_population"])
+    display_name: str = Field(description="Display name that can be used for link text", examples=["prison_population"])
+    readable_name: str = Field(
+        description="Human-friendly name set by the data owner, if any",
+        default="",
+        examples=["Prison population"],
+    )
+
+    @property
+    def friendly_name(self) -> str:
+        return self.readable_name or self.display_name
+
+
 class FurtherInformation(BaseModel):
     """
     Routes to further information about the data.
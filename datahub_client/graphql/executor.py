@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import ssl
+import weakref
+from typing import Any
+
+import httpx
+import requests
+from datahub.configuration.common import GraphError, OperationalError  # pylint: disable=E0611
+from datahub.ingestion.graph.client import DataHubGraph
+from datahub.ingestion.graph.config import DatahubClientConfig
+
+from .. import metrics, response_logging
+from .loader import get_graphql_query_name, get_query_hash
+
+logger = logging.getLogger(__name__)
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+
+def _has_error(errors: list[dict[str, Any]], message: str) -> bool:
+    return any(
+        error.get("message") == message or (error.get("extensions") or {}).get("code") == message for error in errors
+    )
+
+
+def _headers(config: DatahubClientConfig) -> dict[str, str]:
+    headers = {"Content-Type": "application/json", **(config.extra_headers or {})}
+    if config.token:
+        headers["Authorization"] = f"Bearer {config.token}"
+    return headers
+
+
+def _make_session(config: DatahubClientConfig) -> requests.Session:
+    """
+    A session for persisted queries, which DataHubGraph has no public method to send,
+    authenticated in the same way as the graph's own session
+    """
+    session = requests.Session()
+    session.headers.update(_headers(config))
+    session.verify = False if config.disable_ssl_verification else (config.ca_certificate_path or True)
+    if config.client_certificate_path:
+        session.cert = config.client_certificate_path
+    return session
+
+
+def _ssl_verify(config: DatahubClientConfig) -> ssl.SSLContext | bool:
+    """
+    How the async client verifies GMS, matching the graph's own session. Loading the CA
+    certificates is slow, so the context is built once and shared by every async client.
+    """
+    if config.disable_ssl_verification:
+        return False
+    context = ssl.create_default_context(cafile=config.ca_certificate_path)
+    if config.client_certificate_path:
+        context.load_cert_chain(config.client_certificate_path)
+    return context
+
+
+def _make_async_transport(
+    config: DatahubClientConfig, max_connections: int, verify: ssl.SSLContext | bool
+) -> httpx.AsyncHTTPTransport:
+    """
+    Only connection failures are retried, as a query may have reached GMS before it failed.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncHTTPTransport(verify=verify, limits=limits, retries=config.retry_max_times or 0)
+
+
+def _make_async_client(config: DatahubClientConfig, transport: httpx.AsyncBaseTransport) -> httpx.AsyncClient:
+    """
+    An async client authenticated in the same way as the graph's own session
+    """
+    return httpx.AsyncClient(headers=_headers(config), timeout=config.timeout_sec, transport=transport)
+
+
+class GraphQLExecutor:
+    """
+    Sends graphql queries to GMS. All queries made by the client go through here.
+
+    With `persisted_queries`, queries are sent as a sha256 hash instead of their full text,
+    using the automatic persisted query protocol: if GMS does not recognise the hash, the
+    query is sent again with its text so GMS can store it. If GMS rejects the hash with a
+    4xx, as GMS without persisted query support does, or reports that it does not support
+    them, the executor falls back to sending the full text from then on. Server and
+    connection errors only fall back for the query that failed.
+
+    `aexecute` sends queries with an httpx.AsyncClient instead, for async views, so waiting
+    on GMS does not hold a thread. It always sends the full query text. An httpx client
+    cannot be shared between event loops, so one is opened for each loop that uses it,
+    holding up to `async_max_connections` connections to GMS.
+    """
+
+    def __init__(
+        self,
+        graph: DataHubGraph,
+        persisted_queries: bool = False,
+        async_max_connections: int = 100,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.graph = graph
+        self.persisted_queries = persisted_queries
+        self.session = _make_session(graph.config) if persisted_queries else None
+        self.async_max_connections = async_max_connections
+        self.async_transport = async_transport
+        self._async_verify: ssl.SSLContext | bool | None = None
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        metrics.instrument_session(getattr(graph, "_session", None))
+        metrics.instrument_session(self.session)
+
+    def execute(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Execute a query and return its data, raising GraphError if GMS returns errors.
+        """
+        query_name = get_graphql_query_name(query)
+        with metrics.graphql_query(query_name):
+            data = None
+            if self.persisted_queries:
+                data = self._execute_persisted(query, variables)
+            if data is None:
+                data = self.graph.execute_graphql(query, variables)
+
+        response_logging.log_response(query_name, variables, data)
+        return data
+
+    async def aexecute(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Execute a query without blocking the event loop, and return its data. Raises the same
+        errors as `execute`: GraphError if GMS returns errors and OperationalError if it
+        responds with an error status.
+        """
+        query_name = get_graphql_query_name(query)
+        body: dict[str, Any] = {"query": query}
+        if variables:
+            body["variables"] = variables
+
+        with metrics.graphql_query(query_name):
+            response = await self._get_async_client().post(f"{self.graph.config.server}/api/graphql", json=body)
+            metrics.record_response_size(len(response.content))
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                raise OperationalError("Unable to get metadata from DataHub", {"message": str(e)}) from e
+            result = response.json()
+
+        if result.get("errors"):
+            raise GraphError(f"Error executing graphql query: {result['errors']}")
+
+        data = result["data"]
+        response_logging.log_response(query_name, variables, data)
+        return data
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            transport = self.async_transport
+            if transport is None:
+                if self._async_verify is None:
+                    self._async_verify = _ssl_verify(self.graph.config)
+                transport = _make_async_transport(self.graph.config, self.async_max_connections, self._async_verify)
+            client = _make_async_client(self.graph.config, transport)
+            self._async_clients[loop] = client
+        return client
+
+    def _execute_persisted(self, query: str, variables: dict[str, Any] | None) -> dict[str, Any] | None:
+        body: dict[str, Any] = {
+            "variables": variables or {},
+            "extensions": {"persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}},
+        }
+
+        try:
+            result = self._post(body)
+        except requests.HTTPError as error:
+            if 400 <= error.response.status_code < 500:
+                logger.warning("GMS rejected a persisted query, sending full query text from now on: %s", error)
+                self.persisted_queries = False
+            else:
+                logger.warning("Persisted query failed, sending full query text instead: %s", error)
+            return None
+        except requests.RequestException as error:
+            logger.warning("Persisted query failed, sending full query text instead: %s", error)
+            return None
+
+        errors = result.get("errors") or []
+        if _has_error(errors, PERSISTED_QUERY_NOT_SUPPORTED):
+            logger.warning("GMS does not support persisted queries, sending full query text from now on")
+            self.persisted_queries = False
+            return None
+
+        if _has_error(errors, PERSISTED_QUERY_NOT_FOUND):
+            logger.debug("Registering persisted query %s", body["extensions"]["persistedQuery"]["sha256Hash"])
+            try:
+                result = self._post({**body, "query": query})
+            except requests.RequestException as error:
+                logger.warning("Registering persisted query failed, sending full query text instead: %s", error)
+                return None
+            errors = result.get("errors") or []
+
+        if errors:
+            raise GraphError(f"Error executing graphql query: {errors}")
+
+        return result["data"]
+
+    def _post(self, body: dict[str, Any]) -> dict[str, Any]:
+        response = self.session.post(
+            f"{self.graph.config.server}/api/graphql", json=body, timeout=self.graph.config.timeout_sec
+        )
+        try:
+            result = response.json()
+        except ValueError:
+            result = None
+
+        # Some servers send persisted query errors with a 4xx status, and they are handled above
+        errors = (result.get("errors") or []) if isinstance(result, dict) else []
+        if not (_has_error(errors, PERSISTED_QUERY_NOT_FOUND) or _has_error(errors, PERSISTED_QUERY_NOT_SUPPORTED)):
+            response.raise_for_status()
+        if not isinstance(result, dict):
+            raise requests.RequestException(f"Unexpected response from GMS: {response.text[:200]}", response=response)
+        return result
@@ -1,4 +1,8 @@
+import hashlib
 import logging
+import re
+import threading
+from functools import lru_cache
 from importlib.resources import files
 
 from ..exceptions import CatalogueError
@@ -8,10 +12,103 @@ GRAPHQL_FILE_EXTENSION = ".graphql"
 
 logger = logging.getLogger(__name__)
 
+_queries: dict[str, str] | None = None
+_queries_lock = threading.Lock()
+
+_comment_pattern = re.compile(r"#[^\n]*")
+_operation_pattern = re.compile(r"^\s*(query|mutation|subscription)\b(?!\s*:)", flags=re.MULTILINE)
+_fragment_definition_pattern = re.compile(r"^\s*fragment\s+([A-Za-z_]\w*)\s+on\b", flags=re.MULTILINE)
+_fragment_spread_pattern = re.compile(r"\.\.\.\s*([A-Za-z_]\w*)")
+_brackets = {"}": "{", ")": "(", "]": "["}
+
+
+def load_graphql_queries() -> dict[str, str]:
+    """
+    Return the text of every graphql query shipped with the client, keyed by file name.
+    The files are only read the first time this is called in each process.
+    """
+    global _queries
+    if _queries is None:
+        with _queries_lock:
+            if _queries is None:
+                _queries = {
+                    path.name.removesuffix(GRAPHQL_FILE_EXTENSION): path.read_text()
+                    for path in files(GRAPHQL_FILES_PATH).iterdir()
+                    if path.name.endswith(GRAPHQL_FILE_EXTENSION)
+                }
+    return _queries
+
 
 def get_graphql_query(graphql_query_file_name: str) -> str:
-    query_text = files(GRAPHQL_FILES_PATH).joinpath(f"{graphql_query_file_name}{GRAPHQL_FILE_EXTENSION}").read_text()
+    query_text = load_graphql_queries().get(graphql_query_file_name)
     if not query_text:
         logger.error("No graphql query file found for %s", graphql_query_file_name)
         raise CatalogueError(f"No graphql query file found for {graphql_query_file_name}")
     return query_text
+
+
+@lru_cache(maxsize=1)
+def _get_query_names() -> dict[str, str]:
+    return {query_text: name for name, query_text in load_graphql_queries().items()}
+
+
+def get_graphql_query_name(query_text: str) -> str:
+    """
+    The name of the file a query was loaded from, e.g. for labelling metrics.
+    """
+    return _get_query_names().get(query_text, "unknown")
+
+
+@lru_cache(maxsize=64)
+def get_query_hash(query_text: str) -> str:
+    """
+    The sha256 hash used to refer to a persisted query instead of sending its text.
+    """
+    return hashlib.sha256(query_text.encode()).hexdigest()
+
+
+def find_graphql_document_problems(query_text: str) -> list[str]:
+    """
+    Check a graphql document for mistakes that would make GMS reject it,
+    without needing a graphql parser or a connection to GMS.
+    """
+    text = _comment_pattern.sub("", query_text)
+    problems = []
+
+    stack = []
+    for char in text:
+        if char in "{([":
+            stack.append(char)
+        elif char in _brackets:
+            if not stack or stack.pop() != _brackets[char]:
+                problems.append(f"unbalanced {char!r}")
+                break
+    else:
+        if stack:
+            problems.append(f"unclosed {stack[-1]!r}")
+
+    operations = _operation_pattern.findall(text)
+    if len(operations) != 1:
+        problems.append(f"expected 1 operation, found {len(operations)}")
+
+    defined_fragments = set(_fragment_definition_pattern.findall(text))
+    spread_fragments = {name for name in _fragment_spread_pattern.findall(text) if name != "on"}
+    for name in sorted(spread_fragments - defined_fragments):
+        problems.append(f"fragment {name} is used but not defined")
+    for name in sorted(defined_fragments - spread_fragments):
+        problems.append(f"fragment {name} is defined but not used")
+
+    return problems
+
+
+def validate_graphql_queries() -> None:
+    """
+    Raise CatalogueError if any of the graphql queries are malformed.
+    """
+    problems = [
+        f"{name}: {problem}"
+        for name, query_text in sorted(load_graphql_queries().items())
+        for problem in find_graphql_document_problems(query_text)
+    ]
+    if problems:
+        raise CatalogueError(f"Invalid graphql queries: {'; '.join(problems)}")
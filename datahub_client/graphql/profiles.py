@@ -0,0 +1,51 @@
+import re
+from enum import StrEnum
+from functools import lru_cache
+
+
+class QueryProfile(StrEnum):
+    """
+    How much of an entity a caller needs. Queries mark optional parts of their
+    selection sets with `@include(if: $section)`, and each profile turns on the
+    sections it needs, so GMS does not resolve and send fields nobody renders.
+    """
+
+    # Everything shown on a details page
+    FULL = "full"
+    # A search result
+    CARD = "card"
+    # Just the urn, names and description, e.g. to list the tables in an export
+    HEADER = "header"
+    # The names, description and schema fields of a table, e.g. for its CSV
+    COLUMNS = "columns-only"
+
+
+SECTIONS = (
+    "includeLineage",
+    "includeParents",
+    "includeOwnership",
+    "includeTags",
+    "includeQuality",
+    "includeColumns",
+)
+
+PROFILE_SECTIONS: dict[QueryProfile, frozenset[str]] = {
+    QueryProfile.FULL: frozenset(SECTIONS),
+    QueryProfile.CARD: frozenset({"includeParents", "includeOwnership", "includeTags"}),
+    QueryProfile.HEADER: frozenset(),
+    QueryProfile.COLUMNS: frozenset({"includeColumns"}),
+}
+
+
+@lru_cache(maxsize=64)
+def _declared_sections(query_text: str) -> frozenset[str]:
+    return frozenset(section for section in SECTIONS if re.search(rf"\${section}\s*:", query_text))
+
+
+def profile_variables(query_text: str, profile: QueryProfile) -> dict[str, bool]:
+    """
+    The variables that select a profile's sections of a query. Only the sections the
+    query declares are included, as GMS rejects variables a query does not declare.
+    """
+    enabled = PROFILE_SECTIONS[profile]
+    return {section: section in enabled for section in _declared_sections(query_text)}
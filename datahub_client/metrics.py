@@ -0,0 +1,131 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+from prometheus_client import Counter, Histogram
+
+GRAPHQL_QUERY_SECONDS = Histogram(
+    "catalogue_graphql_query_seconds",
+    "Time taken to execute a graphql query against GMS, including retries",
+    ["query"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+GRAPHQL_RESPONSE_BYTES = Histogram(
+    "catalogue_graphql_response_bytes",
+    "Size of graphql responses from GMS",
+    ["query"],
+    buckets=(1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000),
+)
+PARSE_SECONDS = Histogram(
+    "catalogue_parse_seconds",
+    "Time taken to parse a GMS response into a model",
+    ["parser"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+CACHE_LOOKUPS = Counter(
+    "catalogue_cache_lookups_total",
+    "Lookups of cached catalogue data, by whether they were served from the cache",
+    ["cache", "result"],
+)
+
+_current_query: ContextVar[str | None] = ContextVar("current_graphql_query", default=None)
+
+
+class RequestTimings:
+    """
+    Totals the time spent on each kind of catalogue work while handling a request,
+    so it can be reported in the Server-Timing header. Queries may be run from several
+    threads for the same request, so updates are locked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals: dict[str, tuple[float, int]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            total, count = self.totals.get(name, (0.0, 0))
+            self.totals[name] = (total + seconds, count + 1)
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f'{name};dur={total * 1000:.1f};desc="{count}x"' for name, (total, count) in self.totals.items()
+        )
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """
+    Collect the timings of catalogue work until the end of the block, e.g. for the duration of a request.
+    """
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+@contextmanager
+def _timed(histogram: Histogram, label: str, timing_name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        histogram.labels(label).observe(seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add(timing_name, seconds)
+
+
+@contextmanager
+def graphql_query(query_name: str) -> Iterator[None]:
+    """
+    Time a graphql query, and label the size of the responses received while it runs.
+    """
+    token = _current_query.set(query_name)
+    try:
+        with _timed(GRAPHQL_QUERY_SECONDS, query_name, f"gql-{query_name}"):
+            yield
+    finally:
+        _current_query.reset(token)
+
+
+def time_parse(parser_name: str):
+    return _timed(PARSE_SECONDS, parser_name, f"parse-{parser_name}")
+
+
+def record_cache_lookup(cache_name: str, result: str) -> None:
+    """
+    Count a cache lookup, where `result` is e.g. hit, miss or stale.
+    """
+    CACHE_LOOKUPS.labels(cache_name, result).inc()
+
+
+def record_response_size(size: int) -> None:
+    """
+    Record the size of a graphql response received while a query is being timed
+    """
+    query_name = _current_query.get()
+    if query_name is not None:
+        GRAPHQL_RESPONSE_BYTES.labels(query_name).observe(size)
+
+
+def _record_response_size(response: requests.Response, *args, **kwargs) -> None:
+    record_response_size(len(response.content))
+
+
+def instrument_session(session: requests.Session | None) -> None:
+    """
+    Record the size of graphql responses received by a GMS session. The body is
+    read in full to parse it anyway, so this does not add another read.
+    """
+    if isinstance(session, requests.Session) and _record_response_size not in session.hooks["response"]:
+        session.hooks["response"].append(_record_response_size)
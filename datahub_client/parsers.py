@@ -1,6 +1,8 @@
 import logging
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any
 
 from datahub_client.entities import (
@@ -21,6 +23,7 @@ from datahub_client.entities import (
     DatahubSubtype,
     DataSummary,
     Entity,
+    EntityHeader,
     EntityRef,
     EntitySummary,
     FurtherInformation,
@@ -49,6 +52,9 @@ DATA_OWNER = "urn:li:ownershipType:__system__dataowner"
 DATA_STEWARD = "urn:li:ownershipType:__system__data_steward"
 DATA_CUSTODIAN = "urn:li:ownershipType:data_custodian"
 
+QUALITY_LEVEL_PRIORITY = ("green", "amber", "red")
+QUALITY_LEVEL_DESCRIPTIONS = {"green": "good", "amber": "acceptable", "red": "poor"}
+
 
 def parse_assertions(assertions: dict) -> dict[str, ColumnAssertion]:
     assertions_map = {}
@@ -68,10 +74,10 @@ def parse_assertions(assertions: dict) -> dict[str, ColumnAssertion]:
             try:
                 result = assertion["runEvents"]["runEvents"][0]["result"]["type"]
             except KeyError as ke:
-                logger.info(f"Skipping assertion, with KeyError {ke=}")
+                logger.info("Skipping assertion, with KeyError %r", ke)
                 continue
             except IndexError as ie:
-                logger.info(f"Skipping assertion, with IndexError {ie=}")
+                logger.info("Skipping assertion, with IndexError %r", ie)
                 logger.info(assertion)
                 continue
 
@@ -83,6 +89,45 @@ def parse_assertions(assertions: dict) -> dict[str, ColumnAssertion]:
     return assertions_map
 
 
+@lru_cache(maxsize=1024)
+def _shared_quality_metrics(levels: tuple[tuple[str, str], ...]) -> ColumnQualityMetrics:
+    return ColumnQualityMetrics(**dict(levels))
+
+
+def quality_metrics_for(column_assertions: dict[ColumnAssertionType, dict[str, str]]) -> ColumnQualityMetrics:
+    """
+    Summarise a column's assertion results as the best level that succeeded for each metric.
+
+    There are only a few possible combinations of levels, so columns share frozen
+    ColumnQualityMetrics instances rather than building one each.
+    """
+    levels = {}
+    for metric, results in column_assertions.items():
+        level = "poor" if results else "na"
+        for priority in QUALITY_LEVEL_PRIORITY:
+            if results.get(priority) == "SUCCESS":
+                level = QUALITY_LEVEL_DESCRIPTIONS[priority]
+                break
+        levels[metric.value] = level
+    return _shared_quality_metrics(tuple(sorted(levels.items())))
+
+
+def parse_entity_header(entity: dict[str, Any]) -> EntityHeader:
+    """
+    Parse an entity returned by the getEntityHeaders query into an EntityHeader.
+    """
+    properties = entity.get("properties") or {}
+    name, display_name, _qualified_name = EntityParser.parse_names(entity, properties)
+    custom_properties = {i["key"]: i["value"] or "" for i in properties.get("customProperties") or []}
+
+    return EntityHeader(
+        urn=entity["urn"],
+        name=name,
+        display_name=display_name,
+        readable_name=custom_properties.get("dc_readable_name", ""),
+    )
+
+
 class EntityParser:
     def parse(self, search_response) -> SearchResult:
         """Parse graphql response to a SearchResult object"""
@@ -189,7 +234,7 @@ class EntityParser:
             if schedule_old in tag_ref.display_name
         ]
         if len(relevant_refresh_schedules) > 1:
-            logger.warning(f"More than one refresh period tag found: {tags=}")
+            logger.warning("More than one refresh period tag found: %s", tags)
         if relevant_refresh_schedules:
             refresh_schedule = ", ".join(sorted(set(relevant_refresh_schedules)))
             return refresh_schedule
@@ -332,8 +377,6 @@ class EntityParser:
         - `type` refers to the Datahub type, not AWS glue type
         - `nullable`, 'isPrimaryKey` and `foreignKeys` metadata is added
         """
-        result = []
-
         schema_metadata = entity.get("schemaMetadata", {})
         if not schema_metadata:
             return []
@@ -356,59 +399,48 @@ class EntityParser:
             source_path = foreign_key["sourceFields"][0]["fieldPath"]
             foreign_path = foreign_key["foreignFields"][0]["fieldPath"]
 
-            foreign_table = EntityRef(
+            foreign_table = EntityRef.model_construct(
                 urn=foreign_key["foreignDataset"]["urn"],
                 display_name=foreign_key["foreignDataset"]["properties"]["name"],
             )
 
-            display_name = foreign_path.split(".")[-1]
+            display_name = foreign_path.rpartition(".")[2]
             foreign_keys[source_path].append(
-                ColumnRef(name=foreign_path, display_name=display_name, table=foreign_table)
+                ColumnRef.model_construct(name=foreign_path, display_name=display_name, table=foreign_table)
             )
 
-        all_column_assertions = parse_assertions(entity.get("assertions", {}))
-        for field in schema_metadata.get("fields", ()):
-            foreign_keys_for_field = foreign_keys[field["fieldPath"]]
-
-            is_primary_key = field["fieldPath"] in primary_keys
+        quality_metrics_by_column = {
+            column_name: quality_metrics_for(column_assertions)
+            for column_name, column_assertions in parse_assertions(entity.get("assertions") or {}).items()
+        }
+        no_quality_metrics = quality_metrics_for({})
+
+        # Sort primary keys first, then sort alphabetically.
+        # Tables can have thousands of columns, and the fields come from GMS,
+        # so the models are built without validating them.
+        primary_key_columns = []
+        other_columns = []
+        for field in sorted(schema_metadata.get("fields", ()), key=itemgetter("fieldPath")):
             field_path = field["fieldPath"]
-            display_name = field_path.split(".")[-1]
-            quality_metrics = self.form_column_quality_metrics(all_column_assertions, display_name)
-
-            result.append(
-                Column(
-                    name=field_path,
-                    display_name=display_name,
-                    description=field.get("description") or "",
-                    type=field.get("nativeDataType", field["type"]),
-                    nullable=field["nullable"],
-                    is_primary_key=is_primary_key,
-                    foreign_keys=foreign_keys_for_field,
-                    quality_metrics=quality_metrics,
-                )
+            display_name = field_path.rpartition(".")[2]
+            is_primary_key = field_path in primary_keys
+
+            column = Column.model_construct(
+                name=field_path,
+                display_name=display_name,
+                description=field.get("description") or "",
+                type=field.get("nativeDataType", field["type"]),
+                nullable=field["nullable"],
+                is_primary_key=is_primary_key,
+                foreign_keys=foreign_keys.get(field_path, []),
+                quality_metrics=quality_metrics_by_column.get(display_name, no_quality_metrics),
             )
+            if is_primary_key:
+                primary_key_columns.append(column)
+            else:
+                other_columns.append(column)
 
-        # Sort primary keys first, then sort alphabetically
-        return sorted(result, key=lambda c: (0 if c.is_primary_key else 1, c.name))
-
-    def form_column_quality_metrics(self, all_column_assertions, display_name):
-        column_assertions = all_column_assertions.get(display_name, {})
-        PRIORITY_ORDER = ["green", "amber", "red"]
-        level_to_description_map = {
-            "green": "good",
-            "amber": "acceptable",
-            "red": "poor",
-        }
-        quality_dict = {metric.value: "na" for metric in ColumnAssertionType}
-        # Iterate through assertions and update dictionary
-        for metric, levels in column_assertions.items():
-            quality_dict[metric.value] = "poor" if levels else "na"
-            for level in PRIORITY_ORDER:
-                if level in levels and levels[level] == "SUCCESS":
-                    quality_dict[metric.value] = level_to_description_map[level]
-                    break
-        quality_metrics = ColumnQualityMetrics(**quality_dict)
-        return quality_metrics
+        return primary_key_columns + other_columns
 
     def _parse_owners_by_type(
         self,
@@ -582,7 +614,7 @@ class DatasetParser(EntityParser):
             "owner_email": owner.email,
             "total_parents": entity.get("relationships", {}).get("total", 0),
         }
-        logger.debug(f"{metadata=}")
+        logger.debug("metadata=%r", metadata)
 
         metadata.update(custom_properties.usage_restrictions.model_dump())
         metadata.update(custom_properties.access_information.model_dump())
@@ -605,9 +637,10 @@ class DatasetParser(EntityParser):
             tags=tags,
             subject_areas=subject_areas,
             last_modified=modified,
+            last_ingested=entity.get("lastIngested"),
         )
 
-        logger.info(f"{result=}")
+        logger.debug("result=%r", result)
 
         return result
 
@@ -737,7 +770,7 @@ class ContainerParser(EntityParser):
             last_modified=modified,
         )
 
-        logger.info(f"{search_result=}")
+        logger.debug("search_result=%r", search_result)
 
         return search_result
 
@@ -751,9 +784,10 @@ class DatabaseParser(ContainerParser):
         properties, custom_properties = self.parse_properties(response)
         name, display_name, qualified_name = self.parse_names(response, properties)
 
+        # Children are listed a page at a time, so may not be included in the response
         child_relations = self.parse_relations(
             relationship_type=RelationshipType.CHILD,
-            relations_list=[response["relationships"]],
+            relations_list=[response.get("relationships") or {}],
             entity_type_of_relations=None,
         )
         relations_to_display = self.list_relations_to_display(child_relations)
@@ -792,9 +826,10 @@ class SchemaParser(ContainerParser):
         properties, custom_properties = self.parse_properties(response)
         name, display_name, qualified_name = self.parse_names(response, properties)
 
+        # Children are listed a page at a time, so may not be included in the response
         child_relations = self.parse_relations(
             relationship_type=RelationshipType.CHILD,
-            relations_list=[response["relationships"]],
+            relations_list=[response.get("relationships") or {}],
             entity_type_of_relations="TABLE",
         )
         child_relations_to_display = self.list_relations_to_display(child_relations)
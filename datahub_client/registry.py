@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from requests.adapters import HTTPAdapter
+
+from datahub_client.cache import EntityDetailsCache
+from datahub_client.client import DataHubCatalogueClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ClientPoolConfig:
+    """
+    Connection settings for catalogue clients created by the registry.
+
+    `pool_connections` and `pool_maxsize` size the keep-alive connection pool
+    shared by every thread in the worker, and `async_max_connections` caps the
+    connections the client's async methods open from each event loop.
+    `max_age_seconds` forces the client (and its HTTP session) to be rebuilt
+    periodically, so that a worker reconnects after GMS is redeployed or a
+    connection goes stale.
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    async_max_connections: int = 100
+    timeout_sec: float | None = None
+    retry_max_times: int | None = None
+    max_age_seconds: float | None = None
+    persisted_queries: bool = False
+
+
+@dataclass
+class _RegistryEntry:
+    client: DataHubCatalogueClient
+    created_at: float
+
+
+class CatalogueClientRegistry:
+    """
+    Lazily creates and hands out one DataHubCatalogueClient per GMS endpoint and token.
+
+    Creating a client is expensive: it performs a server config handshake with GMS,
+    opens a new HTTP session and loads the graphql queries. The registry creates the
+    client on first use and then shares it between all threads in the worker process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str | None], _RegistryEntry] = {}
+
+    def get_client(
+        self,
+        jwt_token: str | None,
+        api_url: str,
+        pool_config: ClientPoolConfig | None = None,
+        details_cache: EntityDetailsCache | None = None,
+    ) -> DataHubCatalogueClient:
+        """
+        Return the shared client for the endpoint and token, creating it if needed.
+        `details_cache` is only used when a new client is created.
+        """
+        pool_config = pool_config or ClientPoolConfig()
+        key = (api_url, jwt_token)
+
+        entry = self._entries.get(key)
+        if entry is not None and not self._is_expired(entry, pool_config):
+            return entry.client
+
+        with self._lock:
+            # Another thread may have created the client while we were waiting for the lock
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry, pool_config):
+                if entry is not None:
+                    # The old client may still be in use by other threads, so it is
+                    # left for garbage collection rather than closed here
+                    logger.info("Recycling catalogue client for %s", api_url)
+                client = self._create_client(jwt_token, api_url, pool_config, details_cache)
+                entry = _RegistryEntry(client=client, created_at=time.monotonic())
+                self._entries[key] = entry
+
+        return entry.client
+
+    def reset(self) -> None:
+        """
+        Discard all clients, so that the next call to `get_client` reconnects.
+        """
+        with self._lock:
+            for entry in self._entries.values():
+                self._close(entry)
+            self._entries.clear()
+
+    @staticmethod
+    def _is_expired(entry: _RegistryEntry, pool_config: ClientPoolConfig) -> bool:
+        if not pool_config.max_age_seconds:
+            return False
+        return time.monotonic() - entry.created_at > pool_config.max_age_seconds
+
+    @staticmethod
+    def _create_client(
+        jwt_token: str | None,
+        api_url: str,
+        pool_config: ClientPoolConfig,
+        details_cache: EntityDetailsCache | None = None,
+    ) -> DataHubCatalogueClient:
+        client = DataHubCatalogueClient(
+            jwt_token=jwt_token,
+            api_url=api_url,
+            timeout_sec=pool_config.timeout_sec,
+            retry_max_times=pool_config.retry_max_times,
+            details_cache=details_cache,
+            persisted_queries=pool_config.persisted_queries,
+            async_max_connections=pool_config.async_max_connections,
+        )
+        _mount_pooled_adapter(client, pool_config)
+        return client
+
+    @staticmethod
+    def _close(entry: _RegistryEntry) -> None:
+        session = getattr(entry.client.graph, "_session", None)
+        if session is not None:
+            session.close()
+
+
+def _mount_pooled_adapter(client: DataHubCatalogueClient, pool_config: ClientPoolConfig) -> None:
+    """
+    Replace the HTTP adapters on the client's session with ones sized for the worker,
+    keeping the retry strategy configured by the DataHub SDK.
+    """
+    session = getattr(client.graph, "_session", None)
+    if session is None:
+        return
+
+    for prefix in ("http://", "https://"):
+        existing_adapter = session.get_adapter(prefix)
+        session.mount(
+            prefix,
+            HTTPAdapter(
+                pool_connections=pool_config.pool_connections,
+                pool_maxsize=pool_config.pool_maxsize,
+                max_retries=existing_adapter.max_retries,
+            ),
+        )
+
+
+client_registry = CatalogueClientRegistry()
@@ -0,0 +1,68 @@
+"""
+Logging of the responses GMS returns to graphql queries.
+
+Responses can be hundreds of kilobytes, so they are only serialised once a log record
+is actually written: at DEBUG level, for a sample of queries, cut to a maximum length.
+For troubleshooting, the full responses to named queries can be logged at INFO level.
+"""
+
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ResponseLoggingConfig:
+    """
+    `max_chars` caps the length of each logged response, `sample_rate` is the
+    fraction of responses logged at DEBUG level, and `dump_queries` names the
+    queries whose full responses are logged at INFO level.
+    """
+
+    max_chars: int = 2000
+    sample_rate: float = 1.0
+    dump_queries: frozenset[str] = field(default_factory=frozenset)
+
+
+_config = ResponseLoggingConfig()
+
+
+def configure(config: ResponseLoggingConfig) -> None:
+    global _config
+    _config = config
+
+
+class _LazyJson:
+    """
+    Serialises a response when the log record is formatted rather than when it is created
+    """
+
+    def __init__(self, payload: Any, max_chars: int | None = None):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = json.dumps(self.payload, default=str)
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return f"{text[: self.max_chars]}... ({len(text) - self.max_chars} more characters)"
+        return text
+
+
+def log_response(query_name: str, variables: dict[str, Any] | None, response: Any) -> None:
+    """
+    Log the response to a graphql query, if enabled for the query and the log level
+    """
+    config = _config
+    if query_name in config.dump_queries:
+        logger.info("GMS response to %s %s: %s", query_name, _LazyJson(variables), _LazyJson(response))
+    elif logger.isEnabledFor(logging.DEBUG) and random.random() < config.sample_rate:
+        logger.debug(
+            "GMS response to %s %s: %s",
+            query_name,
+            _LazyJson(variables, config.max_chars),
+            _LazyJson(response, config.max_chars),
+        )
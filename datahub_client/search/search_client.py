@@ -1,4 +1,3 @@
-import json
 import logging
 from collections.abc import Sequence
 from typing import Any
@@ -6,6 +5,7 @@ from typing import Any
 from datahub.configuration.common import GraphError  # pylint: disable=E0611
 from datahub.ingestion.graph.client import DataHubGraph
 
+from datahub_client import metrics
 from datahub_client.entities import (
     ALL_FILTERABLE_TAGS,
     ChartEntityMapping,
@@ -16,12 +16,15 @@ from datahub_client.entities import (
     TableEntityMapping,
 )
 from datahub_client.exceptions import CatalogueError
+from datahub_client.graphql.executor import GraphQLExecutor
 from datahub_client.graphql.loader import get_graphql_query
+from datahub_client.graphql.profiles import QueryProfile, profile_variables
 from datahub_client.parsers import EntityParser, EntityParserFactory
 from datahub_client.search.filters import map_filters
 from datahub_client.search.search_types import (
     FacetOption,
     MultiSelectFilter,
+    SearchAggregations,
     SearchFacets,
     SearchResponse,
     SortOption,
@@ -33,8 +36,9 @@ logger = logging.getLogger(__name__)
 
 
 class SearchClient:
-    def __init__(self, graph: DataHubGraph):
+    def __init__(self, graph: DataHubGraph, executor: GraphQLExecutor | None = None):
         self.graph = graph
+        self.executor = executor or GraphQLExecutor(graph)
         self.entity_parser = EntityParser()
         self.search_query = get_graphql_query("search")
         self.facets_query = get_graphql_query("facets")
@@ -53,21 +57,41 @@ class SearchClient:
         These counts should show all entity types available irrespective of the selected entity types in the search.
         We therefore do not apply any entity type filters here and must remove it if present in the filters.
         """
-        if filters is not None:
-            filters = map_filters(filters)
-        else:
-            filters = []
+        try:
+            response = self.executor.execute(
+                self.get_entity_types_counts_query, self._entity_type_counts_variables(query, filters)
+            )
+        except GraphError as e:
+            raise CatalogueError("Unable to execute getEntityTypeCounts query") from e
 
-        variables = {
-            "query": query,
-            "filters": filters,
-        }
+        return self._parse_entity_type_counts(response)
 
+    async def aget_entity_type_counts(
+        self,
+        query: str = "*",
+        filters: Sequence[MultiSelectFilter] | None = None,
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """
+        Async version of `get_entity_type_counts`
+        """
         try:
-            response = self.graph.execute_graphql(self.get_entity_types_counts_query, variables)
+            response = await self.executor.aexecute(
+                self.get_entity_types_counts_query, self._entity_type_counts_variables(query, filters)
+            )
         except GraphError as e:
             raise CatalogueError("Unable to execute getEntityTypeCounts query") from e
 
+        return self._parse_entity_type_counts(response)
+
+    @staticmethod
+    def _entity_type_counts_variables(query: str, filters: Sequence[MultiSelectFilter] | None) -> dict[str, Any]:
+        return {
+            "query": query,
+            "filters": map_filters(filters) if filters is not None else [],
+        }
+
+    @staticmethod
+    def _parse_entity_type_counts(response: dict[str, Any]) -> tuple[dict[str, int], dict[str, int]]:
         response = response["aggregateAcrossEntities"]
 
         entity_type_counts = {}
@@ -99,47 +123,76 @@ class SearchClient:
         ),
         filters: Sequence[MultiSelectFilter] | None = None,
         sort: SortOption | None = None,
+        include_facets: bool = True,
+        profile: QueryProfile = QueryProfile.CARD,
     ) -> SearchResponse:
         """
         Wraps the catalogue's search function.
-        """
 
-        if filters is None:
-            filters = []
+        Without `include_facets`, GMS does not aggregate the facets and tags of the results,
+        which is faster when they are fetched separately with `get_search_aggregations`.
+        `QueryProfile.HEADER` leaves out the owners, tags and parents of the results.
+        """
+        variables = self._page_variables(query, count, page, result_types, filters, sort, include_facets, profile)
+        try:
+            response = self.executor.execute(self.search_query, variables)
+        except GraphError as e:
+            raise CatalogueError("Unable to execute search query") from e
 
-        start = 0 if page is None else int(page) * count
+        return self._parse_search_response(response)
 
-        entity_type_filters = [
-            (
-                MultiSelectFilter("_entityType", result.datahub_type.value),
-                MultiSelectFilter("typeNames", result.datahub_subtypes),
-            )
-            for result in result_types
-        ]
+    async def asearch(
+        self,
+        query: str = "*",
+        count: int = 20,
+        page: str | None = None,
+        result_types: Sequence[FindMoJdataEntityMapper] = (
+            TableEntityMapping,
+            ChartEntityMapping,
+            DatabaseEntityMapping,
+            SchemaEntityMapping,
+        ),
+        filters: Sequence[MultiSelectFilter] | None = None,
+        sort: SortOption | None = None,
+        include_facets: bool = True,
+        profile: QueryProfile = QueryProfile.CARD,
+    ) -> SearchResponse:
+        """
+        Async version of `search`
+        """
+        variables = self._page_variables(query, count, page, result_types, filters, sort, include_facets, profile)
+        try:
+            response = await self.executor.aexecute(self.search_query, variables)
+        except GraphError as e:
+            raise CatalogueError("Unable to execute search query") from e
 
-        formatted_filters = map_filters(filters, entity_type_filters)
+        return self._parse_search_response(response)
 
-        variables = {
-            "count": count,
-            "query": query,
-            "start": start,
-            "types": [],
-            "filters": formatted_filters,
-        }
+    def _page_variables(
+        self,
+        query: str,
+        count: int,
+        page: str | None,
+        result_types: Sequence[FindMoJdataEntityMapper],
+        filters: Sequence[MultiSelectFilter] | None,
+        sort: SortOption | None,
+        include_facets: bool,
+        profile: QueryProfile,
+    ) -> dict[str, Any]:
+        start = 0 if page is None else int(page) * count
+        variables = self._search_variables(query, result_types, filters)
+        variables.update({"count": count, "start": start, "includeFacets": include_facets})
+        variables.update(profile_variables(self.search_query, profile))
 
         if sort:
             variables.update({"sort": sort.format()})
+        return variables
 
-        try:
-            response = self.graph.execute_graphql(self.search_query, variables)
-        except GraphError as e:
-            raise CatalogueError("Unable to execute search query") from e
-
+    def _parse_search_response(self, response: dict[str, Any]) -> SearchResponse:
         response = response["searchAcrossEntities"]
         if response["total"] == 0:
             return SearchResponse(total_results=0, page_results=[])
 
-        logger.debug(json.dumps(response, indent=2))
         # Parse the search results
         page_results, malformed_result_urns = self._parse_search_results(response)
 
@@ -147,10 +200,88 @@ class SearchClient:
             total_results=response["total"],
             page_results=page_results,
             malformed_result_urns=malformed_result_urns,
-            facets=self._parse_facets(response.get("facets", [])),
-            tags=self._parse_dynamic_tags(response.get("facets", [])),
+            facets=self._parse_facets(response.get("facets") or []),
+            tags=self._parse_dynamic_tags(response.get("facets") or []),
         )
 
+    def get_search_aggregations(
+        self,
+        query: str = "*",
+        result_types: Sequence[FindMoJdataEntityMapper] = (
+            TableEntityMapping,
+            ChartEntityMapping,
+            DatabaseEntityMapping,
+            SchemaEntityMapping,
+        ),
+        filters: Sequence[MultiSelectFilter] | None = None,
+    ) -> SearchAggregations:
+        """
+        Return the facets and tags of the results of a search, without any of the results.
+        """
+        variables = self._aggregations_variables(query, result_types, filters)
+        try:
+            response = self.executor.execute(self.search_query, variables)
+        except GraphError as e:
+            raise CatalogueError("Unable to execute search query") from e
+
+        return self._parse_aggregations(response)
+
+    async def aget_search_aggregations(
+        self,
+        query: str = "*",
+        result_types: Sequence[FindMoJdataEntityMapper] = (
+            TableEntityMapping,
+            ChartEntityMapping,
+            DatabaseEntityMapping,
+            SchemaEntityMapping,
+        ),
+        filters: Sequence[MultiSelectFilter] | None = None,
+    ) -> SearchAggregations:
+        """
+        Async version of `get_search_aggregations`
+        """
+        variables = self._aggregations_variables(query, result_types, filters)
+        try:
+            response = await self.executor.aexecute(self.search_query, variables)
+        except GraphError as e:
+            raise CatalogueError("Unable to execute search query") from e
+
+        return self._parse_aggregations(response)
+
+    def _aggregations_variables(
+        self,
+        query: str,
+        result_types: Sequence[FindMoJdataEntityMapper],
+        filters: Sequence[MultiSelectFilter] | None,
+    ) -> dict[str, Any]:
+        variables = self._search_variables(query, result_types, filters)
+        variables.update({"count": 0, "start": 0, "includeFacets": True})
+        return variables
+
+    def _parse_aggregations(self, response: dict[str, Any]) -> SearchAggregations:
+        facets = response["searchAcrossEntities"].get("facets") or []
+        return SearchAggregations(facets=self._parse_facets(facets), tags=self._parse_dynamic_tags(facets))
+
+    @staticmethod
+    def _search_variables(
+        query: str,
+        result_types: Sequence[FindMoJdataEntityMapper],
+        filters: Sequence[MultiSelectFilter] | None,
+    ) -> dict[str, Any]:
+        entity_type_filters = [
+            (
+                MultiSelectFilter("_entityType", result.datahub_type.value),
+                MultiSelectFilter("typeNames", result.datahub_subtypes),
+            )
+            for result in result_types
+        ]
+
+        return {
+            "query": query,
+            "types": [],
+            "filters": map_filters(filters or [], entity_type_filters),
+        }
+
     def _parse_dynamic_tags(self, facets: list[dict[str, Any]]) -> list[TagItem | None]:
         """Parses tags from the search response facets,
         to provide only the options of tags contained within the search results to the user.
@@ -187,7 +318,8 @@ class SearchClient:
             entity_urn = result["entity"]["urn"]
             try:
                 parser = parser_factory.get_parser(result)
-                parsed_search_result = parser.parse(result)
+                with metrics.time_parse(type(parser).__name__):
+                    parsed_search_result = parser.parse(result)
                 page_results.append(parsed_search_result)
 
             except KeyError as k_e:
@@ -214,7 +346,7 @@ class SearchClient:
             "filters": formatted_filters,
         }
         try:
-            response = self.graph.execute_graphql(self.list_subject_areas_query, variables)
+            response = self.executor.execute(self.list_subject_areas_query, variables)
         except GraphError as e:
             raise CatalogueError("Unable to execute list domains query") from e
 
@@ -274,13 +406,11 @@ class SearchClient:
         """
         variables = {"count": count}
         try:
-            response = self.graph.execute_graphql(self.get_tags_query, variables)
+            response = self.executor.execute(self.get_tags_query, variables)
         except GraphError as e:
             raise CatalogueError("Unable to execute getTags query") from e
 
         response = response["searchAcrossEntities"]
-        logger.debug(json.dumps(response, indent=2))
-
         return self._parse_global_tags(response)
 
     def _parse_global_tags(self, tag_query_results) -> list[tuple[str, str]]:
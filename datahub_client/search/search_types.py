@@ -77,6 +77,8 @@ class SearchResult:
     last_modified: datetime | None = None
     created: datetime | None = None
     parent_entity: EntityRef | None = None
+    # When the entity's metadata was last ingested, in milliseconds since the epoch
+    last_ingested: int | None = None
     tags_to_display: list[str] = field(init=False)
 
     def __post_init__(self):
@@ -119,6 +121,16 @@ class TagItem:
     count: int
 
 
+@dataclass
+class SearchAggregations:
+    """
+    The facets and tags of every result of a search, which do not change from page to page
+    """
+
+    facets: SearchFacets = field(default_factory=SearchFacets)
+    tags: list[TagItem | None] = field(default_factory=list)
+
+
 @dataclass
 class SearchResponse:
     total_results: int
@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+from datahub_client import response_logging
+from datahub_client.graphql.loader import load_graphql_queries, validate_graphql_queries
 
 
 class HomeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "home"
+
+    def ready(self):
+        # Read the graphql queries once at startup rather than on the first request
+        load_graphql_queries()
+        if settings.CATALOGUE_VALIDATE_GRAPHQL_ON_STARTUP:
+            validate_graphql_queries()
+
+        response_logging.configure(
+            response_logging.ResponseLoggingConfig(
+                max_chars=settings.CATALOGUE_RESPONSE_LOG_MAX_CHARS,
+                sample_rate=settings.CATALOGUE_RESPONSE_LOG_SAMPLE_RATE,
+                dump_queries=settings.CATALOGUE_RESPONSE_LOG_QUERIES,
+            )
+        )
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from home.forms.search import SearchForm
+from home.service.browse_pages import BrowsePage, has_browse_page, store_browse_page
+from home.service.catalogue_version import refresh_catalogue_version
+from home.service.search import SearchService
+from home.service.subject_area_fetcher import SubjectAreaFetcher
+
+ITEMS_PER_PAGE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the catalogue version, and precompute the first CATALOGUE_BROWSE_PRECOMPUTE_PAGES pages of the "
+        "home page and subject area browses for it, if they have not been already. Also warms the entity type "
+        "counts and facets the pages are built from, via warm_entity_type_counts. Run this after each ingestion; "
+        "otherwise the first request for each page after an ingestion builds it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild the pages even if they have already been built for the current catalogue version",
+        )
+
+    def handle(self, *args, **options):
+        version = refresh_catalogue_version()
+
+        # The home page lists the subject areas
+        SubjectAreaFetcher().cached_fetcher.refresh()
+        subject_areas = [""] + [subject_area.urn for subject_area in SubjectAreaFetcher().fetch()]
+
+        # Every page of a browse shares its counts and facets, so warm them once up front
+        call_command("warm_entity_type_counts", stdout=self.stdout, stderr=self.stderr)
+
+        built = 0
+        for subject_area in subject_areas:
+            form = SearchForm({"subject_area": subject_area} if subject_area else {})
+            if not form.is_valid():
+                self.stderr.write(f"Skipping {subject_area}: {form.errors.as_text()}")
+                continue
+
+            for page in range(1, settings.CATALOGUE_BROWSE_PRECOMPUTE_PAGES + 1):
+                if not options["force"] and has_browse_page(version, subject_area, page, ITEMS_PER_PAGE):
+                    continue
+
+                service = SearchService(form, str(page), items_per_page=ITEMS_PER_PAGE, use_precomputed=False)
+                store_browse_page(
+                    version,
+                    subject_area,
+                    page,
+                    ITEMS_PER_PAGE,
+                    BrowsePage(service.results, service.entity_type_counts, service.aggregations),
+                )
+                built += 1
+                if page >= service.paginator.num_pages:
+                    break
+
+        self.stdout.write(f"Precomputed {built} browse pages for catalogue version {version}")
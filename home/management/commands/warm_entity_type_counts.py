@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from datahub_client.search.search_types import MultiSelectFilter
+from home.service.base import GenericService
+from home.service.entity_type_counts import get_entity_type_counts
+from home.service.search import SearchService
+from home.service.search_aggregations import get_search_aggregations, search_aggregations_cached
+from home.service.subject_area_fetcher import SubjectAreaFetcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-warm the cached entity type counts and search facets for the browse by subject area pages linked "
+        "from the home page. Run this more often than CATALOGUE_ENTITY_TYPE_COUNTS_CACHE_TTL_SECONDS and "
+        "CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS to keep them warm. precompute_browse_pages runs this "
+        "before building the browse pages."
+    )
+
+    def handle(self, *args, **options):
+        client = GenericService._get_catalogue_client()
+
+        # These match the searches made by SearchService when browsing without a query
+        searches = [[]] + [
+            [MultiSelectFilter("tags", [subject_area.urn])] for subject_area in SubjectAreaFetcher().fetch()
+        ]
+
+        # Browsing searches every entity type
+        result_types = SearchService._build_entity_types([])
+
+        for filters in searches:
+            get_entity_type_counts(client, query="", filters=filters, refresh=True)
+            if search_aggregations_cached():
+                get_search_aggregations(client, query="", result_types=result_types, filters=filters, refresh=True)
+
+        self.stdout.write(f"Cached entity type counts and facets for {len(searches)} searches")
@@ -1,9 +1,40 @@
 from django.conf import settings
+from django.core.cache import cache
 
+from datahub_client.cache import EntityDetailsCache
 from datahub_client.client import DataHubCatalogueClient
+from datahub_client.registry import ClientPoolConfig, client_registry
+
+
+def _catalogue_version() -> str | None:
+    # Imported here, as the catalogue version is itself polled with a GenericService client
+    from .catalogue_version import get_catalogue_version
+
+    return get_catalogue_version()
 
 
 class GenericService:
     @staticmethod
     def _get_catalogue_client() -> DataHubCatalogueClient:
-        return DataHubCatalogueClient(jwt_token=settings.CATALOGUE_TOKEN, api_url=settings.CATALOGUE_URL)
+        return client_registry.get_client(
+            jwt_token=settings.CATALOGUE_TOKEN,
+            api_url=settings.CATALOGUE_URL,
+            pool_config=ClientPoolConfig(
+                pool_connections=settings.CATALOGUE_POOL_CONNECTIONS,
+                pool_maxsize=settings.CATALOGUE_POOL_MAXSIZE,
+                async_max_connections=settings.CATALOGUE_ASYNC_MAX_CONNECTIONS,
+                timeout_sec=settings.CATALOGUE_TIMEOUT_SECONDS,
+                retry_max_times=settings.CATALOGUE_RETRY_MAX_TIMES,
+                max_age_seconds=settings.CATALOGUE_CLIENT_MAX_AGE_SECONDS,
+                persisted_queries=settings.CATALOGUE_PERSISTED_QUERIES,
+            ),
+            details_cache=EntityDetailsCache(
+                backend=cache,
+                ttl_seconds=settings.CATALOGUE_DETAILS_CACHE_TTL_SECONDS,
+                default_ttl_seconds=settings.CATALOGUE_DETAILS_CACHE_DEFAULT_TTL_SECONDS,
+                revalidate_after_seconds=settings.CATALOGUE_DETAILS_CACHE_REVALIDATE_SECONDS,
+                missing_ttl_seconds=settings.CATALOGUE_MISSING_ENTITY_CACHE_TTL_SECONDS,
+                header_ttl_seconds=settings.CATALOGUE_ENTITY_HEADERS_CACHE_TTL_SECONDS,
+                catalogue_version=_catalogue_version,
+            ),
+        )
@@ -0,0 +1,114 @@
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from datahub_client import metrics
+from datahub_client.cache import make_cache_key
+from datahub_client.entities import FindMoJdataEntityType
+from datahub_client.search.search_types import SearchAggregations, SearchResponse
+
+from .catalogue_version import get_catalogue_version
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "browse_page"
+
+# How long a request has to build a missing browse page before another request can claim it
+BUILD_LOCK_TIMEOUT_SECONDS = 30
+
+# Any of these in a search makes it more than browsing the whole catalogue or a subject area
+NON_BROWSE_FIELDS = ("query", "entity_types", "where_to_access", "tags")
+
+
+@dataclass
+class BrowsePage:
+    """
+    The results of one page of a browse, with the entity type counts and facets
+    shown alongside them
+    """
+
+    results: SearchResponse
+    entity_type_counts: dict[FindMoJdataEntityType, int]
+    aggregations: SearchAggregations
+
+
+def is_browse(form_data: dict[str, Any]) -> bool:
+    """
+    Whether a search is browsing, either the whole catalogue from the home page or a
+    subject area, rather than searching for something
+    """
+    return not any(form_data.get(field) for field in NON_BROWSE_FIELDS)
+
+
+def browse_page_key(version: str, subject_area: str, page: str | int, items_per_page: int) -> str:
+    return make_cache_key(CACHE_KEY_PREFIX, version, subject_area, str(page), str(items_per_page))
+
+
+def _current_browse_page_key(form_data: dict[str, Any], page: str, items_per_page: int) -> str | None:
+    if not is_browse(form_data):
+        return None
+
+    version = get_catalogue_version()
+    if version is None:
+        return None
+
+    return browse_page_key(version, form_data.get("subject_area") or "", page, items_per_page)
+
+
+def get_browse_page(form_data: dict[str, Any], page: str, items_per_page: int) -> BrowsePage | None:
+    """
+    Return a precomputed page of a browse, if the search is a browse and the page was
+    precomputed for the current catalogue version
+    """
+    key = _current_browse_page_key(form_data, page, items_per_page)
+    if key is None:
+        return None
+
+    browse_page = cache.get(key)
+    if browse_page is None:
+        metrics.record_cache_lookup(CACHE_KEY_PREFIX, "miss")
+        return None
+
+    logger.debug("Serving precomputed browse page %s", key)
+    metrics.record_cache_lookup(CACHE_KEY_PREFIX, "hit")
+    return browse_page
+
+
+def claim_browse_page(form_data: dict[str, Any], page: str, items_per_page: int) -> str | None:
+    """
+    Claim a browse page that should have been precomputed but was not, e.g. because
+    precompute_browse_pages has not run since the last ingestion, so the request that
+    claims it stores the page it builds. Only one request at a time can claim each page;
+    the others build the page for themselves without storing it.
+
+    Return the key to store the page under, or None if the page was not claimed.
+    """
+    if int(page) > settings.CATALOGUE_BROWSE_PRECOMPUTE_PAGES:
+        return None
+
+    key = _current_browse_page_key(form_data, page, items_per_page)
+    if key is None:
+        return None
+
+    if not cache.add(f"{key}:lock", True, timeout=BUILD_LOCK_TIMEOUT_SECONDS):
+        return None
+    return key
+
+
+def has_browse_page(version: str, subject_area: str, page: int, items_per_page: int) -> bool:
+    return browse_page_key(version, subject_area, page, items_per_page) in cache
+
+
+def store_browse_page(version: str, subject_area: str, page: int, items_per_page: int, browse_page: BrowsePage) -> None:
+    cache.set(
+        browse_page_key(version, subject_area, page, items_per_page),
+        browse_page,
+        timeout=settings.CATALOGUE_BROWSE_PAGES_CACHE_TTL_SECONDS,
+    )
+
+
+def store_claimed_browse_page(key: str, browse_page: BrowsePage) -> None:
+    cache.set(key, browse_page, timeout=settings.CATALOGUE_BROWSE_PAGES_CACHE_TTL_SECONDS)
@@ -0,0 +1,170 @@
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import cache
+
+from datahub_client import metrics
+
+from .concurrent_queries import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEnvelope:
+    """
+    Wraps a cached value with the time it becomes stale, so that empty values
+    such as [] can be told apart from a cache miss.
+    """
+
+    value: Any
+    fresh_until: float
+    # The catalogue version when the value was fetched
+    catalogue_version: str | None = None
+
+
+class CachedFetcher:
+    """
+    Serves a value from the cache, refreshing it with `fetch` using stale-while-revalidate.
+
+    Values are fresh for `soft_ttl_seconds`, and are then served stale until
+    `hard_ttl_seconds`, when they are evicted. Only one worker at a time refreshes
+    a stale value; the others keep serving the stale value rather than all querying
+    GMS at once. With `background_refresh`, the refresh runs on the catalogue query
+    thread pool so that no request waits for it. With `background_miss`, a value that
+    is not cached at all is fetched in the background too, and `get` returns None until
+    it has been cached.
+
+    If `catalogue_version` is given, it is called to get a token that changes whenever
+    anything in the catalogue is ingested, and values fetched under an older token are
+    stale however long they have been cached.
+    """
+
+    # The cache version of every entry. Bump it whenever CacheEnvelope or the shape of a
+    # cached value changes, so entries pickled by the previous release are not read
+    version = 4
+    miss_poll_interval_seconds = 0.05
+
+    def __init__(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        soft_ttl_seconds: float = 300,
+        hard_ttl_seconds: float = 3600,
+        lock_timeout_seconds: float = 30,
+        miss_wait_seconds: float = 5,
+        background_refresh: bool = False,
+        background_miss: bool = False,
+        catalogue_version: Callable[[], str | None] | None = None,
+    ):
+        self.key = key
+        self.lock_key = f"{key}:lock"
+        self.fetch = fetch
+        self.soft_ttl_seconds = soft_ttl_seconds
+        self.hard_ttl_seconds = max(hard_ttl_seconds, soft_ttl_seconds)
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.miss_wait_seconds = miss_wait_seconds
+        self.background_refresh = background_refresh
+        self.background_miss = background_miss
+        self.catalogue_version = catalogue_version
+
+    def get(self) -> Any:
+        envelope = self._get_envelope()
+
+        if envelope is not None:
+            if time.time() < envelope.fresh_until and self._is_current(envelope):
+                metrics.record_cache_lookup(self.key, "hit")
+                return envelope.value
+            metrics.record_cache_lookup(self.key, "stale")
+            return self._serve_stale(envelope)
+
+        metrics.record_cache_lookup(self.key, "miss")
+        return self._serve_miss()
+
+    def refresh(self) -> Any:
+        """
+        Fetch the value and store it in the cache, regardless of what is already cached.
+        """
+        # Read before fetching, so a value fetched during an ingestion is not stored as current
+        catalogue_version = self._current_version()
+        value = self.fetch()
+        cache.set(
+            self.key,
+            CacheEnvelope(
+                value=value,
+                fresh_until=time.time() + self.soft_ttl_seconds,
+                catalogue_version=catalogue_version,
+            ),
+            timeout=self.hard_ttl_seconds,
+            version=self.version,
+        )
+        return value
+
+    def _current_version(self) -> str | None:
+        return self.catalogue_version() if self.catalogue_version else None
+
+    def _is_current(self, envelope: CacheEnvelope) -> bool:
+        current = self._current_version()
+        return current is None or envelope.catalogue_version == current
+
+    def _get_envelope(self) -> CacheEnvelope | None:
+        envelope = cache.get(self.key, version=self.version)
+        return envelope if isinstance(envelope, CacheEnvelope) else None
+
+    def _serve_stale(self, envelope: CacheEnvelope) -> Any:
+        lock_token = self._acquire_lock()
+        if lock_token is None:
+            # Another worker is already refreshing the value
+            return envelope.value
+
+        if self.background_refresh:
+            run_in_background(lambda: self._refresh_and_release(lock_token))
+            return envelope.value
+
+        try:
+            return self._refresh_and_release(lock_token)
+        except Exception:
+            logger.exception("Unable to refresh %s, serving stale value", self.key)
+            return envelope.value
+
+    def _serve_miss(self) -> Any:
+        lock_token = self._acquire_lock()
+        if self.background_miss:
+            if lock_token is not None:
+                run_in_background(lambda: self._refresh_and_release(lock_token))
+            return None
+
+        if lock_token is not None:
+            return self._refresh_and_release(lock_token)
+
+        # Another worker is fetching the value, so wait for it rather than sending a duplicate query
+        deadline = time.monotonic() + self.miss_wait_seconds
+        while time.monotonic() < deadline:
+            time.sleep(self.miss_poll_interval_seconds)
+            envelope = self._get_envelope()
+            if envelope is not None:
+                return envelope.value
+
+        logger.warning("Timed out waiting for %s to be cached, fetching it directly", self.key)
+        return self.fetch()
+
+    def _refresh_and_release(self, lock_token: str) -> Any:
+        try:
+            return self.refresh()
+        finally:
+            self._release_lock(lock_token)
+
+    def _acquire_lock(self) -> str | None:
+        lock_token = uuid.uuid4().hex
+        if cache.add(self.lock_key, lock_token, timeout=self.lock_timeout_seconds, version=self.version):
+            return lock_token
+        return None
+
+    def _release_lock(self, lock_token: str) -> None:
+        # The lock may have timed out and been taken by another worker, which must not be released
+        if cache.get(self.lock_key, version=self.version) == lock_token:
+            cache.delete(self.lock_key, version=self.version)
@@ -0,0 +1,72 @@
+"""
+The catalogue version: a token that changes whenever an entity displayed in the catalogue
+is ingested, added or removed.
+
+The version is polled from GMS at most every CATALOGUE_VERSION_POLL_SECONDS, by one worker
+at a time in the background, and shared through the cache. Requests never wait for a poll:
+until the first poll has finished, the version is None and caches fall back to their TTLs.
+Catalogue data cached under the version rolls over as soon as an ingestion is noticed, so
+it can otherwise be cached for much longer than if its TTL were the only way to pick up
+changes.
+"""
+
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from core.request_memo import memoize
+
+from .base import GenericService
+from .cached_fetcher import CachedFetcher
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "catalogue_version"
+
+
+def _version_fetcher() -> CachedFetcher:
+    return CachedFetcher(
+        key=CACHE_KEY,
+        fetch=lambda: GenericService._get_catalogue_client().get_catalogue_version(),
+        soft_ttl_seconds=settings.CATALOGUE_VERSION_POLL_SECONDS,
+        hard_ttl_seconds=settings.CATALOGUE_VERSION_MAX_AGE_SECONDS,
+        background_refresh=True,
+        background_miss=True,
+    )
+
+
+def _get_or_poll() -> str | None:
+    try:
+        return _version_fetcher().get()
+    except Exception:
+        # Fall back to the caches' TTLs rather than failing the request
+        logger.exception("Unable to get the catalogue version")
+        return None
+
+
+def get_catalogue_version() -> str | None:
+    """
+    Return the current catalogue version, or None if it has not been polled yet or
+    cannot be fetched. Within a request, the version is only read once, so everything
+    cached by the request is cached under the same version.
+    """
+    return memoize(CACHE_KEY, _get_or_poll)
+
+
+async def aget_catalogue_version() -> str | None:
+    """
+    Async version of `get_catalogue_version`. Async views call this before using the
+    async catalogue client, so the version is read from the cache on a thread and the
+    client's caches then find it memoized for the request.
+    """
+    return await sync_to_async(get_catalogue_version)()
+
+
+def refresh_catalogue_version() -> str:
+    """
+    Poll the catalogue version now, e.g. straight after an ingestion, and return it
+    """
+    version = _version_fetcher().refresh()
+    logger.info("Catalogue version is %s", version)
+    return version
@@ -0,0 +1,160 @@
+from collections.abc import Iterator
+from typing import Any
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+
+from datahub_client.entities import (
+    DashboardEntityMapping,
+    DatabaseEntityMapping,
+    DatahubSubtype,
+    EntitySummary,
+    EntitySummaryPage,
+    RelationshipType,
+    SchemaEntityMapping,
+)
+
+from .base import GenericService
+from .pagination import CountPaginator
+
+CHILD_ENTITY_RESULT_TYPES = (
+    DatabaseEntityMapping.url_formatted,
+    SchemaEntityMapping.url_formatted,
+    DashboardEntityMapping.url_formatted,
+)
+
+
+def container_entity_type(result_type: str) -> str | None:
+    """
+    The type to give every entity in a container, or None to read it from each entity's subtypes
+    """
+    # Schemas only hold tables, whatever their subtype in GMS
+    return "TABLE" if result_type == SchemaEntityMapping.url_formatted else None
+
+
+def iter_container_entities(client, urn: str, entity_type: str | None = None) -> Iterator[EntitySummary]:
+    """
+    Every entity in a database or schema, fetched from GMS a page at a time
+    """
+    count = settings.DETAILS_ENTITIES_PER_PAGE
+    start = 0
+    while True:
+        page = client.list_container_entities(urn, start=start, count=count, entity_type=entity_type)
+        yield from page.entities
+        start += count
+        if not page.entities or start >= page.total:
+            return
+
+
+def _page_number(page: str | int) -> int:
+    try:
+        number = int(page)
+    except (TypeError, ValueError) as e:
+        raise PageNotAnInteger(f"{page!r} is not a page number") from e
+    if number < 1:
+        raise EmptyPage(f"{number} is not a page number")
+    return number
+
+
+class ChildEntitiesService(GenericService):
+    """
+    Lists the entities in a database, schema or dashboard a page at a time, for the
+    details page and for the partial that htmx swaps in to move between pages.
+
+    Databases and schemas can hold thousands of tables, so GMS filters, sorts and pages
+    them and only the requested page is fetched. Dashboards are paged from the charts
+    returned with the dashboard's details, which can be passed in as `charts` if they
+    have already been fetched.
+
+    Raises `InvalidPage` if `page` is not one of the pages. Under ASGI, build the service
+    with `acreate` instead, which waits on GMS without holding a thread.
+    """
+
+    def __init__(
+        self,
+        result_type: str,
+        urn: str,
+        page: str | int = "1",
+        charts: list[EntitySummary] | None = None,
+        items_per_page: int | None = None,
+    ):
+        self._prepare(result_type, urn, items_per_page)
+
+        if result_type == DashboardEntityMapping.url_formatted:
+            if charts is None:
+                charts = self.client.get_dashboard_details(self.urn).relationships[RelationshipType.CHILD]
+            self.page = self._charts_page(page, charts)
+        else:
+            number = _page_number(page)
+            entities = self.client.list_container_entities(self.urn, **self._page_query(number))
+            self.page = self._container_page(number, entities)
+
+        self._build_context()
+
+    @classmethod
+    async def acreate(
+        cls,
+        result_type: str,
+        urn: str,
+        page: str | int = "1",
+        charts: list[EntitySummary] | None = None,
+        items_per_page: int | None = None,
+    ) -> "ChildEntitiesService":
+        service = cls.__new__(cls)
+        service._prepare(result_type, urn, items_per_page)
+
+        if result_type == DashboardEntityMapping.url_formatted:
+            if charts is None:
+                charts = (await service.client.aget_dashboard_details(urn)).relationships[RelationshipType.CHILD]
+            service.page = service._charts_page(page, charts)
+        else:
+            number = _page_number(page)
+            entities = await service.client.alist_container_entities(urn, **service._page_query(number))
+            service.page = service._container_page(number, entities)
+
+        service._build_context()
+        return service
+
+    def _prepare(self, result_type: str, urn: str, items_per_page: int | None):
+        self.result_type = result_type
+        self.urn = urn
+        self.items_per_page = items_per_page or settings.DETAILS_ENTITIES_PER_PAGE
+        self.client = self._get_catalogue_client()
+
+    def _build_context(self):
+        self.context = self._get_context()
+        self.template = "partial/child_entities.html"
+
+    def _page_query(self, number: int) -> dict[str, Any]:
+        return {
+            "start": (number - 1) * self.items_per_page,
+            "count": self.items_per_page,
+            "entity_type": container_entity_type(self.result_type),
+        }
+
+    def _container_page(self, number: int, entities: EntitySummaryPage) -> Page:
+        paginator = CountPaginator(entities.total, self.items_per_page)
+        return Page(entities.entities, paginator.validate_number(number), paginator)
+
+    def _charts_page(self, page: str | int, charts: list[EntitySummary]) -> Page:
+        charts = sorted(charts, key=lambda d: d.entity_ref.display_name)
+        return Paginator(charts, self.items_per_page).page(_page_number(page))
+
+    @property
+    def has_schemas(self) -> bool:
+        # Databases hold either schemas or tables, never both
+        return all(entity.entity_type == DatahubSubtype.SCHEMA.value for entity in self.page.object_list)
+
+    @property
+    def name_column(self) -> str:
+        if self.result_type == DashboardEntityMapping.url_formatted:
+            return "Chart name"
+        return "Schema name" if self.has_schemas else "Table name"
+
+    def _get_context(self):
+        return {
+            "child_entities": self.page,
+            "name_column": self.name_column,
+            "result_type": self.result_type,
+            "urn": self.urn,
+        }
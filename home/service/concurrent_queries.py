@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_bulk_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Return the worker-wide thread pool used for catalogue queries, creating it on first use.
+    The pool is bounded so that a burst of requests cannot open unlimited connections to GMS.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.CATALOGUE_QUERY_MAX_WORKERS,
+                    thread_name_prefix="catalogue-query",
+                )
+    return _executor
+
+
+def _get_bulk_executor() -> ThreadPoolExecutor:
+    """
+    Return the worker-wide thread pool used for bulk work such as exports, creating it on
+    first use. It is separate from, and smaller than, the catalogue query pool, so a long
+    export cannot fill the query pool's queue and hold up the queries for interactive pages.
+    """
+    global _bulk_executor
+    if _bulk_executor is None:
+        with _executor_lock:
+            if _bulk_executor is None:
+                max_workers = min(settings.CATALOGUE_BULK_QUERY_MAX_WORKERS, settings.CATALOGUE_QUERY_MAX_WORKERS - 1)
+                _bulk_executor = ThreadPoolExecutor(
+                    max_workers=max(max_workers, 1),
+                    thread_name_prefix="catalogue-bulk-query",
+                )
+    return _bulk_executor
+
+
+def _timed(name: str, query: Callable[[], Any], timings: dict[str, float]) -> Any:
+    start = time.perf_counter()
+    try:
+        return query()
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def run_queries(queries: dict[str, Callable[[], Any]], bulk: bool = False) -> tuple[dict[str, Any], dict[str, float]]:
+    """
+    Run independent catalogue queries, concurrently if CATALOGUE_CONCURRENT_QUERIES is enabled.
+    Pass `bulk` for queries that are not needed to render a page, such as exports, to run
+    them on the smaller bulk query pool.
+
+    Returns the result of each query and the time each one took in seconds, keyed by the
+    names passed in. If any query raises, the first exception is re-raised, so callers see
+    the same errors as if the queries had been run one after the other.
+    """
+    timings: dict[str, float] = {}
+
+    if not settings.CATALOGUE_CONCURRENT_QUERIES or len(queries) < 2:
+        results = {name: _timed(name, query, timings) for name, query in queries.items()}
+        return results, timings
+
+    executor = _get_bulk_executor() if bulk else _get_executor()
+    futures: dict[str, Future] = {
+        # Copy the context so request-scoped state is visible from the worker thread
+        name: executor.submit(contextvars.copy_context().run, _timed, name, query, timings)
+        for name, query in queries.items()
+    }
+    done, _not_done = wait(futures.values(), return_when=FIRST_EXCEPTION)
+
+    for future in futures.values():
+        if future in done and future.exception() is not None:
+            raise future.exception()
+
+    results = {name: future.result() for name, future in futures.items()}
+    logger.debug("Catalogue query timings: %s", timings)
+    return results, timings
+
+
+async def _atimed(name: str, query: Callable[[], Awaitable[Any]], timings: dict[str, float]) -> Any:
+    start = time.perf_counter()
+    try:
+        return await query()
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def arun_queries(queries: dict[str, Callable[[], Awaitable[Any]]]) -> tuple[dict[str, Any], dict[str, float]]:
+    """
+    Async version of `run_queries`, for the async catalogue client methods. The queries
+    run concurrently on the event loop rather than on the thread pool, and if any query
+    raises, the others are cancelled and the first exception is re-raised.
+    """
+    timings: dict[str, float] = {}
+
+    if not settings.CATALOGUE_CONCURRENT_QUERIES or len(queries) < 2:
+        results = {name: await _atimed(name, query, timings) for name, query in queries.items()}
+        return results, timings
+
+    tasks = {name: asyncio.ensure_future(_atimed(name, query, timings)) for name, query in queries.items()}
+    try:
+        done, _not_done = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # Also cancels the queries if the request itself is cancelled
+        for task in tasks.values():
+            task.cancel()
+
+    for task in tasks.values():
+        if task in done and task.exception() is not None:
+            raise task.exception()
+
+    results = {name: task.result() for name, task in tasks.items()}
+    logger.debug("Catalogue query timings: %s", timings)
+    return results, timings
+
+
+def run_in_background(task: Callable[[], Any]) -> Future:
+    """
+    Run a task on the catalogue query thread pool without waiting for it.
+    Exceptions are logged, as there is no caller to raise them to.
+    """
+
+    def run_and_log():
+        try:
+            return task()
+        except Exception:
+            logger.exception("Background catalogue task failed")
+            raise
+
+    return _get_executor().submit(contextvars.copy_context().run, run_and_log)
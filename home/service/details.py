@@ -1,21 +1,33 @@
 import os
+from collections.abc import Iterator
 from urllib.parse import urlsplit
 
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import URLValidator
 
 from datahub_client.entities import (
+    Chart,
+    Dashboard,
     DashboardEntityMapping,
+    Database,
     DatabaseEntityMapping,
-    DatahubSubtype,
     EntityRef,
+    EntitySummary,
+    PublicationCollection,
     PublicationCollectionEntityMapping,
+    PublicationDataset,
     PublicationDatasetEntityMapping,
     RelationshipType,
+    Schema,
+    SchemaEntityMapping,
+    Table,
 )
+from datahub_client.graphql.profiles import QueryProfile
 
 from ..urns import PlatformUrns
 from .base import GenericService
+from .child_entities import ChildEntitiesService, container_entity_type, iter_container_entities
+from .concurrent_queries import arun_queries, run_queries
 
 
 def _parse_parent(relationships: dict) -> EntityRef | None:
@@ -35,6 +47,33 @@ def _parse_parent(relationships: dict) -> EntityRef | None:
     return parent_entity
 
 
+def _get_friendly_name(client, entity: EntityRef | None) -> str:
+    """
+    returns the human-friendly name of the entity, falling back to its system name
+    """
+    if not entity:
+        return ""
+    try:
+        header = client.get_entity_headers([entity.urn]).get(entity.urn)
+    except Exception:
+        # If fetch fails, fall back to system name
+        header = None
+    return header.friendly_name if header else entity.display_name
+
+
+async def _aget_friendly_name(client, entity: EntityRef | None) -> str:
+    """
+    Async version of `_get_friendly_name`
+    """
+    if not entity:
+        return ""
+    try:
+        header = (await client.aget_entity_headers([entity.urn])).get(entity.urn)
+    except Exception:
+        header = None
+    return header.friendly_name if header else entity.display_name
+
+
 def is_access_requirements_a_url(access_requirements) -> bool:
     """
     return a bool indicating if the passed access_requirements arg is a url
@@ -58,21 +97,54 @@ def friendly_platform_name(platform_name):
 
 
 class DatabaseDetailsService(GenericService):
-    def __init__(self, urn: str):
+    def __init__(self, urn: str, page: str = "1", list_child_entities: bool = True):
+        """
+        Pass `list_child_entities=False` when the page of child entities is not needed, e.g. for
+        the CSV export, which lists every entity through `entities_in_database`
+        """
         self.urn = urn
         self.client = self._get_catalogue_client()
 
-        self.database_metadata = self.client.get_database_details(self.urn)
+        # The database's entities are listed separately, a page at a time
+        queries = {"metadata": lambda: self.client.get_database_details(self.urn)}
+        if list_child_entities:
+            queries["child_entities"] = lambda: ChildEntitiesService(
+                DatabaseEntityMapping.url_formatted, self.urn, page
+            )
+        results, _timings = run_queries(queries)
+        self._load(results["metadata"], results.get("child_entities"))
+
+    @classmethod
+    async def acreate(cls, urn: str, page: str = "1", list_child_entities: bool = True) -> "DatabaseDetailsService":
+        service = cls.__new__(cls)
+        service.urn = urn
+        service.client = cls._get_catalogue_client()
+
+        queries = {"metadata": lambda: service.client.aget_database_details(urn)}
+        if list_child_entities:
+            queries["child_entities"] = lambda: ChildEntitiesService.acreate(
+                DatabaseEntityMapping.url_formatted, urn, page
+            )
+        results, _timings = await arun_queries(queries)
+        service._load(results["metadata"], results.get("child_entities"))
+        return service
+
+    def _load(self, database_metadata: Database, child_entities: ChildEntitiesService | None):
+        self.database_metadata = database_metadata
 
         if not self.database_metadata:
-            raise ObjectDoesNotExist(urn)
+            raise ObjectDoesNotExist(self.urn)
         self.is_esda = any(
             term.display_name == "Essential Shared Data Asset (ESDA)" for term in self.database_metadata.tags
         )
-        self.entities_in_database = self.database_metadata.relationships[RelationshipType.CHILD]
-        self.context = self._get_context()
+        self.child_entities = child_entities
+        self.context = self._get_context() if self.child_entities else {}
         self.template = "details_database.html"
 
+    @property
+    def entities_in_database(self) -> Iterator[EntitySummary]:
+        return iter_container_entities(self.client, self.urn)
+
     def h1_value(self):
         if self.database_metadata.custom_properties.readable_name:
             return self.database_metadata.custom_properties.readable_name
@@ -80,82 +152,121 @@ class DatabaseDetailsService(GenericService):
             return self.database_metadata.name
 
     def _get_context(self):
-        sorted_entities = sorted(
-            self.entities_in_database,
-            key=lambda d: d.entity_ref.display_name,
-        )
+        entities = self.child_entities.page.object_list
 
-        # Determine if children are schemas or tables
-        has_schemas = all(entity.entity_type == DatahubSubtype.SCHEMA.value for entity in self.entities_in_database)
         context = {
             "entity": self.database_metadata,
             "entity_type": "Database",
-            "schemas" if has_schemas else "tables": sorted_entities,
+            "schemas" if self.child_entities.has_schemas else "tables": entities,
             "h1_value": self.h1_value,
             "is_esda": self.is_esda,
             "is_access_requirements_a_url": is_access_requirements_a_url(
                 self.database_metadata.custom_properties.access_information.dc_access_requirements
             ),
             "PlatformUrns": PlatformUrns,
+            **self.child_entities.context,
         }
 
         return context
 
 
 class SchemaDetailsService(GenericService):
-    def __init__(self, urn: str):
+    def __init__(self, urn: str, page: str = "1", list_child_entities: bool = True):
+        """
+        Pass `list_child_entities=False` when the page of child entities is not needed, e.g. for
+        the CSV export, which lists every entity through `entities_in_database`
+        """
         self.urn = urn
         self.client = self._get_catalogue_client()
 
-        self.schema_metadata = self.client.get_schema_details(self.urn)
+        # The schema's tables are listed separately, a page at a time
+        queries = {"metadata": lambda: self.client.get_schema_details(self.urn)}
+        if list_child_entities:
+            queries["child_entities"] = lambda: ChildEntitiesService(SchemaEntityMapping.url_formatted, self.urn, page)
+        results, _timings = run_queries(queries)
+        self._load(results["metadata"], results.get("child_entities"))
+
+        if self.child_entities:
+            self._build_context(_get_friendly_name(self.client, self.parent_entity))
+
+    @classmethod
+    async def acreate(cls, urn: str, page: str = "1", list_child_entities: bool = True) -> "SchemaDetailsService":
+        service = cls.__new__(cls)
+        service.urn = urn
+        service.client = cls._get_catalogue_client()
+
+        queries = {"metadata": lambda: service.client.aget_schema_details(urn)}
+        if list_child_entities:
+            queries["child_entities"] = lambda: ChildEntitiesService.acreate(
+                SchemaEntityMapping.url_formatted, urn, page
+            )
+        results, _timings = await arun_queries(queries)
+        service._load(results["metadata"], results.get("child_entities"))
+
+        if service.child_entities:
+            service._build_context(await _aget_friendly_name(service.client, service.parent_entity))
+        return service
+
+    def _load(self, schema_metadata: Schema, child_entities: ChildEntitiesService | None):
+        self.schema_metadata = schema_metadata
 
         if not self.schema_metadata:
-            raise ObjectDoesNotExist(urn)
+            raise ObjectDoesNotExist(self.urn)
 
         self.parent_entity = _parse_parent(self.schema_metadata.relationships or {})
 
-        self.entities_in_database = self.schema_metadata.relationships[RelationshipType.CHILD]
-        self.context = self._get_context()
+        self.child_entities = child_entities
+        self.context = {}
         self.template = "details_schema.html"
 
-    def _get_context(self):
-        parent_entity_friendly_name = ""
-        if self.parent_entity:
-            try:
-                parent_database = self.client.get_database_details(self.parent_entity.urn)
-                parent_entity_friendly_name = (
-                    parent_database.custom_properties.readable_name or parent_database.display_name
-                )
-            except Exception:
-                # If fetch fails, fall back to system name
-                parent_entity_friendly_name = self.parent_entity.display_name
+    def _build_context(self, parent_entity_friendly_name: str):
+        self.parent_entity_friendly_name = parent_entity_friendly_name
+        self.context = self._get_context()
+
+    @property
+    def entities_in_database(self) -> Iterator[EntitySummary]:
+        return iter_container_entities(
+            self.client, self.urn, entity_type=container_entity_type(SchemaEntityMapping.url_formatted)
+        )
 
+    def _get_context(self):
         context = {
             "entity": self.schema_metadata,
             "entity_type": "Schema",
             "parent_entity": self.parent_entity,
-            "parent_entity_friendly_name": parent_entity_friendly_name,
+            "parent_entity_friendly_name": self.parent_entity_friendly_name,
             "parent_type": DatabaseEntityMapping.url_formatted,
-            "tables": sorted(
-                self.entities_in_database,
-                key=lambda d: d.entity_ref.display_name,
-            ),
+            "tables": self.child_entities.page.object_list,
             "h1_value": self.schema_metadata.name,
             "is_access_requirements_a_url": is_access_requirements_a_url(
                 self.schema_metadata.custom_properties.access_information.dc_access_requirements
             ),
             "PlatformUrns": PlatformUrns,
+            **self.child_entities.context,
         }
 
         return context
 
 
 class DatasetDetailsService(GenericService):
-    def __init__(self, urn: str):
+    def __init__(self, urn: str, profile: QueryProfile = QueryProfile.FULL):
         super().__init__()
         self.client = self._get_catalogue_client()
 
-        self.table_metadata = self.client.get_table_details(urn)
+        self._load(urn, self.client.get_table_details(urn, profile=profile))
+        self._build_context(_get_friendly_name(self.client, self.parent_entity))
+
+    @classmethod
+    async def acreate(cls, urn: str, profile: QueryProfile = QueryProfile.FULL) -> "DatasetDetailsService":
+        service = cls.__new__(cls)
+        service.client = cls._get_catalogue_client()
+
+        service._load(urn, await service.client.aget_table_details(urn, profile=profile))
+        service._build_context(await _aget_friendly_name(service.client, service.parent_entity))
+        return service
+
+    def _load(self, urn: str, table_metadata: Table):
+        self.table_metadata = table_metadata
 
         if not self.table_metadata:
             raise ObjectDoesNotExist(urn)
@@ -164,28 +275,20 @@ class DatasetDetailsService(GenericService):
 
         self.parent_entity = _parse_parent(relationships)
 
+    def _build_context(self, parent_entity_friendly_name: str):
+        self.parent_entity_friendly_name = parent_entity_friendly_name
         self.context = self._get_context()
 
         self.template = self._get_template()
 
     def _get_context(self):
         split_datahub_url = urlsplit(os.getenv("CATALOGUE_URL", "https://test-catalogue.gov.uk"))
-        parent_entity_friendly_name = ""
-        if self.parent_entity:
-            try:
-                parent_database = self.client.get_database_details(self.parent_entity.urn)
-                parent_entity_friendly_name = (
-                    parent_database.custom_properties.readable_name or parent_database.display_name
-                )
-            except Exception:
-                # If fetch fails, fall back to system name
-                parent_entity_friendly_name = self.parent_entity.display_name
 
         return {
             "entity": self.table_metadata,
             "entity_type": "Table",
             "parent_entity": self.parent_entity,
-            "parent_entity_friendly_name": parent_entity_friendly_name,
+            "parent_entity_friendly_name": self.parent_entity_friendly_name,
             "parent_type": DatabaseEntityMapping.url_formatted,
             "h1_value": self.table_metadata.name,
             "has_lineage": self.has_lineage(),
@@ -211,7 +314,17 @@ class DatasetDetailsService(GenericService):
 class ChartDetailsService(GenericService):
     def __init__(self, urn: str):
         self.client = self._get_catalogue_client()
-        self.chart_metadata = self.client.get_chart_details(urn)
+        self._load(self.client.get_chart_details(urn))
+
+    @classmethod
+    async def acreate(cls, urn: str) -> "ChartDetailsService":
+        service = cls.__new__(cls)
+        service.client = cls._get_catalogue_client()
+        service._load(await service.client.aget_chart_details(urn))
+        return service
+
+    def _load(self, chart_metadata: Chart):
+        self.chart_metadata = chart_metadata
         self.parent_entity = _parse_parent(self.chart_metadata.relationships or {})
         self.context = self._get_context()
         self.template = "details_public_domain_data.html"
@@ -232,10 +345,24 @@ class ChartDetailsService(GenericService):
 
 
 class DashboardDetailsService(GenericService):
-    def __init__(self, urn: str):
+    def __init__(self, urn: str, page: str = "1"):
         self.client = self._get_catalogue_client()
-        self.dashboard_metadata = self.client.get_dashboard_details(urn)
+        self._load(urn, page, self.client.get_dashboard_details(urn))
+
+    @classmethod
+    async def acreate(cls, urn: str, page: str = "1") -> "DashboardDetailsService":
+        service = cls.__new__(cls)
+        service.client = cls._get_catalogue_client()
+        service._load(urn, page, await service.client.aget_dashboard_details(urn))
+        return service
+
+    def _load(self, urn: str, page: str, dashboard_metadata: Dashboard):
+        self.dashboard_metadata = dashboard_metadata
         self.children = self.dashboard_metadata.relationships[RelationshipType.CHILD]
+        # The charts come with the dashboard's details, so listing them does not query GMS
+        self.child_entities = ChildEntitiesService(
+            DashboardEntityMapping.url_formatted, urn, page, charts=self.children
+        )
         self.context = self._get_context()
         self.template = "details_dashboard.html"
 
@@ -245,14 +372,12 @@ class DashboardDetailsService(GenericService):
             "entity_type": "Dashboard",
             "h1_value": self.dashboard_metadata.name,
             "platform_name": friendly_platform_name(self.dashboard_metadata.platform.display_name),
-            "charts": sorted(
-                self.children,
-                key=lambda d: d.entity_ref.display_name,
-            ),
+            "charts": self.child_entities.page.object_list,
             "is_access_requirements_a_url": is_access_requirements_a_url(
                 self.dashboard_metadata.custom_properties.access_information.dc_access_requirements
             ),
             "PlatformUrns": PlatformUrns,
+            **self.child_entities.context,
         }
 
 
@@ -260,11 +385,21 @@ class PublicationCollectionDetailsService(GenericService):
     def __init__(self, urn: str):
         self.urn = urn
         self.client = self._get_catalogue_client()
+        self._load(self.client.get_publication_collection_details(self.urn))
+
+    @classmethod
+    async def acreate(cls, urn: str) -> "PublicationCollectionDetailsService":
+        service = cls.__new__(cls)
+        service.urn = urn
+        service.client = cls._get_catalogue_client()
+        service._load(await service.client.aget_publication_collection_details(urn))
+        return service
 
-        self.publication_collection_metadata = self.client.get_publication_collection_details(self.urn)
+    def _load(self, publication_collection_metadata: PublicationCollection):
+        self.publication_collection_metadata = publication_collection_metadata
 
         if not self.publication_collection_metadata:
-            raise ObjectDoesNotExist(urn)
+            raise ObjectDoesNotExist(self.urn)
 
         self.entities_in_container = self.publication_collection_metadata.relationships[RelationshipType.CHILD]
         self.context = self._get_context()
@@ -294,11 +429,21 @@ class PublicationDatasetDetailsService(GenericService):
     def __init__(self, urn: str):
         self.urn = urn
         self.client = self._get_catalogue_client()
+        self._load(self.client.get_publication_dataset_details(self.urn))
 
-        self.publication_dataset_metadata = self.client.get_publication_dataset_details(self.urn)
+    @classmethod
+    async def acreate(cls, urn: str) -> "PublicationDatasetDetailsService":
+        service = cls.__new__(cls)
+        service.urn = urn
+        service.client = cls._get_catalogue_client()
+        service._load(await service.client.aget_publication_dataset_details(urn))
+        return service
+
+    def _load(self, publication_dataset_metadata: PublicationDataset):
+        self.publication_dataset_metadata = publication_dataset_metadata
 
         if not self.publication_dataset_metadata:
-            raise ObjectDoesNotExist(urn)
+            raise ObjectDoesNotExist(self.urn)
 
         relationships = self.publication_dataset_metadata.relationships or {}
         self.parent_entity = _parse_parent(relationships)
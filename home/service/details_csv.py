@@ -1,3 +1,6 @@
+import csv
+from collections.abc import Iterator
+
 from home.service.details import (
     DashboardDetailsService,
     DatabaseDetailsService,
@@ -12,8 +15,8 @@ class DatasetDetailsCsvFormatter:
     def filename(self):
         return (self.details_service.table_metadata.display_name or self.details_service.table_metadata.name) + ".csv"
 
-    def data(self):
-        return [
+    def data(self) -> Iterator[tuple]:
+        return (
             (
                 column.name,
                 column.display_name,
@@ -21,7 +24,7 @@ class DatasetDetailsCsvFormatter:
                 column.description,
             )
             for column in self.details_service.table_metadata.column_details
-        ]
+        )
 
     def headers(self):
         return [
@@ -41,15 +44,16 @@ class DatabaseDetailsCsvFormatter:
             self.details_service.database_metadata.display_name or self.details_service.database_metadata.name
         ) + ".csv"
 
-    def data(self):
-        return [
+    def data(self) -> Iterator[tuple]:
+        # The entities are fetched from GMS a page at a time as the rows are written
+        return (
             (
                 table.entity_ref.urn,
                 table.entity_ref.display_name,
                 table.description,
             )
             for table in self.details_service.entities_in_database
-        ]
+        )
 
     def headers(self):
         return [
@@ -68,11 +72,31 @@ class DashboardDetailsCsvFormatter:
             self.details_service.dashboard_metadata.display_name or self.details_service.dashboard_metadata.name
         ) + ".csv"
 
-    def data(self):
-        return [
+    def data(self) -> Iterator[tuple]:
+        return (
             (chart.entity_ref.urn, chart.entity_ref.display_name, chart.description)
             for chart in self.details_service.children
-        ]
+        )
 
     def headers(self):
         return ["urn", "display_name", "description"]
+
+
+class _Echo:
+    """
+    A file-like object that returns what is written to it, so that csv.writer
+    can format one row at a time without buffering the whole file
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(csv_formatter) -> Iterator[str]:
+    """
+    Yield the lines of the formatter's CSV, starting with the headers
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(csv_formatter.headers())
+    for row in csv_formatter.data():
+        yield writer.writerow(row)
@@ -0,0 +1,95 @@
+import json
+import logging
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+
+from datahub_client import metrics
+from datahub_client.cache import make_cache_key
+from datahub_client.client import DataHubCatalogueClient
+from datahub_client.entities import FindMoJdataEntityType
+from datahub_client.search.search_types import MultiSelectFilter
+
+from .catalogue_version import get_catalogue_version
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "entity_type_counts"
+
+
+def search_fingerprint(query: str, filters: Sequence[MultiSelectFilter]) -> str:
+    """
+    Return a stable representation of a search that ignores anything that cannot change
+    the entity type counts, such as the page, sort order and the order filters were applied in.
+    """
+    normalised_query = " ".join(query.split())
+    normalised_filters = sorted(
+        (search_filter.filter_name, sorted(str(value) for value in search_filter.included_values))
+        for search_filter in filters
+    )
+    return json.dumps([normalised_query, normalised_filters])
+
+
+def get_entity_type_counts(
+    client: DataHubCatalogueClient,
+    query: str = "*",
+    filters: Sequence[MultiSelectFilter] = (),
+    refresh: bool = False,
+) -> dict[FindMoJdataEntityType, int]:
+    """
+    Return the entity type counts for a search, using the cached counts for the same
+    query and filters if there are any. Paging through results or changing the sort
+    order can then be served with a single search query. Counts are cached under the
+    catalogue version, so they are counted again after each ingestion.
+
+    Pass `refresh` to query the catalogue regardless of the cache, e.g. to pre-warm it.
+    """
+    ttl = settings.CATALOGUE_ENTITY_TYPE_COUNTS_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return client.get_entity_type_counts(query=query, filters=list(filters))
+
+    key = _cache_key(query, filters)
+    if not refresh:
+        counts = cache.get(key)
+        if _record_lookup(counts, query):
+            return counts
+
+    counts = client.get_entity_type_counts(query=query, filters=list(filters))
+    cache.set(key, counts, timeout=ttl)
+    return counts
+
+
+async def aget_entity_type_counts(
+    client: DataHubCatalogueClient,
+    query: str = "*",
+    filters: Sequence[MultiSelectFilter] = (),
+) -> dict[FindMoJdataEntityType, int]:
+    """
+    Async version of `get_entity_type_counts`, for async views
+    """
+    ttl = settings.CATALOGUE_ENTITY_TYPE_COUNTS_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return await client.aget_entity_type_counts(query=query, filters=list(filters))
+
+    key = _cache_key(query, filters)
+    counts = await cache.aget(key)
+    if _record_lookup(counts, query):
+        return counts
+
+    counts = await client.aget_entity_type_counts(query=query, filters=list(filters))
+    await cache.aset(key, counts, timeout=ttl)
+    return counts
+
+
+def _cache_key(query: str, filters: Sequence[MultiSelectFilter]) -> str:
+    return make_cache_key(CACHE_KEY_PREFIX, search_fingerprint(query, filters), get_catalogue_version() or "")
+
+
+def _record_lookup(counts: dict[FindMoJdataEntityType, int] | None, query: str) -> bool:
+    if counts is None:
+        metrics.record_cache_lookup(CACHE_KEY_PREFIX, "miss")
+        return False
+    logger.debug("Entity type counts cache hit for %r", query)
+    metrics.record_cache_lookup(CACHE_KEY_PREFIX, "hit")
+    return True
@@ -0,0 +1,156 @@
+import itertools
+import json
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+from django.conf import settings
+
+from datahub_client.entities import Table, TableEntityMapping
+from datahub_client.exceptions import EntityDoesNotExist
+from datahub_client.graphql.profiles import QueryProfile
+from datahub_client.search.search_types import SortOption
+from home.forms.search import SearchForm
+
+from .base import GenericService
+from .concurrent_queries import run_queries
+from .details_csv import stream_csv
+from .search import SearchService
+
+logger = logging.getLogger(__name__)
+
+# Content types of the formats tables can be exported in
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Tables are listed from the search in pages of this size before their details are fetched
+SEARCH_PAGE_SIZE = 100
+
+
+class CatalogueExportService(GenericService):
+    """
+    Exports the metadata of every table matching a search, with a row per column for CSV
+    or a line per table for NDJSON, so analysts do not need to download each table's CSV.
+
+    The search is paged through as the export is written, and the tables' details are
+    fetched a batch at a time on the bulk query thread pool. Each batch is written out
+    before the next is fetched, so memory use does not grow with the number of tables.
+    The details are not cached, as an export reads each table once.
+    """
+
+    def __init__(self, form: SearchForm, export_format: str):
+        self.client = self._get_catalogue_client()
+        self.export_format = export_format
+        form_data = form.cleaned_data
+        self.query = SearchService._format_query_value(form_data.get("query", ""))
+        self.filters = SearchService.build_filters(form_data)
+
+    @property
+    def content_type(self) -> str:
+        return EXPORT_FORMATS[self.export_format]
+
+    def filename(self) -> str:
+        return f"catalogue-export.{self.export_format}"
+
+    def _list_tables(self) -> Iterator[str]:
+        """
+        Yield the urns of the tables matching the search, in name order, a search page at
+        a time. Search only pages through the first MAX_RESULTS.
+        """
+        listed = 0
+        page = 0
+        while True:
+            response = self.client.search(
+                query=self.query,
+                count=SEARCH_PAGE_SIZE,
+                page=str(page),
+                result_types=(TableEntityMapping,),
+                filters=self.filters,
+                sort=SortOption(field="_entityName", ascending=True),
+                include_facets=False,
+                profile=QueryProfile.HEADER,
+            )
+            for result in response.page_results:
+                yield result.urn
+            listed += len(response.page_results)
+
+            page += 1
+            total = min(response.total_results, settings.MAX_RESULTS)
+            if not response.page_results or listed >= total:
+                return
+
+    def _get_table(self, urn: str) -> Table | None:
+        try:
+            return self.client.get_table_details(urn, profile=QueryProfile.COLUMNS, use_cache=False)
+        except EntityDoesNotExist:
+            # Deleted since the search was run
+            logger.info("Leaving %s out of the export, as it no longer exists", urn)
+            return None
+
+    def _iter_tables(self) -> Iterator[Table]:
+        urns = self._list_tables()
+        while batch := list(itertools.islice(urns, settings.CATALOGUE_EXPORT_BATCH_SIZE)):
+            results, _timings = run_queries({urn: lambda urn=urn: self._get_table(urn) for urn in batch}, bulk=True)
+            for urn in batch:
+                if results[urn] is not None:
+                    yield results[urn]
+
+    def headers(self) -> list[str]:
+        return [
+            "table_urn",
+            "table_name",
+            "table_description",
+            "column_name",
+            "column_display_name",
+            "column_type",
+            "column_description",
+            "nullable",
+            "is_primary_key",
+        ]
+
+    def data(self) -> Iterator[tuple]:
+        for table in self._iter_tables():
+            if not table.column_details:
+                yield (table.urn, table.fully_qualified_name, table.description, "", "", "", "", "", "")
+            for column in table.column_details:
+                yield (
+                    table.urn,
+                    table.fully_qualified_name,
+                    table.description,
+                    column.name,
+                    column.display_name,
+                    column.type,
+                    column.description,
+                    column.nullable,
+                    column.is_primary_key,
+                )
+
+    def _as_json(self, table: Table) -> dict[str, Any]:
+        return {
+            "urn": table.urn,
+            "name": table.fully_qualified_name,
+            "description": table.description,
+            "columns": [
+                {
+                    "name": column.name,
+                    "display_name": column.display_name,
+                    "type": column.type,
+                    "description": column.description,
+                    "nullable": column.nullable,
+                    "is_primary_key": column.is_primary_key,
+                }
+                for column in table.column_details
+            ],
+        }
+
+    def stream(self) -> Iterator[str]:
+        """
+        Yield the export a chunk at a time
+        """
+        if self.export_format == "csv":
+            yield from stream_csv(self)
+        else:
+            for table in self._iter_tables():
+                yield json.dumps(self._as_json(table)) + "\n"
@@ -0,0 +1,163 @@
+import re
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping, Sequence
+from functools import lru_cache
+
+from nltk.stem import PorterStemmer
+
+from datahub_client.search.search_types import SearchResult
+
+_stemmer = PorterStemmer()
+_word_run_pattern = re.compile(r"\w+", flags=re.ASCII)
+
+
+@lru_cache(maxsize=4096)
+def stem(term: str) -> str:
+    return _stemmer.stem(term)
+
+
+def add_mark_tags(description: str, pattern: re.Pattern) -> str:
+    return pattern.sub(r"<mark>\1</mark>", description)
+
+
+class _WordRuns:
+    """
+    The runs of word characters in a string, for finding the run a position falls in.
+    """
+
+    def __init__(self, text: str):
+        spans = [match.span() for match in _word_run_pattern.finditer(text)]
+        self.starts = [start for start, _end in spans]
+        self.ends = [end for _start, end in spans]
+
+    def start_before(self, position: int) -> int:
+        """The first position of the word run that ends at or contains `position`"""
+        i = bisect_right(self.starts, position) - 1
+        if i >= 0 and position <= self.ends[i]:
+            return self.starts[i]
+        return position
+
+    def end_after(self, position: int) -> int:
+        """The position after the word run that starts at or contains `position`"""
+        i = bisect_right(self.starts, position) - 1
+        if i >= 0 and position < self.ends[i]:
+            return self.ends[i]
+        return position
+
+
+class QueryHighlighter:
+    """
+    Wraps the words of a description that contain the query, or any stemmed query term, in <mark> tags.
+
+    The output is the same as substituting `pattern`, which matches the whole word around
+    each term. That regex backtracks over every word for every term, so for ASCII text the
+    matches are found with a single left-to-right pass using str.find instead.
+    """
+
+    def __init__(self, query: str):
+        terms = [stem(term) for term in query.split()]
+        if len(terms) > 1:
+            terms = [query] + terms
+
+        pattern = "|".join([rf"(\w*{re.escape(word)}\w*)" for word in terms])
+        self.pattern = re.compile(rf"({pattern})", flags=re.IGNORECASE)
+
+        self.terms = [term.lower() for term in terms]
+        self.can_match_linearly = all(self.terms) and all(
+            term.isascii() and len(term) == len(original) for term, original in zip(self.terms, terms, strict=True)
+        )
+
+    def matches(self, description: str) -> bool:
+        if self._use_regex(description):
+            return self.pattern.search(description) is not None
+        lowered = description.lower()
+        return any(term in lowered for term in self.terms)
+
+    def mark(self, description: str) -> str:
+        if self._use_regex(description):
+            return add_mark_tags(description, self.pattern)
+
+        lowered = description.lower()
+        runs = _WordRuns(description)
+        next_occurrence = [lowered.find(term) for term in self.terms]
+        output = []
+        position = 0
+
+        while True:
+            # Like the regex, find the earliest position a match can start at,
+            # preferring earlier terms when several start at the same position
+            match_start = match_term = None
+            for i, term in enumerate(self.terms):
+                occurrence = next_occurrence[i]
+                if 0 <= occurrence < position:
+                    occurrence = next_occurrence[i] = lowered.find(term, position)
+                if occurrence < 0:
+                    continue
+                start = max(position, runs.start_before(occurrence))
+                if match_start is None or start < match_start:
+                    match_start, match_term = start, term
+
+            if match_term is None:
+                break
+
+            # The leading \w* is greedy, so the regex uses the last occurrence of the term
+            # that still follows on from the word characters at the start of the match
+            run_end = runs.end_after(match_start)
+            occurrence = lowered.rfind(match_term, match_start, run_end + len(match_term))
+            match_end = runs.end_after(occurrence + len(match_term))
+
+            output.append(description[position:match_start])
+            output.append(f"<mark>{description[match_start:match_end]}</mark>")
+            position = match_end
+
+        output.append(description[position:])
+        return "".join(output)
+
+    def _use_regex(self, description: str) -> bool:
+        return not (self.can_match_linearly and description.isascii())
+
+
+@lru_cache(maxsize=256)
+def get_highlighter(query: str) -> QueryHighlighter:
+    """
+    Return the highlighter for a query, reusing it for repeated searches
+    such as paging through results.
+    """
+    return QueryHighlighter(query)
+
+
+def highlight_description(description: str, highlighter: QueryHighlighter | None) -> str:
+    """
+    Wrap matches of the query in <mark> tags. Descriptions that do not match the query
+    are not shown, so an empty string is returned for them.
+    """
+    if highlighter is None:
+        return description
+    if description and highlighter.matches(description):
+        return highlighter.mark(description)
+    return ""
+
+
+class HighlightedDescriptions(Mapping[str, str]):
+    """
+    A mapping from the urn of each search result to its highlighted description.
+
+    Descriptions are highlighted the first time they are looked up, and the search
+    results themselves are never copied or modified.
+    """
+
+    def __init__(self, page_results: Sequence[SearchResult], highlighter: QueryHighlighter | None):
+        self._descriptions = {result.urn: result.description for result in page_results}
+        self._highlighter = highlighter
+        self._highlighted: dict[str, str] = {}
+
+    def __getitem__(self, urn: str) -> str:
+        if urn not in self._highlighted:
+            self._highlighted[urn] = highlight_description(self._descriptions[urn], self._highlighter)
+        return self._highlighted[urn]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._descriptions)
+
+    def __len__(self) -> int:
+        return len(self._descriptions)
@@ -0,0 +1,17 @@
+from django.core.paginator import Paginator
+
+
+class CountPaginator(Paginator):
+    """
+    A Paginator for results that are paged by the catalogue rather than held in memory,
+    built from the total number of results alone.
+
+    The object list is a range, which Django can count and slice without materialising
+    it, so the paginator's memory use does not grow with the number of results.
+    Pages beyond `max_count` results are not linked to.
+    """
+
+    def __init__(self, count: int, per_page: int, max_count: int | None = None, **kwargs):
+        if max_count is not None:
+            count = min(count, max_count)
+        super().__init__(range(max(count, 0)), per_page, **kwargs)
@@ -1,10 +1,10 @@
+import logging
+import math
 import re
-from copy import deepcopy
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.paginator import Paginator
-from nltk.stem import PorterStemmer
 
 from datahub_client.entities import (
     FindMoJdataEntityMapper,
@@ -13,6 +13,7 @@ from datahub_client.entities import (
 )
 from datahub_client.search.search_types import (
     MultiSelectFilter,
+    SearchAggregations,
     SearchResponse,
     SortOption,
     SubjectAreaOption,
@@ -20,27 +21,62 @@ from datahub_client.search.search_types import (
 from home.forms.search import SearchForm
 
 from .base import GenericService
+from .browse_pages import BrowsePage, claim_browse_page, get_browse_page, store_claimed_browse_page
+from .catalogue_version import aget_catalogue_version
+from .concurrent_queries import arun_queries, run_queries
+from .entity_type_counts import aget_entity_type_counts, get_entity_type_counts
+from .highlighting import HighlightedDescriptions, get_highlighter
+from .pagination import CountPaginator
+from .search_aggregations import aget_search_aggregations, get_search_aggregations, search_aggregations_cached
 from .subject_area_fetcher import SubjectAreaFetcher
 
+logger = logging.getLogger(__name__)
+
 
 class SearchService(GenericService):
-    def __init__(self, form: SearchForm, page: str, items_per_page: int = 20):
+    """
+    Searches the catalogue for the search page. Under ASGI, build the service with
+    `acreate` instead, which waits on GMS without holding a thread.
+    """
+
+    def __init__(self, form: SearchForm, page: str, items_per_page: int = 20, use_precomputed: bool = True):
+        self._prepare(form, page, items_per_page)
+        self.results, self.entity_type_counts, self.aggregations = self._get_search_results(
+            self.page, items_per_page, use_precomputed
+        )
+        self._build_context(items_per_page)
+
+    @classmethod
+    async def acreate(
+        cls, form: SearchForm, page: str, items_per_page: int = 20, use_precomputed: bool = True
+    ) -> "SearchService":
+        service = cls.__new__(cls)
+        # Subject areas are fetched from GMS with the sync client if they are not cached
+        await sync_to_async(service._prepare)(form, page, items_per_page)
+        await aget_catalogue_version()
+        service.results, service.entity_type_counts, service.aggregations = await service._aget_search_results(
+            service.page, items_per_page, use_precomputed
+        )
+        service._build_context(items_per_page)
+        return service
+
+    def _prepare(self, form: SearchForm, page: str, items_per_page: int):
         subject_areas: list[SubjectAreaOption] = SubjectAreaFetcher().fetch()
 
         self.subject_area_labels = {}
         for subject_area in subject_areas:
             self.subject_area_labels[subject_area.urn] = subject_area.name
 
-        self.stemmer = PorterStemmer()
         self.form = form
         if self.form.is_bound:
             self.form_data = self.form.cleaned_data
         else:
             self.form_data = {}
-        self.page = page
+        self.page = self._clamp_page(page, items_per_page)
         self.client = self._get_catalogue_client()
-        self.results, self.entity_type_counts = self._get_search_results(page, items_per_page)
-        self.highlighted_results = self._highlight_results()
+
+    def _build_context(self, items_per_page: int):
+        self.highlighted_descriptions = self._highlight_results()
         self.paginator = self._get_paginator(items_per_page)
         self.context = self._get_context()
 
@@ -57,6 +93,15 @@ class SearchService(GenericService):
 
         return chosen_entities if chosen_entities else default_entities
 
+    @staticmethod
+    def _clamp_page(page: str, items_per_page: int) -> str:
+        """
+        Search cannot page past MAX_RESULTS, so a deeper page, e.g. from an edited URL,
+        shows the last page that can be reached
+        """
+        last_page = math.ceil(settings.MAX_RESULTS / items_per_page)
+        return str(min(int(page), last_page))
+
     @staticmethod
     def _format_query_value(query: str) -> str:
         query_pattern: str = r"^[\"'].+[\"']$"
@@ -66,22 +111,16 @@ class SearchService(GenericService):
             query = query.replace("_", " ")
         return query
 
-    def _get_search_results(
-        self, page: str, items_per_page: int
-    ) -> tuple[SearchResponse, dict[FindMoJdataEntityType, int]]:
-        form_data = self.form_data
-        query = self._format_query_value(form_data.get("query", ""))
-
-        # we want to sort results ascending when a user is browsing data via
-        # non-keyword searches - otherwise we use the default relevant ordering
-        sort = form_data.get("sort", "relevance") if query not in ["*", ""] else "ascending"
-
+    @classmethod
+    def build_filters(cls, form_data: dict[str, Any]) -> list[MultiSelectFilter]:
+        """
+        The search filters for the subject area, where to access and tags chosen in the search form
+        """
         subject_area = form_data.get("subject_area", "")
         tags = form_data.get("tags", "")
-        where_to_access = self._build_custom_property_filter(
+        where_to_access = cls._build_custom_property_filter(
             "dc_where_to_access_dataset=", form_data.get("where_to_access", [])
         )
-        entity_types = self._build_entity_types(form_data.get("entity_types", []))
 
         filter_value = []
         if subject_area:
@@ -90,8 +129,108 @@ class SearchService(GenericService):
             filter_value.append(MultiSelectFilter("customProperties", where_to_access))
         if tags:
             filter_value.append(MultiSelectFilter("tags", [f"urn:li:tag:{tag}" for tag in tags]))
+        return filter_value
+
+    def _get_search_results(
+        self, page: str, items_per_page: int, use_precomputed: bool = False
+    ) -> tuple[SearchResponse, dict[FindMoJdataEntityType, int], SearchAggregations]:
+        claimed_browse_page = None
+        if use_precomputed:
+            browse_page, claimed_browse_page = self._get_or_claim_browse_page(page, items_per_page)
+            if browse_page is not None:
+                self.query_timings = {}
+                return browse_page.results, browse_page.entity_type_counts, browse_page.aggregations
+
+        search = self._search_arguments(page, items_per_page)
+
+        # Unless they are cached, the facets and tags come back with the page of results
+        separate_aggregations = search_aggregations_cached()
+
+        # The search results, the entity type counts (without entity type filter applied)
+        # and the facets are independent queries, so run them at the same time
+        queries = {
+            "search": lambda: self.client.search(**search, include_facets=not separate_aggregations),
+            "entity_type_counts": lambda: get_entity_type_counts(
+                self.client,
+                query=search["query"],
+                filters=search["filters"],
+            ),
+        }
+        if separate_aggregations:
+            queries["aggregations"] = lambda: get_search_aggregations(
+                self.client,
+                query=search["query"],
+                result_types=search["result_types"],
+                filters=search["filters"],
+            )
+
+        results, self.query_timings = run_queries(queries)
+        logger.debug("Search queries took %s", self.query_timings)
+
+        search_results = self._combine_results(results)
+        if claimed_browse_page is not None:
+            store_claimed_browse_page(claimed_browse_page, BrowsePage(*search_results))
+        return search_results
+
+    async def _aget_search_results(
+        self, page: str, items_per_page: int, use_precomputed: bool = False
+    ) -> tuple[SearchResponse, dict[FindMoJdataEntityType, int], SearchAggregations]:
+        """
+        Async version of `_get_search_results`
+        """
+        claimed_browse_page = None
+        if use_precomputed:
+            browse_page, claimed_browse_page = await sync_to_async(self._get_or_claim_browse_page)(page, items_per_page)
+            if browse_page is not None:
+                self.query_timings = {}
+                return browse_page.results, browse_page.entity_type_counts, browse_page.aggregations
+
+        search = self._search_arguments(page, items_per_page)
+        separate_aggregations = search_aggregations_cached()
+
+        queries = {
+            "search": lambda: self.client.asearch(**search, include_facets=not separate_aggregations),
+            "entity_type_counts": lambda: aget_entity_type_counts(
+                self.client,
+                query=search["query"],
+                filters=search["filters"],
+            ),
+        }
+        if separate_aggregations:
+            queries["aggregations"] = lambda: aget_search_aggregations(
+                self.client,
+                query=search["query"],
+                result_types=search["result_types"],
+                filters=search["filters"],
+            )
+
+        results, self.query_timings = await arun_queries(queries)
+        logger.debug("Search queries took %s", self.query_timings)
+
+        search_results = self._combine_results(results)
+        if claimed_browse_page is not None:
+            await sync_to_async(store_claimed_browse_page)(claimed_browse_page, BrowsePage(*search_results))
+        return search_results
+
+    def _get_or_claim_browse_page(self, page: str, items_per_page: int) -> tuple[BrowsePage | None, str | None]:
+        """
+        The first pages of the home page and subject area browses are precomputed
+        after each ingestion, by the precompute_browse_pages command, or by the first
+        request for them if the command has not run yet
+        """
+        browse_page = get_browse_page(self.form_data, page, items_per_page)
+        if browse_page is not None:
+            return browse_page, None
+        return None, claim_browse_page(self.form_data, page, items_per_page)
+
+    def _search_arguments(self, page: str, items_per_page: int) -> dict[str, Any]:
+        form_data = self.form_data
+        query = self._format_query_value(form_data.get("query", ""))
+
+        # we want to sort results ascending when a user is browsing data via
+        # non-keyword searches - otherwise we use the default relevant ordering
+        sort = form_data.get("sort", "relevance") if query not in ["*", ""] else "ascending"
 
-        page_for_search = str(int(page) - 1)
         if sort == "ascending":
             sort_option = SortOption(field="_entityName", ascending=True)
         elif sort == "descending":
@@ -99,27 +238,27 @@ class SearchService(GenericService):
         else:
             sort_option = None
 
-        results = self.client.search(
-            query=query,
-            page=page_for_search,
-            filters=filter_value,
-            result_types=entity_types,
-            sort=sort_option,
-            count=items_per_page,
-        )
+        return {
+            "query": query,
+            "page": str(int(page) - 1),
+            "filters": self.build_filters(form_data),
+            "result_types": self._build_entity_types(form_data.get("entity_types", [])),
+            "sort": sort_option,
+            "count": items_per_page,
+        }
 
-        # Get entity type counts (without entity type filter applied)
-        entity_type_counts = self.client.get_entity_type_counts(
-            query=query,
-            filters=filter_value,
+    @staticmethod
+    def _combine_results(
+        results: dict[str, Any],
+    ) -> tuple[SearchResponse, dict[FindMoJdataEntityType, int], SearchAggregations]:
+        search_response = results["search"]
+        aggregations = results.get("aggregations") or SearchAggregations(
+            facets=search_response.facets, tags=search_response.tags
         )
+        return search_response, results["entity_type_counts"], aggregations
 
-        return results, entity_type_counts
-
-    def _get_paginator(self, items_per_page: int) -> Paginator:
-        pages_list = list(range(self.results.total_results))
-
-        return Paginator(pages_list, items_per_page)
+    def _get_paginator(self, items_per_page: int) -> CountPaginator:
+        return CountPaginator(self.results.total_results, items_per_page, max_count=settings.MAX_RESULTS)
 
     def _generate_remove_filter_hrefs(self) -> dict[str, dict[str, str]] | None:
         if self.form.is_bound:
@@ -175,14 +314,14 @@ class SearchService(GenericService):
             "form": self.form,
             "results": self.results.page_results,
             "malformed_result_urns": self.results.malformed_result_urns,
-            "highlighted_results": self.highlighted_results.page_results,
+            "highlighted_descriptions": self.highlighted_descriptions,
             "h1_value": "Search for data assets",
             "page_obj": self.paginator.get_page(self.page),
             "number_of_words": len(self.form_data.get("query", "").split()),
             "total_results_str": total_results,
             "remove_filter_hrefs": self._generate_remove_filter_hrefs(),
             "readable_match_reasons": self._get_match_reason_display_names(),
-            "tags": self.results.tags,
+            "tags": self.aggregations.tags,
             "entity_type_counts": self.entity_type_counts.items(),
             "excluded_values": [
                 "description",
@@ -205,35 +344,14 @@ class SearchService(GenericService):
 
         return context
 
-    def _highlight_results(self) -> SearchResponse:
-        "Take a SearchResponse and add bold markdown where the query appears"
+    def _highlight_results(self) -> HighlightedDescriptions:
+        "Map each result's urn to its description, with <mark> tags where the query appears"
         query = self.form.cleaned_data.get("query", "") if self.form.is_valid() else ""
-        highlighted_results = deepcopy(self.results)
 
         if query in ("", "*"):
-            return highlighted_results
-
-        query_word_highlighting_pattern = self._compile_query_word_highlighting_pattern(query)
-        for result in highlighted_results.page_results:
-            if result.description and query_word_highlighting_pattern.search(result.description):
-                result.description = self._add_mark_tags(result.description, query_word_highlighting_pattern)
-            else:
-                result.description = ""
-
-        return highlighted_results
+            return HighlightedDescriptions(self.results.page_results, highlighter=None)
 
-    def _compile_query_word_highlighting_pattern(self, query: str) -> re.Pattern:
-        terms = [self.stemmer.stem(term) for term in query.split()]
-        if len(terms) > 1:
-            terms = [query] + terms
-
-        pattern = "|".join([rf"(\w*{re.escape(word)}\w*)" for word in terms])
-
-        return re.compile(rf"({pattern})", flags=re.IGNORECASE)
-
-    @staticmethod
-    def _add_mark_tags(description: str, pattern: re.Pattern) -> str:
-        return pattern.sub(r"<mark>\1</mark>", description)
+        return HighlightedDescriptions(self.results.page_results, highlighter=get_highlighter(query))
 
     @staticmethod
     def _get_match_reason_display_names():
@@ -0,0 +1,85 @@
+import logging
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+
+from datahub_client import metrics
+from datahub_client.cache import make_cache_key
+from datahub_client.client import DataHubCatalogueClient
+from datahub_client.entities import FindMoJdataEntityMapper
+from datahub_client.search.search_types import MultiSelectFilter, SearchAggregations
+
+from .catalogue_version import get_catalogue_version
+from .entity_type_counts import search_fingerprint
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "search_aggregations"
+
+
+def search_aggregations_cached() -> bool:
+    return settings.CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS > 0
+
+
+def get_search_aggregations(
+    client: DataHubCatalogueClient,
+    query: str,
+    result_types: Sequence[FindMoJdataEntityMapper],
+    filters: Sequence[MultiSelectFilter] = (),
+    refresh: bool = False,
+) -> SearchAggregations:
+    """
+    Return the facets and tags for a search, using the cached ones for the same query,
+    filters and entity types if there are any. These do not change when paging through
+    or re-sorting the results, so each page can then be fetched without them. They are
+    cached under the catalogue version, so they are fetched again after each ingestion.
+
+    Pass `refresh` to query the catalogue regardless of the cache, e.g. to pre-warm it.
+    """
+    key = _cache_key(query, result_types, filters)
+    if not refresh:
+        aggregations = cache.get(key)
+        if _record_lookup(aggregations, query):
+            return aggregations
+
+    aggregations = client.get_search_aggregations(query=query, result_types=result_types, filters=list(filters))
+    cache.set(key, aggregations, timeout=settings.CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS)
+    return aggregations
+
+
+async def aget_search_aggregations(
+    client: DataHubCatalogueClient,
+    query: str,
+    result_types: Sequence[FindMoJdataEntityMapper],
+    filters: Sequence[MultiSelectFilter] = (),
+) -> SearchAggregations:
+    """
+    Async version of `get_search_aggregations`, for async views
+    """
+    key = _cache_key(query, result_types, filters)
+    aggregations = await cache.aget(key)
+    if _record_lookup(aggregations, query):
+        return aggregations
+
+    aggregations = await client.aget_search_aggregations(query=query, result_types=result_types, filters=list(filters))
+    await cache.aset(key, aggregations, timeout=settings.CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS)
+    return aggregations
+
+
+def _cache_key(
+    query: str, result_types: Sequence[FindMoJdataEntityMapper], filters: Sequence[MultiSelectFilter]
+) -> str:
+    entity_types = ",".join(sorted(result_type.find_moj_data_type.name for result_type in result_types))
+    return make_cache_key(
+        CACHE_KEY_PREFIX, search_fingerprint(query, filters), entity_types, get_catalogue_version() or ""
+    )
+
+
+def _record_lookup(aggregations: SearchAggregations | None, query: str) -> bool:
+    if aggregations is None:
+        metrics.record_cache_lookup(CACHE_KEY_PREFIX, "miss")
+        return False
+    logger.debug("Search aggregations cache hit for %r", query)
+    metrics.record_cache_lookup(CACHE_KEY_PREFIX, "hit")
+    return True
@@ -1,24 +1,35 @@
-from django.core.cache import cache
+from functools import cached_property
+
+from django.conf import settings
+
+from core.request_memo import memoize
 
 from .base import GenericService
+from .cached_fetcher import CachedFetcher
+from .catalogue_version import get_catalogue_version
 
 
 class SearchTagFetcher(GenericService):
     def __init__(self):
-        self.client = self._get_catalogue_client()
-        self.cache_key = "search_tags"
-        self.cache_timeout_seconds = 300
+        self.cached_fetcher = CachedFetcher(
+            key="search_tags",
+            fetch=lambda: self.client.get_tags(),
+            soft_ttl_seconds=settings.CATALOGUE_OPTIONS_CACHE_SOFT_TTL_SECONDS,
+            hard_ttl_seconds=settings.CATALOGUE_OPTIONS_CACHE_HARD_TTL_SECONDS,
+            background_refresh=settings.CATALOGUE_OPTIONS_CACHE_BACKGROUND_REFRESH,
+            catalogue_version=get_catalogue_version,
+        )
+
+    @cached_property
+    def client(self):
+        # Only needed when the tags are not already cached
+        return self._get_catalogue_client()
 
     def fetch(self) -> list:
         """
         Fetch a static list of options that is independent of the search query
-        and any applied filters. Values are cached for 5 seconds to avoid
-        unnecessary queries.
+        and any applied filters. Values are cached to avoid unnecessary queries,
+        and served stale while they are refreshed. Within a request, the cache is
+        only read once.
         """
-        result = cache.get(self.cache_key, version=2)
-        if not result:
-            result = self.client.get_tags()
-
-            cache.set(self.cache_key, result, timeout=self.cache_timeout_seconds, version=2)
-
-        return result
+        return memoize(self.cached_fetcher.key, self.cached_fetcher.get)
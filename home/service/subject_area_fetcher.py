@@ -1,8 +1,13 @@
-from django.core.cache import cache
+from functools import cached_property
 
+from django.conf import settings
+
+from core.request_memo import memoize
 from datahub_client.search.search_types import SubjectAreaOption
 
 from .base import GenericService
+from .cached_fetcher import CachedFetcher
+from .catalogue_version import get_catalogue_version
 
 
 class SubjectAreaFetcher(GenericService):
@@ -11,14 +16,25 @@ class SubjectAreaFetcher(GenericService):
     """
 
     def __init__(self, filter_zero_entities: bool = True, sort_total_descending: bool = False):
-        self.client = self._get_catalogue_client()
-        self.cache_key = "list_subject_areas"
-        self.cache_timeout_seconds = 300
+        self.cached_fetcher = CachedFetcher(
+            key="list_subject_areas",
+            fetch=lambda: self.client.list_subject_areas(),
+            soft_ttl_seconds=settings.CATALOGUE_OPTIONS_CACHE_SOFT_TTL_SECONDS,
+            hard_ttl_seconds=settings.CATALOGUE_OPTIONS_CACHE_HARD_TTL_SECONDS,
+            background_refresh=settings.CATALOGUE_OPTIONS_CACHE_BACKGROUND_REFRESH,
+            catalogue_version=get_catalogue_version,
+        )
         self.filter_zero_entities = filter_zero_entities
         self.sort_total_descending = sort_total_descending
 
+    @cached_property
+    def client(self):
+        # Only needed when the subject areas are not already cached
+        return self._get_catalogue_client()
+
     def filter_and_sort(self, subject_areas: list[SubjectAreaOption]) -> list[SubjectAreaOption]:
-        result = subject_areas
+        # Copy the list, as the same list is shared by everything in the request
+        result = list(subject_areas)
         if self.filter_zero_entities:
             result = [subject_area for subject_area in result if subject_area.total > 0]
 
@@ -46,13 +62,11 @@ class SubjectAreaFetcher(GenericService):
     def fetch(self) -> list[SubjectAreaOption]:
         """
         Fetch a static list of options that is independent of the search query
-        and any applied filters. Values are cached for 5 seconds to avoid
-        unnecessary queries.
+        and any applied filters. Values are cached to avoid unnecessary queries,
+        and served stale while they are refreshed. Within a request, the cache is
+        only read once.
         """
-        result = cache.get(self.cache_key, version=2)
-        if not result:
-            result = self.client.list_subject_areas()
-            cache.set(self.cache_key, result, self.cache_timeout_seconds, version=2)
+        result = memoize(self.cached_fetcher.key, self.cached_fetcher.get)
 
         result = self.filter_and_sort(result)
         return result
@@ -10,3 +10,11 @@ def lookup(value_list, lookup_dict) -> list[Any]:
     Ignore any that are not in the list.
     """
     return sorted([lookup_dict[item] for item in value_list if item in lookup_dict])
+
+
+@register.filter
+def get_item(mapping, key) -> Any:
+    """
+    Return the value for a key that is only known at render time, e.g. `mapping|get_item:result.urn`.
+    """
+    return mapping.get(key)
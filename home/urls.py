@@ -22,7 +22,13 @@ urlpatterns = [
         views.details_view,
         name="details",
     ),
+    path(
+        "details/<str:result_type>/<str:urn>/entities/<str:page>",
+        views.details_entities_view,
+        name="details_entities",
+    ),
     path("pagination/<str:page>", views.search_view, name="pagination"),
+    path("export", views.export_view, name="export"),
     path("cookies", views.cookies_view, name="cookies"),
     path(
         "accessibility_statement",
@@ -1,15 +1,19 @@
-import csv
 import logging
+from contextlib import contextmanager
 from urllib.parse import urlparse
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.paginator import InvalidPage
 from django.http import (
     Http404,
-    HttpResponse,
     HttpResponseBadRequest,
+    StreamingHttpResponse,
 )
 from django.shortcuts import render
 from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
 
 from datahub_client.entities import (
     ChartEntityMapping,
@@ -20,9 +24,13 @@ from datahub_client.entities import (
     SchemaEntityMapping,
     TableEntityMapping,
 )
-from datahub_client.exceptions import EntityDoesNotExist
+from datahub_client.exceptions import CatalogueError, EntityDoesNotExist
+from datahub_client.graphql.profiles import QueryProfile
 from datahub_client.search.search_types import SubjectAreaOption
 from home.forms.search import SearchForm
+from home.service.base import GenericService
+from home.service.catalogue_version import aget_catalogue_version
+from home.service.child_entities import CHILD_ENTITY_RESULT_TYPES, ChildEntitiesService
 from home.service.details import (
     ChartDetailsService,
     DashboardDetailsService,
@@ -36,7 +44,9 @@ from home.service.details_csv import (
     DashboardDetailsCsvFormatter,
     DatabaseDetailsCsvFormatter,
     DatasetDetailsCsvFormatter,
+    stream_csv,
 )
+from home.service.export import EXPORT_FORMATS, CatalogueExportService
 from home.service.metadata_specification import MetadataSpecificationService
 from home.service.search import SearchService
 from home.service.subject_area_fetcher import SubjectAreaFetcher
@@ -62,28 +72,92 @@ def home_view(request):
     return render(request, "home.html", context)
 
 
-@cache_control(max_age=300, private=True)
-def details_view(request, result_type, urn):
+@contextmanager
+def _details_not_found(result_type, urn, page):
     try:
-        service = type_details_map[result_type](urn)
+        yield
     except KeyError as missing_result_type:
         logging.exception(f"Missing service_details_map for {missing_result_type}")
         raise Http404("Invalid result type") from missing_result_type
     except EntityDoesNotExist as e:
         raise Http404(f"{result_type} '{urn}' does not exist") from e
+    except InvalidPage as e:
+        raise Http404(f"{result_type} '{urn}' has no page {page}") from e
+
+
+def _render_details(request, result_type, urn, page="1"):
+    with _details_not_found(result_type, urn, page):
+        service_class = type_details_map[result_type]
+        if result_type in CHILD_ENTITY_RESULT_TYPES:
+            service = service_class(urn, page=page)
+        else:
+            service = service_class(urn)
+
+    return render(request, service.template, service.context)
+
+
+@cache_control(max_age=300, private=True)
+async def details_view(request, result_type, urn):
+    """
+    Async, so that under ASGI the worker can serve other requests while this one waits on
+    GMS. Templates are rendered on a thread, as context processors and template tags, such
+    as the user and waffle switches, may query the database.
+    """
+    await aget_catalogue_version()
+    with _details_not_found(result_type, urn, page="1"):
+        service = await type_details_map[result_type].acreate(urn)
+
+    return await sync_to_async(render)(request, service.template, service.context)
+
+
+@cache_control(max_age=300, private=True)
+@vary_on_headers("HX-Request")
+def details_entities_view(request, result_type, urn, page):
+    """
+    A page of the entities in a database, schema or dashboard. htmx requests get just the
+    list of entities to swap into the details page, and other requests get the whole page.
+    """
+    if result_type not in CHILD_ENTITY_RESULT_TYPES:
+        raise Http404("Invalid result type")
+    if request.headers.get("HX-Request") != "true":
+        return _render_details(request, result_type, urn, page)
+
+    try:
+        service = ChildEntitiesService(result_type, urn, page)
+    except EntityDoesNotExist as e:
+        raise Http404(f"{result_type} '{urn}' does not exist") from e
+    except InvalidPage as e:
+        raise Http404(f"{result_type} '{urn}' has no page {page}") from e
 
     return render(request, service.template, service.context)
 
 
+def details_csv_etag(request, result_type, urn) -> str | None:
+    """
+    The CSV export only changes when the entity is ingested again, so a repeat download
+    can be answered with 304 Not Modified after one cheap lastIngested query.
+    """
+    try:
+        last_ingested = GenericService._get_catalogue_client().get_last_ingested(urn)
+    except CatalogueError:
+        logging.warning("Could not get lastIngested for %s, so the CSV has no ETag", urn, exc_info=True)
+        return None
+    if last_ingested is None:
+        return None
+    return f'"{result_type}-{last_ingested}"'
+
+
 @cache_control(max_age=300, private=True)
-def details_view_csv(request, result_type, urn) -> HttpResponse:
+@condition(etag_func=details_csv_etag)
+def details_view_csv(request, result_type, urn) -> StreamingHttpResponse:
     match result_type:
         case TableEntityMapping.url_formatted:
-            csv_formatter = DatasetDetailsCsvFormatter(DatasetDetailsService(urn))
+            # The CSV only lists the table's columns
+            csv_formatter = DatasetDetailsCsvFormatter(DatasetDetailsService(urn, profile=QueryProfile.COLUMNS))
         case DatabaseEntityMapping.url_formatted:
-            csv_formatter = DatabaseDetailsCsvFormatter(DatabaseDetailsService(urn))
+            csv_formatter = DatabaseDetailsCsvFormatter(DatabaseDetailsService(urn, list_child_entities=False))
         case SchemaEntityMapping.url_formatted:
-            csv_formatter = DatabaseDetailsCsvFormatter(SchemaDetailsService(urn))
+            csv_formatter = DatabaseDetailsCsvFormatter(SchemaDetailsService(urn, list_child_entities=False))
         case DashboardEntityMapping.url_formatted:
             csv_formatter = DashboardDetailsCsvFormatter(DashboardDetailsService(urn))
         case _:
@@ -95,33 +169,60 @@ def details_view_csv(request, result_type, urn) -> HttpResponse:
     unsavoury_characters = str.maketrans({'"': ""})
     filename = csv_formatter.filename().translate(unsavoury_characters)
 
-    response = HttpResponse(
+    # Rows are written as they are produced, so wide tables and large databases
+    # are never held in memory as a whole file
+    return StreamingHttpResponse(
+        stream_csv(csv_formatter),
         content_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
-    writer = csv.writer(response)
-    writer.writerow(csv_formatter.headers())
-    writer.writerows(csv_formatter.data())
 
-    return response
+
+def export_view(request):
+    """
+    Export the metadata of every table matching a search, as CSV or NDJSON.
+    Takes the same parameters as the search page, plus `format`.
+    """
+    form = SearchForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors)
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        supported = ", ".join(EXPORT_FORMATS)
+        return HttpResponseBadRequest(f"Unsupported export format, use one of: {supported}", content_type="text/plain")
+
+    export_service = CatalogueExportService(form, export_format)
+    return StreamingHttpResponse(
+        export_service.stream(),
+        content_type=export_service.content_type,
+        headers={"Content-Disposition": f'attachment; filename="{export_service.filename()}"'},
+    )
+
+
+def _search_form(request) -> SearchForm:
+    if request.GET.get("new", ""):
+        return SearchForm()
+    # Populated search scenario
+    form = SearchForm(request.GET)
+    form.is_valid()
+    return form
 
 
 @cache_control(max_age=60, private=True)
-def search_view(request, page: str = "1"):
-    new_search = request.GET.get("new", "")
-    request.session["last_search"] = ""
-    if new_search:
-        form = SearchForm()
-    else:
-        # Populated search scenario
-        form = SearchForm(request.GET)
-        if not form.is_valid():
-            return HttpResponseBadRequest(form.errors)
-
-        request.session["last_search"] = request.GET.urlencode()
-
-    search_service = SearchService(form=form, page=page)
-    return render(request, "search.html", search_service.context)
+async def search_view(request, page: str = "1"):
+    """
+    Async for the same reasons as details_view. The form's choices may be fetched from GMS
+    with the sync client, so it is built and validated on a thread.
+    """
+    form = await sync_to_async(_search_form)(request)
+    if form.is_bound and not form.is_valid():
+        await request.session.aset("last_search", "")
+        return HttpResponseBadRequest(form.errors)
+    await request.session.aset("last_search", request.GET.urlencode() if form.is_bound else "")
+
+    search_service = await SearchService.acreate(form=form, page=page)
+    return await sync_to_async(render)(request, "search.html", search_service.context)
 
 
 def metadata_specification_view(request):
@@ -11,8 +11,11 @@ if [ -n "$RDS_INSTANCE_ADDRESS" ]; then
 fi
 
 python manage.py migrate
+python manage.py build_userguide
 python manage.py waffle_switch search-sort-radio-buttons off --create # create switch with default setting
 python manage.py waffle_switch display-result-tags on --create # create display tags switch with default off
 python manage.py waffle_switch show_is_nullable_in_table_details_column off --create # create isnullable column switch with default off
 
-gunicorn --bind 0.0.0.0:8000 core.wsgi:application --workers 2 --threads 4
+# Served under ASGI, so the search and details views wait on GMS without holding a thread.
+# Sync views run on the worker's thread pool.
+gunicorn --bind 0.0.0.0:8000 core.asgi:application --workers 2 --worker-class uvicorn_worker.UvicornWorker
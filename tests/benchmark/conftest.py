@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import platform
+import statistics
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from datahub_client.client import DataHubCatalogueClient
+
+from .fake_gms import FakeGMS
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Where to write the results of this run, for CI to keep or compare between branches
+RESULTS_PATH = Path(os.environ.get("BENCHMARK_RESULTS_PATH", Path(__file__).parent / "results.json"))
+
+# How much slower than the baseline a benchmark can be before it fails, e.g. 1.0 is twice as slow.
+# Timings on shared CI runners vary a lot, so this only catches large regressions by default
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "1.0"))
+# Views take a few milliseconds and run the whole middleware and template stack, so their
+# timings vary more from run to run than the parsing and search benchmarks
+VIEW_TOLERANCE = float(os.environ.get("BENCHMARK_VIEW_TOLERANCE", "2.0"))
+
+# Record this run as the new baseline instead of comparing against it
+UPDATE_BASELINE = os.environ.get("BENCHMARK_UPDATE_BASELINE", "false").lower() in ("true", "1", "yes")
+
+
+def _calibration_workload():
+    values = {f"key_{i}": str(i) * 3 for i in range(2000)}
+    return sorted(value.upper() for value in values.values())
+
+
+class BenchmarkRecorder:
+    """
+    Times benchmarks and compares them against the stored baseline.
+
+    Each repeat is divided by the time taken by a fixed calibration workload, measured just
+    before it, so results from a faster or slower machine can still be compared against the
+    baseline. The median of the repeats is compared, so one slow repeat, e.g. from a
+    garbage collection or a noisy neighbour, does not fail the benchmark.
+    """
+
+    def __init__(self, baseline: dict[str, Any]):
+        self.baseline = baseline
+        self.results: dict[str, dict[str, float]] = {}
+
+    def __call__(
+        self,
+        name: str,
+        function: Callable[[], Any],
+        number: int = 10,
+        repeat: int = 7,
+        tolerance: float = TOLERANCE,
+    ) -> float:
+        function()  # warm up caches and imports
+
+        # Log output is not timed, as it depends on where the logs are sent
+        logging.disable(logging.CRITICAL)
+        timings = []
+        try:
+            for _ in range(repeat):
+                calibration_seconds = min(timeit.repeat(_calibration_workload, number=20, repeat=3)) / 20
+                seconds = timeit.timeit(function, number=number) / number
+                timings.append((seconds, seconds / calibration_seconds))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        seconds = statistics.median(seconds for seconds, _relative in timings)
+        relative = statistics.median(relative for _seconds, relative in timings)
+        self.results[name] = {"seconds": seconds, "relative": relative}
+
+        expected = self.baseline.get("results", {}).get(name)
+        print(f"\n{name}: {seconds * 1000:.2f}ms ({relative:.1f}x calibration)", end="")
+        if expected is None or UPDATE_BASELINE:
+            return seconds
+
+        limit = expected["relative"] * (1 + tolerance)
+        print(f", baseline {expected['relative']:.1f}x", end="")
+        if relative > limit:
+            pytest.fail(
+                f"{name} regressed: {relative:.1f}x calibration, "
+                f"baseline {expected['relative']:.1f}x with {tolerance:.0%} tolerance"
+            )
+        return seconds
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "python": platform.python_version(),
+            "results": dict(sorted(self.results.items())),
+        }
+
+
+@pytest.fixture(scope="session")
+def benchmark():
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    recorder = BenchmarkRecorder(baseline)
+
+    yield recorder
+
+    if not recorder.results:
+        return
+    RESULTS_PATH.write_text(json.dumps(recorder.as_json(), indent=2) + "\n")
+    if UPDATE_BASELINE:
+        # Keep the baseline for benchmarks that were not run this time
+        results = {**baseline.get("results", {}), **recorder.results}
+        updated = {**recorder.as_json(), "results": dict(sorted(results.items()))}
+        BASELINE_PATH.write_text(json.dumps(updated, indent=2) + "\n")
+
+
+@pytest.fixture
+def fake_gms():
+    return FakeGMS()
+
+
+@pytest.fixture
+def fake_catalogue(fake_gms):
+    """
+    A real catalogue client, talking to the fake GMS, used by all the services
+    """
+    catalogue = DataHubCatalogueClient(jwt_token="abc", api_url="http://example.com/api/gms", graph=fake_gms)
+    catalogue.executor.async_transport = fake_gms.transport
+    with patch("home.service.base.GenericService._get_catalogue_client", return_value=catalogue):
+        yield catalogue
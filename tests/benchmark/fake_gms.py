@@ -0,0 +1,176 @@
+import json
+import re
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+import httpx
+from datahub.ingestion.graph.config import DatahubClientConfig
+
+RESPONSES_PATH = Path(__file__).parent / "responses"
+
+_operation_name_pattern = re.compile(r"^\s*query\s+(\w+)", flags=re.MULTILINE)
+
+# Entities with a recorded details response, and the file it is in
+DETAILS_RESPONSES = {
+    "urn:li:dataset:(urn:li:dataPlatform:athena,prison_population.prisoners,PROD)": "table",
+    "urn:li:dataset:(urn:li:dataPlatform:gov.uk,prison_statistics_2024,PROD)": "publication_dataset",
+    "urn:li:container:prison_population": "database",
+    "urn:li:container:prison_population_reporting": "schema",
+    "urn:li:container:prison_statistics": "publication_collection",
+    "urn:li:chart:(justice-data,prison_population)": "chart",
+    "urn:li:dashboard:(justice-data,prisons)": "dashboard",
+}
+
+
+class FakeGMS:
+    """
+    Stands in for DataHubGraph, answering graphql queries from the recorded responses
+    in `responses/` so the benchmarks run offline and always see the same data.
+
+    Each call parses the recorded JSON again, as the parsers modify the responses they are given.
+    Search results are repeated to fill the requested page, and the table's columns are
+    repeated to make it `columns` wide. `transport` answers the async client's queries
+    in the same way.
+    """
+
+    def __init__(self, columns: int | None = None):
+        self.config = DatahubClientConfig(server="http://example.com/api/gms", token="abc")
+        self.transport = httpx.MockTransport(self._handle_request)
+        self.calls: list[str] = []
+        self._responses = {path.stem: path.read_text() for path in RESPONSES_PATH.glob("*.json")}
+        if columns is not None:
+            self._responses["table"] = json.dumps(widen_table(json.loads(self._responses["table"]), columns))
+
+    def _handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"data": self.execute_graphql(body["query"], body.get("variables"))})
+
+    def execute_graphql(self, query: str, variables: dict[str, Any] | None = None, **kwargs) -> dict[str, Any]:
+        variables = variables or {}
+        operation_match = _operation_name_pattern.search(query)
+        operation = operation_match.group(1) if operation_match else ""
+        self.calls.append(operation)
+
+        match operation:
+            case "Search":
+                return self._search(variables)
+            case "agrregateTypes":
+                return self._response("entity_type_counts")
+            case "listSubjectAreas" | "Facets":
+                return self._response("list_subject_areas")
+            case "getTags":
+                return self._response("tags")
+            case "getEntityHeaders":
+                return {"entities": [self._header(urn) for urn in variables["urns"]]}
+            case "getContainerEntities":
+                return self._container_entities(variables)
+            case "getCatalogueVersion":
+                return self._catalogue_version()
+            case "getEntityLastIngested":
+                details = self._details(variables["urn"])
+                return {"entity": {"urn": variables["urn"], "lastIngested": details and details["lastIngested"]}}
+            case _:
+                details = self._details(variables.get("urn", ""))
+                root_field = re.search(r"{\s*(\w+)\s*\(", query).group(1)
+                return {root_field: details}
+
+    def exists(self, entity_urn: str) -> bool:
+        return entity_urn in DETAILS_RESPONSES
+
+    def _response(self, name: str) -> dict[str, Any]:
+        return json.loads(self._responses[name])
+
+    def _details(self, urn: str) -> dict[str, Any] | None:
+        name = DETAILS_RESPONSES.get(urn)
+        if name is None:
+            return None
+        response = self._response(name)
+        return next(iter(response.values()))
+
+    def _header(self, urn: str) -> dict[str, Any] | None:
+        details = self._details(urn)
+        if details is None:
+            return None
+        return {"urn": urn, "type": details["type"], "name": details.get("name"), "properties": details["properties"]}
+
+    def _container_entities(self, variables: dict[str, Any]) -> dict[str, Any]:
+        """
+        Answer the paged listing of a container from its recorded relationships, as GMS
+        would from the search index: displayed entities only, sorted by name.
+        """
+        details = self._details(variables["urn"]) or {}
+        relationships = (details.get("relationships") or {}).get("relationships", [])
+        entities = sorted(
+            (
+                relationship
+                for relationship in relationships
+                if any(
+                    tag["tag"]["urn"] == "urn:li:tag:dc_display_in_catalogue"
+                    for tag in (relationship["entity"].get("tags") or {}).get("tags", [])
+                )
+            ),
+            key=lambda relationship: relationship["entity"]["properties"]["name"],
+        )
+        start, count = variables["start"], variables["count"]
+        page = entities[start : start + count]
+        return {
+            "searchAcrossEntities": {"start": start, "count": len(page), "total": len(entities), "searchResults": page}
+        }
+
+    def _catalogue_version(self) -> dict[str, Any]:
+        entities = [{"urn": urn, "lastIngested": self._details(urn)["lastIngested"]} for urn in DETAILS_RESPONSES]
+        latest = max(entities, key=lambda entity: entity["lastIngested"] or 0)
+        return {"searchAcrossEntities": {"total": len(entities), "searchResults": [{"entity": latest}]}}
+
+    def _search(self, variables: dict[str, Any]) -> dict[str, Any]:
+        response = self._response("search")
+        search = response["searchAcrossEntities"]
+        recorded = search["searchResults"]
+        count = variables.get("count", len(recorded))
+        start = variables.get("start", 0)
+
+        results = []
+        for i in range(start, min(start + count, search["total"])):
+            result = deepcopy(recorded[i % len(recorded)])
+            if i >= len(recorded):
+                result["entity"]["urn"] += f"_{i}"
+            results.append(result)
+
+        search.update(start=start, count=len(results), searchResults=results)
+        if not variables.get("includeFacets", True):
+            search.pop("facets", None)
+        return response
+
+
+def widen_table(response: dict[str, Any], columns: int) -> dict[str, Any]:
+    """
+    Repeat the recorded columns, and their quality assertions, until the table has `columns` columns
+    """
+    schema_metadata = response["dataset"]["schemaMetadata"]
+    recorded_fields = schema_metadata["fields"]
+    recorded_assertions = response["dataset"]["assertions"]["assertions"]
+
+    fields = []
+    assertions = []
+    for i in range(columns):
+        field = deepcopy(recorded_fields[i % len(recorded_fields)])
+        suffix = f"_{i // len(recorded_fields)}" if i >= len(recorded_fields) else ""
+        original_path = field["fieldPath"]
+        field["fieldPath"] += suffix
+        fields.append(field)
+
+        for assertion in recorded_assertions:
+            parameters = assertion["info"]["datasetAssertion"]["nativeParameters"]
+            if any(parameter["value"] == original_path for parameter in parameters):
+                assertion = deepcopy(assertion)
+                assertion["urn"] += suffix
+                for parameter in assertion["info"]["datasetAssertion"]["nativeParameters"]:
+                    if parameter["key"] == "column_name":
+                        parameter["value"] = field["fieldPath"]
+                assertions.append(assertion)
+
+    schema_metadata["fields"] = fields
+    schema_metadata["primaryKeys"] = [field["fieldPath"] for field in fields[: max(1, columns // 100)]]
+    response["dataset"]["assertions"] = {"total": len(assertions), "assertions": assertions}
+    return response
@@ -0,0 +1,149 @@
+"""
+Benchmarks for the hot paths of a page view, run against the fake GMS.
+
+Run them with `make benchmark`, and update the stored baseline with `make benchmark-baseline`
+after an intentional change in performance.
+"""
+
+import json
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from datahub_client.entities import (
+    ChartEntityMapping,
+    DashboardEntityMapping,
+    DatabaseEntityMapping,
+    Mappers,
+    PublicationCollectionEntityMapping,
+    PublicationDatasetEntityMapping,
+    SchemaEntityMapping,
+    TableEntityMapping,
+)
+from datahub_client.parsers import TableParser
+from datahub_client.search.filters import map_filters
+from datahub_client.search.search_client import SearchClient
+from datahub_client.search.search_types import MultiSelectFilter
+from home.forms.search import SearchForm
+from home.service.search import SearchService
+
+from .conftest import VIEW_TOLERANCE
+from .fake_gms import FakeGMS, widen_table
+
+DETAILS_URNS = {
+    TableEntityMapping.url_formatted: "urn:li:dataset:(urn:li:dataPlatform:athena,prison_population.prisoners,PROD)",
+    PublicationDatasetEntityMapping.url_formatted: "urn:li:dataset:(urn:li:dataPlatform:gov.uk,prison_statistics_2024,PROD)",
+    DatabaseEntityMapping.url_formatted: "urn:li:container:prison_population",
+    SchemaEntityMapping.url_formatted: "urn:li:container:prison_population_reporting",
+    PublicationCollectionEntityMapping.url_formatted: "urn:li:container:prison_statistics",
+    ChartEntityMapping.url_formatted: "urn:li:chart:(justice-data,prison_population)",
+    DashboardEntityMapping.url_formatted: "urn:li:dashboard:(justice-data,prisons)",
+}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("count", [20, 100])
+def test_parse_search_results(benchmark, fake_gms, count):
+    search_client = SearchClient(fake_gms)
+    raw_response = json.dumps(fake_gms.execute_graphql(search_client.search_query, {"count": count}))
+
+    def parse():
+        response = json.loads(raw_response)["searchAcrossEntities"]
+        return search_client._parse_search_results(response)
+
+    page_results, malformed_result_urns = parse()
+    assert len(page_results) == count
+    assert not malformed_result_urns
+
+    benchmark(f"parse_search_results[{count}]", parse, number=5)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("columns", [100, 1500, 5000])
+def test_parse_wide_table(benchmark, fake_gms, columns):
+    raw_response = json.dumps(widen_table(fake_gms._response("table"), columns))
+    urn = DETAILS_URNS[TableEntityMapping.url_formatted]
+
+    def parse():
+        return TableParser().parse_to_entity_object(json.loads(raw_response)["dataset"], urn)
+
+    assert len(parse().column_details) == columns
+
+    benchmark(f"table_parser[{columns}]", parse, number=3)
+
+
+@pytest.mark.slow
+def test_map_filters(benchmark):
+    filters = [
+        MultiSelectFilter("tags", ["urn:li:tag:Prisons and probation"]),
+        MultiSelectFilter("customProperties", ["dc_where_to_access_dataset=AnalyticalPlatform"]),
+        MultiSelectFilter("tags", ["urn:li:tag:Prison", "urn:li:tag:Probation", "urn:li:tag:Risk"]),
+    ]
+    entity_filters = [
+        (
+            MultiSelectFilter("_entityType", mapping.datahub_type.value),
+            MultiSelectFilter("typeNames", mapping.datahub_subtypes),
+        )
+        for mapping in Mappers
+    ]
+
+    assert len(map_filters(filters, entity_filters)) == len(entity_filters)
+
+    benchmark("map_filters", lambda: map_filters(filters, entity_filters), number=1000)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "prison population"])
+def test_search_service(benchmark, fake_catalogue, query):
+    form = SearchForm(data={"query": query, "sort": "relevance", "tags": ["Prison"]})
+    assert form.is_valid()
+
+    def search():
+        # Measure a search that is not in the cache
+        cache.clear()
+        return SearchService(form=form, page="1")
+
+    service = search()
+    assert len(service.results.page_results) == 20
+    assert service.paginator.num_pages > 1
+
+    benchmark(f"search_service[{query or 'browse'}]", search, number=5)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+@pytest.mark.parametrize("result_type", DETAILS_URNS)
+def test_details_view(benchmark, fake_catalogue, client, result_type):
+    url = reverse("home:details", kwargs={"result_type": result_type, "urn": DETAILS_URNS[result_type]})
+
+    def render():
+        cache.clear()
+        return client.get(url)
+
+    assert render().status_code == 200
+
+    benchmark(f"details_view[{result_type}]", render, number=5, tolerance=VIEW_TOLERANCE)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_wide_table_details_view(benchmark, fake_catalogue, client):
+    wide_gms = FakeGMS(columns=1500)
+    fake_catalogue.graph = fake_catalogue.executor.graph = wide_gms
+    fake_catalogue.executor.async_transport = wide_gms.transport
+    url = reverse(
+        "home:details",
+        kwargs={"result_type": TableEntityMapping.url_formatted, "urn": DETAILS_URNS[TableEntityMapping.url_formatted]},
+    )
+
+    def render():
+        cache.clear()
+        return client.get(url)
+
+    response = render()
+    assert response.status_code == 200
+    assert len(response.context["entity"].column_details) == 1500
+
+    benchmark("details_view[table,1500]", render, number=2, repeat=3, tolerance=VIEW_TOLERANCE)
@@ -0,0 +1,58 @@
+import tracemalloc
+from copy import deepcopy
+
+import pytest
+
+from datahub_client.entities import TagRef
+from datahub_client.search.search_types import SearchResponse
+from home.service.highlighting import HighlightedDescriptions, QueryHighlighter, add_mark_tags
+from tests.conftest import generate_search_result
+
+HIGHLIGHTER = QueryHighlighter("data")
+
+
+def make_response(page_size: int) -> SearchResponse:
+    page_results = []
+    for _ in range(page_size):
+        result = generate_search_result(
+            metadata={"search_summary": "a", "domain_name": "Prison", "total_parents": 1, "dc_readable_name": "x"}
+        )
+        result.description = "Data about data quality. " * 40
+        result.matches = {"description": [result.description], "name": [result.name]}
+        result.tags = [TagRef(display_name=f"tag-{i}", urn=f"urn:li:tag:tag-{i}") for i in range(10)]
+        page_results.append(result)
+    return SearchResponse(total_results=page_size, page_results=page_results)
+
+
+def highlight_with_deepcopy(results: SearchResponse) -> list[str]:
+    highlighted_results = deepcopy(results)
+    for result in highlighted_results.page_results:
+        result.description = add_mark_tags(result.description, HIGHLIGHTER.pattern)
+    return [result.description for result in highlighted_results.page_results]
+
+
+def highlight_with_mapping(results: SearchResponse) -> list[str]:
+    highlighted = HighlightedDescriptions(results.page_results, HIGHLIGHTER)
+    return [highlighted[result.urn] for result in results.page_results]
+
+
+def peak_allocated_bytes(highlight, results: SearchResponse) -> int:
+    tracemalloc.start()
+    try:
+        highlight(results)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("page_size", [20, 100])
+def test_highlighting_allocates_less_than_deepcopy(page_size):
+    results = make_response(page_size)
+    assert highlight_with_deepcopy(results) == highlight_with_mapping(results)
+
+    deepcopy_peak = peak_allocated_bytes(highlight_with_deepcopy, results)
+    mapping_peak = peak_allocated_bytes(highlight_with_mapping, results)
+
+    assert mapping_peak < deepcopy_peak, f"mapping peak {mapping_peak} bytes, deepcopy peak {deepcopy_peak} bytes"
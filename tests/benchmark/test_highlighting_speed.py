@@ -0,0 +1,31 @@
+import pytest
+from faker import Faker
+
+from home.service.highlighting import QueryHighlighter, add_mark_tags, get_highlighter
+
+fake = Faker()
+Faker.seed(42)
+
+QUERIES = ["prison", "prison population statistics", "offender management court"]
+
+
+def make_description(paragraphs: int) -> str:
+    return "\n\n".join(fake.paragraph(nb_sentences=8) + " Prison population data." for _ in range(paragraphs))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("paragraphs", [1, 10, 50])
+@pytest.mark.parametrize("query", QUERIES)
+def test_linear_highlighter(benchmark, query, paragraphs):
+    description = make_description(paragraphs)
+    highlighter = QueryHighlighter(query)
+    assert highlighter.mark(description) == add_mark_tags(description, highlighter.pattern)
+
+    benchmark(f"highlighter[{query},{paragraphs}]", lambda: highlighter.mark(description), number=50)
+
+
+@pytest.mark.slow
+def test_compiling_highlighter_is_cached(benchmark):
+    assert get_highlighter("prison population statistics") is get_highlighter("prison population statistics")
+
+    benchmark("get_highlighter", lambda: get_highlighter("prison population statistics"), number=100_000)
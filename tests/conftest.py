@@ -1,3 +1,4 @@
+import inspect
 import time
 from collections.abc import Generator
 from random import choice
@@ -6,6 +7,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from django.test import Client
 from faker import Faker
 from notifications_python_client.notifications import NotificationsAPIClient
@@ -28,6 +30,7 @@ from datahub_client.entities import (
     DatabaseEntityMapping,
     EntityRef,
     EntitySummary,
+    EntitySummaryPage,
     FindMoJdataEntityMapper,
     FindMoJdataEntityType,
     Governance,
@@ -42,11 +45,13 @@ from datahub_client.entities import (
     TagRef,
 )
 from datahub_client.search.search_types import (
+    SearchAggregations,
     SearchResponse,
     SearchResult,
     SubjectAreaOption,
 )
 from home.forms.search import SearchForm, SubjectAreaChoice
+from home.service.catalogue_version import refresh_catalogue_version
 from home.service.details import DatabaseDetailsService
 from home.service.search import SearchService
 from home.service.search_tag_fetcher import SearchTagFetcher
@@ -669,6 +674,26 @@ def client():
     return client
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Catalogue responses are cached, so stop them leaking between tests
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def run_cache_refreshes_inline():
+    """
+    Background cache refreshes would otherwise finish at unpredictable times, possibly
+    after the cache has been cleared for the next test
+    """
+    with patch("home.service.cached_fetcher.run_in_background", side_effect=lambda task: task()):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def mock_notifications_client():
     patcher = patch("feedback.service.get_notify_api_client")
@@ -681,6 +706,20 @@ def mock_notifications_client():
     patcher.stop()
 
 
+def mirror_async_methods(mock_catalogue):
+    """
+    Have each async method of the mocked client, e.g. `asearch`, call its sync counterpart,
+    so tests set up and make assertions on the sync methods whichever the code calls
+    """
+    for name, _method in inspect.getmembers(DataHubCatalogueClient, inspect.iscoroutinefunction):
+        sync_name = name.removeprefix("a")
+        if not name.startswith("_") and hasattr(DataHubCatalogueClient, sync_name):
+            # Looked up on each call, as tests may replace the sync method
+            getattr(mock_catalogue, name).side_effect = lambda *args, _name=sync_name, **kwargs: getattr(
+                mock_catalogue, _name
+            )(*args, **kwargs)
+
+
 @pytest.fixture(autouse=True)
 def mock_catalogue(
     request,
@@ -731,17 +770,31 @@ def mock_catalogue(
     mock_get_chart_details_response(mock_catalogue)
     mock_get_table_details_response(mock_catalogue, example_table)
     mock_get_database_details_response(mock_catalogue, example_database)
+    mock_list_container_entities_response(mock_catalogue, example_database.relationships[RelationshipType.CHILD])
     mock_get_dashboard_details_response(mock_catalogue, example_dashboard)
     mock_get_tags_response(mock_catalogue)
     mock_get_publication_collection_details_response(mock_catalogue, example_publication_collection)
     mock_get_publication_dataset_details_response(mock_catalogue, example_publication_dataset)
     mock_entity_type_counts_response(mock_catalogue)
+    mock_catalogue.get_search_aggregations.return_value = SearchAggregations()
+    mock_get_entity_headers_response(mock_catalogue)
+    mock_catalogue.get_last_ingested.return_value = None
+    mock_catalogue.get_catalogue_version.return_value = "100-1705990502353"
+    mirror_async_methods(mock_catalogue)
 
     yield mock_catalogue
 
     patcher.stop()
 
 
+@pytest.fixture
+def polled_catalogue_version(mock_catalogue):
+    """
+    The catalogue version is None until it has been polled, so poll it up front
+    """
+    return refresh_catalogue_version()
+
+
 def mock_list_database_tables_response(mock_catalogue, total_results, page_results=()):
     search_response = SearchResponse(total_results=total_results, page_results=page_results)
     mock_catalogue.list_database_tables.return_value = search_response
@@ -763,6 +816,16 @@ def mock_get_database_details_response(mock_catalogue, example_database):
     mock_catalogue.get_database_details.return_value = example_database
 
 
+def mock_list_container_entities_response(mock_catalogue, entities=(), total=None):
+    mock_catalogue.list_container_entities.return_value = EntitySummaryPage(
+        total=len(entities) if total is None else total, entities=list(entities)
+    )
+
+
+def mock_get_entity_headers_response(mock_catalogue, headers=()):
+    mock_catalogue.get_entity_headers.return_value = {header.urn: header for header in headers}
+
+
 def mock_search_response(mock_catalogue, total_results=0, page_results=()):
     search_response = SearchResponse(total_results=total_results, page_results=page_results)
     mock_catalogue.search.return_value = search_response
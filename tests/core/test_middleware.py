@@ -1,9 +1,11 @@
 from unittest.mock import MagicMock
 
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
 from django.core.exceptions import BadRequest
-from django.http import Http404
+from django.http import Http404, HttpResponse
 
-from core.middleware import CustomErrorMiddleware
+from core.middleware import CustomErrorMiddleware, ServerTimingMiddleware
+from datahub_client import metrics
 from datahub_client.exceptions import ConnectivityError
 
 
@@ -53,3 +55,35 @@ def test_middleware_renders_unhandled_exception_response():
     assert response
     assert b"There is a problem with this service" in response.content
     assert response.status_code == 500
+
+
+def test_server_timing_middleware_reports_catalogue_timings():
+    def get_response(request):
+        with metrics.graphql_query("search"):
+            pass
+        with metrics.time_parse("TableParser"):
+            pass
+        return HttpResponse()
+
+    response = ServerTimingMiddleware(get_response)(MagicMock())
+
+    names = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+    assert names == ["gql-search", "parse-TableParser", "total"]
+
+
+def test_server_timing_middleware_reports_timings_from_async_views():
+    def query():
+        with metrics.graphql_query("search"):
+            pass
+
+    async def get_response(request):
+        await sync_to_async(query)()
+        return HttpResponse()
+
+    middleware = ServerTimingMiddleware(get_response)
+    assert iscoroutinefunction(middleware)
+
+    response = async_to_sync(middleware)(MagicMock())
+
+    names = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+    assert names == ["gql-search", "total"]
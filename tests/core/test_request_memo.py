@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock, patch
+
+from django.http import HttpResponse
+
+from core.middleware import RequestMemoMiddleware
+from core.request_memo import memoize, request_memo
+from home.forms.search import SearchForm
+from home.service.search import SearchService
+
+
+def test_memoize_computes_once_per_memo():
+    compute = MagicMock(return_value="value")
+
+    with request_memo():
+        assert memoize("key", compute) == "value"
+        assert memoize("key", compute) == "value"
+    with request_memo():
+        memoize("key", compute)
+
+    assert compute.call_count == 2
+
+
+def test_memoize_without_memo_always_computes():
+    compute = MagicMock(return_value="value")
+
+    memoize("key", compute)
+    memoize("key", compute)
+
+    assert compute.call_count == 2
+
+
+def test_middleware_scopes_memo_to_request():
+    compute = MagicMock(return_value="value")
+
+    def view(request):
+        memoize("key", compute)
+        memoize("key", compute)
+        return HttpResponse()
+
+    middleware = RequestMemoMiddleware(view)
+    middleware(MagicMock())
+    middleware(MagicMock())
+
+    assert compute.call_count == 2
+
+
+def test_search_request_reads_subject_areas_once(mock_catalogue, valid_subject_area_choice):
+    def get_cached(fetcher):
+        return "1-1" if fetcher.key == "catalogue_version" else []
+
+    with (
+        request_memo(),
+        patch("home.service.subject_area_fetcher.CachedFetcher.get", autospec=True, side_effect=get_cached) as get,
+    ):
+        form = SearchForm(data={"query": "test", "subject_area": ""})
+        assert form.is_valid()
+        SearchService(form=form, page="1")
+        str(form["subject_area"])
+
+    reads = [call.args[0].key for call in get.call_args_list]
+    assert reads.count("list_subject_areas") == 1
+    assert reads.count("catalogue_version") == 1
@@ -487,6 +487,7 @@ def test_full_page(mock_graph, searcher):
                 tags=[],
                 last_modified=None,
                 created=None,
+                last_ingested=1705990502353,
             ),
             SearchResult(
                 urn="urn:li:dataset:(urn:li:dataPlatform:bigquery,calm-pagoda-323403.jaffle_shop.customers2,PROD)",
@@ -795,6 +796,44 @@ def test_search_results_with_facets(searcher, mock_graph):
     )
 
 
+def test_search_without_facets(searcher, mock_graph):
+    datahub_response = {"searchAcrossEntities": {"start": 0, "count": 10, "total": 10, "searchResults": []}}
+    mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+
+    response = searcher.search(include_facets=False)
+
+    assert mock_graph.execute_graphql.call_args.args[1]["includeFacets"] is False
+    assert response == SearchResponse(total_results=10, page_results=[])
+
+
+def test_get_search_aggregations(searcher, mock_graph):
+    datahub_response = {
+        "searchAcrossEntities": {
+            "start": 0,
+            "count": 0,
+            "total": 10,
+            "searchResults": [],
+            "facets": [
+                {
+                    "field": "tags",
+                    "displayName": "Tag",
+                    "aggregations": [
+                        {"value": "urn:li:tag:Prison", "count": 3, "entity": {"properties": {"name": "Prison"}}},
+                    ],
+                },
+            ],
+        }
+    }
+    mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+
+    response = searcher.get_search_aggregations(query="prison", filters=[MultiSelectFilter("tags", ["Abc"])])
+
+    variables = mock_graph.execute_graphql.call_args.args[1]
+    assert (variables["count"], variables["includeFacets"]) == (0, True)
+    assert response.facets.options("tags") == [FacetOption(value="urn:li:tag:Prison", label="Prison", count=3)]
+    assert response.tags == [TagItem(name="Prison", slug="Prison", count=3)]
+
+
 def test_search_for_charts(mock_graph, searcher):
     datahub_response = {
         "searchAcrossEntities": {
@@ -0,0 +1,324 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from datahub_client.cache import EntityDetailsCache, make_cache_key
+from datahub_client.client import DataHubCatalogueClient
+from datahub_client.entities import EntityHeader
+from datahub_client.exceptions import EntityDoesNotExist
+from datahub_client.graphql.profiles import QueryProfile
+from datahub_client.parsers import ChartParser
+from tests.conftest import generate_table_metadata
+
+
+class DictCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    async def aget(self, key, default=None):
+        return self.get(key, default)
+
+    async def aget_many(self, keys):
+        return self.get_many(keys)
+
+    async def aset(self, key, value, timeout=None):
+        self.set(key, value, timeout)
+
+
+@pytest.fixture
+def backend():
+    return DictCache()
+
+
+@pytest.fixture
+def details_cache(backend):
+    return EntityDetailsCache(backend, ttl_seconds={"chart": 0}, revalidate_after_seconds=60)
+
+
+def test_make_cache_key_is_stable_and_safe():
+    key = make_cache_key(
+        "entity_details", "table", "urn:li:dataset:(urn:li:dataPlatform:glue,db.table with space,PROD)"
+    )
+
+    assert key == make_cache_key(
+        "entity_details", "table", "urn:li:dataset:(urn:li:dataPlatform:glue,db.table with space,PROD)"
+    )
+    assert " " not in key
+    assert len(key) < 250
+
+
+def test_get_or_fetch_caches_entity(details_cache):
+    table = generate_table_metadata()
+    fetch = MagicMock(return_value=(table, 1000))
+    get_last_ingested = MagicMock()
+
+    first = details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+    second = details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+
+    assert first == second == table
+    fetch.assert_called_once()
+    get_last_ingested.assert_not_called()
+
+
+def test_zero_ttl_disables_caching(details_cache):
+    fetch = MagicMock(return_value=(generate_table_metadata(), 1000))
+
+    details_cache.get_or_fetch("chart", "urn:li:chart:a", fetch, MagicMock())
+    details_cache.get_or_fetch("chart", "urn:li:chart:a", fetch, MagicMock())
+
+    assert fetch.call_count == 2
+
+
+def test_stale_entry_is_served_when_not_reingested(details_cache):
+    table = generate_table_metadata()
+    fetch = MagicMock(return_value=(table, 1000))
+    get_last_ingested = MagicMock(return_value=1000)
+
+    with patch("datahub_client.cache.time.time", return_value=0):
+        details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+    with patch("datahub_client.cache.time.time", return_value=120):
+        result = details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+
+    assert result == table
+    fetch.assert_called_once()
+    get_last_ingested.assert_called_once()
+
+
+def test_stale_entry_is_refetched_after_ingestion(details_cache):
+    old_table = generate_table_metadata(name="old")
+    new_table = generate_table_metadata(name="new")
+    fetch = MagicMock(side_effect=[(old_table, 1000), (new_table, 2000)])
+    get_last_ingested = MagicMock(return_value=2000)
+
+    with patch("datahub_client.cache.time.time", return_value=0):
+        details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+    with patch("datahub_client.cache.time.time", return_value=120):
+        result = details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+
+    assert result == new_table
+    assert fetch.call_count == 2
+
+
+def test_entry_is_served_without_revalidating_until_the_catalogue_version_changes(backend):
+    version = MagicMock(return_value="1-1000")
+    details_cache = EntityDetailsCache(backend, revalidate_after_seconds=60, catalogue_version=version)
+    fetch = MagicMock(return_value=(generate_table_metadata(), 1000))
+    get_last_ingested = MagicMock(return_value=1000)
+
+    with patch("datahub_client.cache.time.time", return_value=0):
+        details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+    with patch("datahub_client.cache.time.time", return_value=1200):
+        details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+        get_last_ingested.assert_not_called()
+
+        version.return_value = "2-2000"
+        details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+        details_cache.get_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+
+    fetch.assert_called_once()
+    get_last_ingested.assert_called_once()
+
+
+def test_missing_urns_and_headers_are_forgotten_when_the_catalogue_version_changes(backend):
+    version = MagicMock(return_value="1-1000")
+    details_cache = EntityDetailsCache(backend, catalogue_version=version)
+    header = EntityHeader(urn="urn:li:dataset:a", name="a", display_name="a")
+    details_cache.mark_missing("table", "urn:li:dataset:b")
+    details_cache.set_headers([header])
+
+    assert details_cache.is_known_missing("table", "urn:li:dataset:b")
+    assert details_cache.get_headers(["urn:li:dataset:a"]) == {"urn:li:dataset:a": header}
+
+    version.return_value = "2-2000"
+
+    assert not details_cache.is_known_missing("table", "urn:li:dataset:b")
+    assert details_cache.get_headers(["urn:li:dataset:a"]) == {}
+
+
+def test_client_serves_details_from_cache(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(
+        return_value={
+            "dataset": {
+                "platform": {"name": "datahub"},
+                "name": "Dataset",
+                "properties": {},
+                "lastIngested": 1710426920000,
+            }
+        }
+    )
+
+    first = datahub_client.get_table_details("urn:li:dataset:a")
+    second = datahub_client.get_table_details("urn:li:dataset:a")
+
+    assert first == second
+    base_mock_graph.execute_graphql.assert_called_once()
+
+
+def test_missing_urns_are_remembered(details_cache):
+    assert not details_cache.is_known_missing("table", "urn:li:dataset:missing")
+
+    details_cache.mark_missing("table", "urn:li:dataset:missing")
+
+    assert details_cache.is_known_missing("table", "urn:li:dataset:missing")
+    assert not details_cache.is_known_missing("table", "urn:li:dataset:other")
+    assert not details_cache.is_known_missing("chart", "urn:li:dataset:missing")
+
+
+def test_zero_missing_ttl_disables_negative_caching(backend):
+    details_cache = EntityDetailsCache(backend, missing_ttl_seconds=0)
+
+    details_cache.mark_missing("table", "urn:li:dataset:missing")
+
+    assert not details_cache.is_known_missing("table", "urn:li:dataset:missing")
+
+
+def test_client_does_not_requery_missing_entity(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(return_value={"dataset": None})
+
+    for _ in range(2):
+        with pytest.raises(EntityDoesNotExist):
+            datahub_client.get_table_details("urn:li:dataset:missing")
+
+    base_mock_graph.execute_graphql.assert_called_once()
+
+
+def test_wrong_type_of_details_link_does_not_hide_the_entity(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(return_value={"dataset": None})
+    with pytest.raises(EntityDoesNotExist):
+        datahub_client.get_table_details("urn:li:chart:a")
+
+    chart = {"urn": "urn:li:chart:a", "exists": True, "platform": {"name": "justice-data"}}
+    base_mock_graph.execute_graphql = MagicMock(return_value={"chart": chart})
+    with patch.object(ChartParser, "parse_to_entity_object", return_value="chart") as parse:
+        assert datahub_client.get_chart_details("urn:li:chart:a") == "chart"
+
+    parse.assert_called_once()
+
+
+def test_stub_without_aspects_is_missing(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(
+        return_value={"dataset": {"urn": "urn:li:dataset:stub", "exists": True, "platform": None}}
+    )
+
+    with pytest.raises(EntityDoesNotExist):
+        datahub_client.get_table_details("urn:li:dataset:stub")
+
+
+def test_client_caches_entity_headers(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    details_cache.set_headers([EntityHeader(urn="urn:li:container:a", name="a", display_name="a")])
+    base_mock_graph.execute_graphql = MagicMock(
+        return_value={"entities": [{"urn": "urn:li:container:b", "type": "CONTAINER", "properties": {"name": "b"}}]}
+    )
+
+    headers = datahub_client.get_entity_headers(["urn:li:container:a", "urn:li:container:b"])
+    datahub_client.get_entity_headers(["urn:li:container:a", "urn:li:container:b"])
+
+    assert set(headers) == {"urn:li:container:a", "urn:li:container:b"}
+    base_mock_graph.execute_graphql.assert_called_once()
+    assert base_mock_graph.execute_graphql.call_args.args[1] == {"urns": ["urn:li:container:b"]}
+
+
+def test_entries_cached_under_an_older_schema_version_are_ignored(backend):
+    header = EntityHeader(urn="urn:li:dataset:a", name="a", display_name="a")
+    EntityDetailsCache(backend).set_headers([header])
+
+    with patch.object(EntityDetailsCache, "schema_version", EntityDetailsCache.schema_version + 1):
+        assert EntityDetailsCache(backend).get_headers(["urn:li:dataset:a"]) == {}
+
+
+def test_client_caches_details_profiles_separately(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(
+        return_value={"dataset": {"platform": {"name": "datahub"}, "name": "Dataset", "properties": {}}}
+    )
+
+    datahub_client.get_table_details("urn:li:dataset:a", profile=QueryProfile.COLUMNS)
+    datahub_client.get_table_details("urn:li:dataset:a")
+    datahub_client.get_table_details("urn:li:dataset:a", profile=QueryProfile.COLUMNS)
+
+    assert base_mock_graph.execute_graphql.call_count == 2
+
+
+def test_client_can_bypass_the_cache(base_mock_graph, backend, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(
+        return_value={"dataset": {"platform": {"name": "datahub"}, "name": "Dataset", "properties": {}}}
+    )
+
+    datahub_client.get_table_details("urn:li:dataset:a", profile=QueryProfile.COLUMNS, use_cache=False)
+
+    assert backend.data == {}
+
+
+def test_async_stale_entry_is_served_when_not_reingested(details_cache):
+    table = generate_table_metadata()
+    fetch = AsyncMock(return_value=(table, 1000))
+    get_last_ingested = AsyncMock(return_value=1000)
+    aget_or_fetch = async_to_sync(details_cache.aget_or_fetch)
+
+    with patch("datahub_client.cache.time.time", return_value=0):
+        aget_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+    with patch("datahub_client.cache.time.time", return_value=120):
+        result = aget_or_fetch("table", "urn:li:dataset:a", fetch, get_last_ingested)
+
+    assert result == table
+    fetch.assert_awaited_once()
+    get_last_ingested.assert_awaited_once()
+
+
+def test_async_client_shares_the_details_cache(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    base_mock_graph.execute_graphql = MagicMock(
+        return_value={"dataset": {"platform": {"name": "datahub"}, "name": "Dataset", "properties": {}}}
+    )
+    datahub_client.executor.aexecute = AsyncMock()
+
+    first = datahub_client.get_table_details("urn:li:dataset:a")
+    second = async_to_sync(datahub_client.aget_table_details)("urn:li:dataset:a")
+
+    assert first == second
+    datahub_client.executor.aexecute.assert_not_awaited()
+
+
+def test_async_client_remembers_missing_entities(base_mock_graph, details_cache):
+    datahub_client = DataHubCatalogueClient(
+        jwt_token="abc", api_url="http://example.com/api/gms", graph=base_mock_graph, details_cache=details_cache
+    )
+    datahub_client.executor.aexecute = AsyncMock(return_value={"dataset": None})
+
+    for _ in range(2):
+        with pytest.raises(EntityDoesNotExist):
+            async_to_sync(datahub_client.aget_table_details)("urn:li:dataset:missing")
+
+    datahub_client.executor.aexecute.assert_awaited_once()
@@ -1,7 +1,8 @@
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
+from datahub.configuration.common import GraphError  # pylint: disable=E0611
 
 from datahub_client.client import DataHubCatalogueClient
 from datahub_client.entities import (
@@ -13,8 +14,10 @@ from datahub_client.entities import (
     CustomEntityProperties,
     Database,
     DataSummary,
+    EntityHeader,
     EntityRef,
     EntitySummary,
+    EntitySummaryPage,
     FurtherInformation,
     Governance,
     OwnerRef,
@@ -25,7 +28,8 @@ from datahub_client.entities import (
     TagRef,
     UsageRestrictions,
 )
-from datahub_client.exceptions import EntityDoesNotExist
+from datahub_client.exceptions import CatalogueError, EntityDoesNotExist
+from datahub_client.graphql.profiles import QueryProfile
 
 
 @pytest.mark.django_db
@@ -329,9 +333,7 @@ class TestCatalogueClientWithDatahub:
             }
         }
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = True
-            dataset = datahub_client.get_table_details(urn)
+        dataset = datahub_client.get_table_details(urn)
 
         assert dataset == Table(
             urn="abc",
@@ -409,9 +411,7 @@ class TestCatalogueClientWithDatahub:
         }
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
 
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = True
-            dataset = datahub_client.get_table_details(urn)
+        dataset = datahub_client.get_table_details(urn)
 
         assert dataset == Table(
             urn="abc",
@@ -470,9 +470,7 @@ class TestCatalogueClientWithDatahub:
         }
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
 
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = True
-            chart = datahub_client.get_chart_details(urn)
+        chart = datahub_client.get_chart_details(urn)
 
         assert chart == Chart(
             urn="urn:li:chart:(justice-data,absconds)",
@@ -548,9 +546,7 @@ class TestCatalogueClientWithDatahub:
         }
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
 
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = True
-            collection = datahub_client.get_publication_collection_details(urn)
+        collection = datahub_client.get_publication_collection_details(urn)
 
         expected_relationships = {
             RelationshipType.CHILD: [
@@ -673,22 +669,86 @@ class TestCatalogueClientWithDatahub:
         }
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
 
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = True
-            database = datahub_client.get_database_details(urn)
-            assert database.relationships[RelationshipType.CHILD] == [
+        database = datahub_client.get_database_details(urn)
+        assert database.relationships[RelationshipType.CHILD] == [
+            EntitySummary(
+                entity_ref=EntityRef(urn="urn:li:dataset:DatasetToShow", display_name="DatasetToShow"),
+                description="Dataset to show",
+                entity_type="TABLE",
+                tags=[
+                    TagRef(
+                        urn="urn:li:tag:dc_display_in_catalogue",
+                        display_name="dc:display_in_catalogue",
+                    )
+                ],
+            )
+        ]
+
+    def test_get_database_details_leaves_out_entities(self, datahub_client, base_mock_graph):
+        base_mock_graph.execute_graphql = MagicMock(return_value={"container": None})
+
+        with pytest.raises(EntityDoesNotExist):
+            datahub_client.get_database_details("urn:li:container:foo")
+
+        variables = base_mock_graph.execute_graphql.call_args.args[1]
+        assert variables == {"urn": "urn:li:container:foo", "includeChildren": False}
+
+    def test_get_dataset_columns_only(self, datahub_client, base_mock_graph):
+        base_mock_graph.execute_graphql = MagicMock(return_value={"dataset": None})
+
+        with pytest.raises(EntityDoesNotExist):
+            datahub_client.get_table_details("urn:li:dataset:foo", profile=QueryProfile.COLUMNS)
+
+        variables = base_mock_graph.execute_graphql.call_args.args[1]
+        assert variables == {
+            "urn": "urn:li:dataset:foo",
+            "includeLineage": False,
+            "includeParents": False,
+            "includeOwnership": False,
+            "includeTags": False,
+            "includeQuality": False,
+            "includeColumns": True,
+        }
+
+    def test_list_container_entities(self, datahub_client, base_mock_graph):
+        datahub_response = {
+            "searchAcrossEntities": {
+                "start": 50,
+                "count": 1,
+                "total": 51,
+                "searchResults": [
+                    {
+                        "entity": {
+                            "urn": "urn:li:dataset:DatasetToShow",
+                            "type": "DATASET",
+                            "properties": {"name": "DatasetToShow", "description": "Dataset to show"},
+                            "tags": {"tags": [{"tag": {"urn": "urn:li:tag:dc_display_in_catalogue"}}]},
+                            "subTypes": {"typeNames": ["Model"]},
+                        }
+                    }
+                ],
+            }
+        }
+        base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+
+        page = datahub_client.list_container_entities("urn:li:container:foo", start=50, count=50, entity_type="TABLE")
+
+        assert base_mock_graph.execute_graphql.call_args.args[1] == {
+            "urn": "urn:li:container:foo",
+            "start": 50,
+            "count": 50,
+        }
+        assert page == EntitySummaryPage(
+            total=51,
+            entities=[
                 EntitySummary(
                     entity_ref=EntityRef(urn="urn:li:dataset:DatasetToShow", display_name="DatasetToShow"),
                     description="Dataset to show",
                     entity_type="TABLE",
-                    tags=[
-                        TagRef(
-                            urn="urn:li:tag:dc_display_in_catalogue",
-                            display_name="dc:display_in_catalogue",
-                        )
-                    ],
+                    tags=[TagRef(urn="urn:li:tag:dc_display_in_catalogue", display_name="dc_display_in_catalogue")],
                 )
-            ]
+            ],
+        )
 
     def test_get_custom_property_key_value_pairs(self, datahub_client, database):
         datahub_client._get_custom_property_key_value_pairs(database.custom_properties)
@@ -697,11 +757,103 @@ class TestCatalogueClientWithDatahub:
         urn = "invalid_urn"
         datahub_response = {"dataset": None}
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+        base_mock_graph.exists = MagicMock()
+
+        with pytest.raises(EntityDoesNotExist):
+            datahub_client.get_table_details(urn)
+
+        base_mock_graph.execute_graphql.assert_called_once()
+        base_mock_graph.exists.assert_not_called()
+
+    def test_get_dataset_stub_without_platform(self, datahub_client, base_mock_graph):
+        urn = "urn:li:dataset:stub"
+        datahub_response = {"dataset": {"urn": urn, "exists": True, "platform": None, "properties": None}}
+        base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+        base_mock_graph.exists = MagicMock()
+
+        with pytest.raises(EntityDoesNotExist):
+            datahub_client.get_table_details(urn)
+
+        base_mock_graph.execute_graphql.assert_called_once()
+        base_mock_graph.exists.assert_not_called()
+
+    def test_get_chart_details_soft_deleted(self, datahub_client, base_mock_graph):
+        urn = "urn:li:chart:deleted"
+        datahub_response = {"chart": {"urn": urn, "exists": False}}
+        base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+
+        with pytest.raises(EntityDoesNotExist):
+            datahub_client.get_chart_details(urn)
+
+        base_mock_graph.execute_graphql.assert_called_once()
+
+    def test_get_last_ingested_wraps_gms_errors(self, datahub_client, base_mock_graph):
+        base_mock_graph.execute_graphql = MagicMock(side_effect=GraphError("Error executing graphql query"))
+
+        with pytest.raises(CatalogueError):
+            datahub_client.get_last_ingested("urn:li:dataset:a")
+
+    def test_get_entity_headers(self, datahub_client, base_mock_graph):
+        datahub_response = {
+            "entities": [
+                {
+                    "urn": "urn:li:container:database",
+                    "type": "CONTAINER",
+                    "properties": {
+                        "name": "database",
+                        "customProperties": [{"key": "dc_readable_name", "value": "My database"}],
+                    },
+                },
+                {
+                    "urn": "urn:li:dataset:table",
+                    "type": "DATASET",
+                    "name": "database.table",
+                    "properties": {"name": "table", "customProperties": []},
+                },
+                None,
+            ]
+        }
+        base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
+
+        headers = datahub_client.get_entity_headers(
+            ["urn:li:container:database", "urn:li:dataset:table", "urn:li:dataset:table", "urn:li:dataset:missing"]
+        )
+
+        assert headers == {
+            "urn:li:container:database": EntityHeader(
+                urn="urn:li:container:database", name="database", display_name="database", readable_name="My database"
+            ),
+            "urn:li:dataset:table": EntityHeader(urn="urn:li:dataset:table", name="table", display_name="table"),
+        }
+        assert headers["urn:li:container:database"].friendly_name == "My database"
+        assert headers["urn:li:dataset:table"].friendly_name == "table"
+        base_mock_graph.execute_graphql.assert_called_once()
+        assert base_mock_graph.execute_graphql.call_args.args[1] == {
+            "urns": ["urn:li:container:database", "urn:li:dataset:table", "urn:li:dataset:missing"]
+        }
+
+    def test_get_catalogue_version(self, datahub_client, base_mock_graph):
+        base_mock_graph.execute_graphql = MagicMock(
+            return_value={
+                "searchAcrossEntities": {
+                    "total": 3,
+                    "searchResults": [{"entity": {"urn": "urn:li:dataset:table", "lastIngested": 100}}],
+                }
+            }
+        )
+
+        version = datahub_client.get_catalogue_version()
+
+        assert version == "3-100"
+        base_mock_graph.execute_graphql.assert_called_once()
+        assert "sortInput" in base_mock_graph.execute_graphql.call_args.args[0]
+
+    def test_get_catalogue_version_of_an_empty_catalogue(self, datahub_client, base_mock_graph):
+        base_mock_graph.execute_graphql = MagicMock(
+            return_value={"searchAcrossEntities": {"total": 0, "searchResults": []}}
+        )
 
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = False  # Entity does not exist
-            with pytest.raises(EntityDoesNotExist):
-                datahub_client.get_table_details(urn)
+        assert datahub_client.get_catalogue_version() == "0-0"
 
     def test_get_dataset_missing_properties(self, datahub_client, base_mock_graph):
         urn = "urn:li:dataset:missing_props"
@@ -714,9 +866,7 @@ class TestCatalogueClientWithDatahub:
         }
         base_mock_graph.execute_graphql = MagicMock(return_value=datahub_response)
 
-        with patch("datahub_client.client.DataHubCatalogueClient.check_entity_exists_by_urn") as mock_exists:
-            mock_exists.return_value = True
-            dataset = datahub_client.get_table_details(urn)
+        dataset = datahub_client.get_table_details(urn)
 
         assert dataset.name == "Dataset"
         assert dataset.description == ""
@@ -0,0 +1,227 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+from asgiref.sync import async_to_sync
+from datahub.configuration.common import GraphError, OperationalError
+from datahub.ingestion.graph.config import DatahubClientConfig
+
+from datahub_client.exceptions import CatalogueError
+from datahub_client.graphql.executor import GraphQLExecutor, _ssl_verify
+from datahub_client.graphql.loader import (
+    find_graphql_document_problems,
+    get_graphql_query,
+    get_query_hash,
+    load_graphql_queries,
+    validate_graphql_queries,
+)
+from datahub_client.graphql.profiles import SECTIONS, QueryProfile, profile_variables
+
+
+def test_queries_are_loaded_once():
+    assert load_graphql_queries() is load_graphql_queries()
+    assert get_graphql_query("search") is get_graphql_query("search")
+
+
+def test_missing_query_raises():
+    with pytest.raises(CatalogueError):
+        get_graphql_query("doesNotExist")
+
+
+def test_shipped_queries_are_valid():
+    validate_graphql_queries()
+
+
+@pytest.mark.parametrize(
+    "query_text, problem",
+    [
+        ("query A { a { b }", "unclosed '{'"),
+        ("query A { a } }", "unbalanced '}'"),
+        ("query A { a }\nquery B { b }", "expected 1 operation, found 2"),
+        ("query A { a { ...missingFields } }", "fragment missingFields is used but not defined"),
+        ("query A { a }\nfragment unused on A { b }", "fragment unused is defined but not used"),
+    ],
+)
+def test_find_graphql_document_problems(query_text, problem):
+    assert problem in find_graphql_document_problems(query_text)
+
+
+def test_query_arguments_are_not_operations():
+    assert (
+        find_graphql_document_problems("query A($query: String!) {\n  search(\n    query: $query\n  ) { a }\n}") == []
+    )
+
+
+@pytest.fixture
+def graph():
+    graph = MagicMock()
+    graph.config = DatahubClientConfig(server="http://example.com/api/gms", token="abc")
+    graph.execute_graphql.return_value = {"full": "text"}
+    return graph
+
+
+def gms_response(status_code: int = 200, body: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body or {}).encode()
+    response.url = "http://example.com/api/gms/api/graphql"
+    return response
+
+
+def persisted_executor(graph, *responses):
+    executor = GraphQLExecutor(graph, persisted_queries=True)
+    executor.session = MagicMock()
+    executor.session.post.side_effect = responses
+    return executor
+
+
+def test_executor_sends_full_text_by_default(graph):
+    executor = GraphQLExecutor(graph)
+
+    assert executor.execute("query A { a }", {"urn": "x"}) == {"full": "text"}
+    graph.execute_graphql.assert_called_once_with("query A { a }", {"urn": "x"})
+    assert executor.session is None
+
+
+def test_persisted_query_session_is_authenticated(graph):
+    executor = GraphQLExecutor(graph, persisted_queries=True)
+
+    assert executor.session.headers["Authorization"] == "Bearer abc"
+
+
+def test_executor_sends_persisted_query_hash(graph):
+    executor = persisted_executor(graph, gms_response(body={"data": {"a": 1}}))
+
+    assert executor.execute("query A { a }") == {"a": 1}
+
+    body = executor.session.post.call_args.kwargs["json"]
+    assert "query" not in body
+    assert body["extensions"]["persistedQuery"]["sha256Hash"] == get_query_hash("query A { a }")
+    graph.execute_graphql.assert_not_called()
+
+
+def test_executor_registers_unknown_persisted_query(graph):
+    executor = persisted_executor(
+        graph,
+        gms_response(body={"errors": [{"message": "PersistedQueryNotFound"}]}),
+        gms_response(body={"data": {"a": 1}}),
+    )
+
+    assert executor.execute("query A { a }") == {"a": 1}
+    assert executor.session.post.call_args.kwargs["json"]["query"] == "query A { a }"
+
+
+def test_executor_falls_back_to_full_text_when_unsupported(graph):
+    executor = persisted_executor(
+        graph, gms_response(400, {"errors": [{"extensions": {"code": "PersistedQueryNotSupported"}}]})
+    )
+
+    assert executor.execute("query A { a }") == {"full": "text"}
+    assert executor.execute("query A { a }") == {"full": "text"}
+
+    assert not executor.persisted_queries
+    executor.session.post.assert_called_once()
+
+
+def test_executor_falls_back_to_full_text_when_gms_rejects_the_hash(graph):
+    # GMS without persisted query support rejects a request without query text
+    executor = persisted_executor(graph, gms_response(400, {"error": "Missing query"}))
+
+    assert executor.execute("query A { a }") == {"full": "text"}
+    assert executor.execute("query A { a }") == {"full": "text"}
+
+    assert not executor.persisted_queries
+    executor.session.post.assert_called_once()
+
+
+@pytest.mark.parametrize("failure", [gms_response(503), requests.ConnectionError("Connection refused")])
+def test_executor_keeps_persisted_queries_after_a_transient_failure(graph, failure):
+    executor = persisted_executor(graph, failure, gms_response(body={"data": {"a": 1}}))
+
+    assert executor.execute("query A { a }") == {"full": "text"}
+    assert executor.execute("query A { a }") == {"a": 1}
+
+    assert executor.persisted_queries
+    graph.execute_graphql.assert_called_once()
+
+
+def test_executor_raises_query_errors(graph):
+    executor = persisted_executor(graph, gms_response(body={"errors": [{"message": "Validation error"}]}))
+
+    with pytest.raises(GraphError):
+        executor.execute("query A { a }")
+
+
+def async_executor(graph, status_code: int = 200, body: dict | None = None) -> tuple[GraphQLExecutor, list]:
+    requests_sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_sent.append(request)
+        return httpx.Response(status_code, json=body or {})
+
+    return GraphQLExecutor(graph, async_transport=httpx.MockTransport(handler)), requests_sent
+
+
+def test_async_executor_sends_full_text(graph):
+    executor, requests_sent = async_executor(graph, body={"data": {"a": 1}})
+
+    assert async_to_sync(executor.aexecute)("query A { a }", {"urn": "x"}) == {"a": 1}
+
+    (request,) = requests_sent
+    assert str(request.url) == "http://example.com/api/gms/api/graphql"
+    assert request.headers["Authorization"] == "Bearer abc"
+    assert json.loads(request.content) == {"query": "query A { a }", "variables": {"urn": "x"}}
+    graph.execute_graphql.assert_not_called()
+
+
+def test_async_executor_raises_query_errors(graph):
+    executor, _ = async_executor(graph, body={"errors": [{"message": "Validation error"}]})
+
+    with pytest.raises(GraphError):
+        async_to_sync(executor.aexecute)("query A { a }")
+
+
+def test_async_executor_raises_operational_error_for_error_status(graph):
+    executor, _ = async_executor(graph, 503)
+
+    with pytest.raises(OperationalError):
+        async_to_sync(executor.aexecute)("query A { a }")
+
+
+def test_async_clients_share_one_ssl_context(graph):
+    executor = GraphQLExecutor(graph)
+
+    async def get_client():
+        return executor._get_async_client()
+
+    with patch("datahub_client.graphql.executor._ssl_verify", wraps=_ssl_verify) as ssl_verify:
+        first = async_to_sync(get_client)()
+        second = async_to_sync(get_client)()
+
+    assert first is not second
+    ssl_verify.assert_called_once_with(graph.config)
+
+
+def test_profile_variables_only_include_declared_sections():
+    search = get_graphql_query("search")
+
+    assert profile_variables(search, QueryProfile.HEADER) == {
+        "includeParents": False,
+        "includeOwnership": False,
+        "includeTags": False,
+    }
+    assert profile_variables(search, QueryProfile.CARD) == {
+        "includeParents": True,
+        "includeOwnership": True,
+        "includeTags": True,
+    }
+    assert profile_variables(get_graphql_query("getChartDetails"), QueryProfile.COLUMNS) == {}
+
+
+def test_full_profile_includes_every_section():
+    variables = profile_variables(get_graphql_query("getDatasetDetails"), QueryProfile.FULL)
+
+    assert set(variables) == set(SECTIONS)
+    assert all(variables.values())
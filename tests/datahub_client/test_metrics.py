@@ -0,0 +1,84 @@
+import contextvars
+import threading
+from unittest.mock import MagicMock
+
+import requests
+from prometheus_client import REGISTRY
+
+from datahub_client import metrics
+from datahub_client.graphql.executor import GraphQLExecutor
+from datahub_client.graphql.loader import get_graphql_query
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_executor_times_queries_by_file_name():
+    graph = MagicMock()
+    graph.execute_graphql.return_value = {}
+    before = sample("catalogue_graphql_query_seconds_count", query="getEntityTypeCounts")
+
+    GraphQLExecutor(graph).execute(get_graphql_query("getEntityTypeCounts"))
+
+    assert sample("catalogue_graphql_query_seconds_count", query="getEntityTypeCounts") == before + 1
+
+
+def test_response_size_is_recorded_for_the_current_query():
+    session = requests.Session()
+    metrics.instrument_session(session)
+    metrics.instrument_session(session)
+    assert session.hooks["response"].count(metrics._record_response_size) == 1
+
+    response = MagicMock(content=b"x" * 2048)
+    before = sample("catalogue_graphql_response_bytes_sum", query="search")
+    with metrics.graphql_query("search"):
+        for hook in session.hooks["response"]:
+            hook(response)
+    # Requests that are not graphql queries are ignored
+    metrics._record_response_size(response)
+
+    assert sample("catalogue_graphql_response_bytes_sum", query="search") == before + 2048
+
+
+def test_request_timings_total_each_kind_of_work():
+    with metrics.request_timings() as timings:
+        with metrics.graphql_query("search"):
+            pass
+        with metrics.graphql_query("search"):
+            pass
+        with metrics.time_parse("TableParser"):
+            pass
+
+    assert timings.totals["gql-search"][1] == 2
+    assert timings.totals["parse-TableParser"][1] == 1
+    assert "gql-search;dur=" in timings.server_timing()
+    assert 'desc="2x"' in timings.server_timing()
+
+
+def test_request_timings_include_queries_run_on_other_threads():
+    def query():
+        with metrics.graphql_query("getEntityTypeCounts"):
+            pass
+
+    with metrics.request_timings() as timings:
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(query,))
+        thread.start()
+        thread.join()
+
+    assert timings.totals["gql-getEntityTypeCounts"][1] == 1
+
+
+def test_timings_are_not_collected_outside_a_request():
+    with metrics.graphql_query("search"):
+        pass
+
+    assert metrics._request_timings.get() is None
+
+
+def test_cache_lookups_are_counted():
+    before = sample("catalogue_cache_lookups_total", cache="test_cache", result="hit")
+
+    metrics.record_cache_lookup("test_cache", "hit")
+
+    assert sample("catalogue_cache_lookups_total", cache="test_cache", result="hit") == before + 1
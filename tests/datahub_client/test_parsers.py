@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
 
 import pytest
+from pydantic import ValidationError
 
 from datahub_client.entities import (
     AccessInformation,
@@ -245,6 +246,37 @@ class TestEntityParser:
         assert columns[1].name == "col2"
         assert columns[1].quality_metrics.consistency == "poor"
 
+    def test_parse_columns_share_quality_metrics(self, parser):
+        fields = [
+            {"fieldPath": name, "nullable": True, "description": None, "type": "STRING", "nativeDataType": "string"}
+            for name in ["col1", "col2", "col3", "col4"]
+        ]
+        assertions = [
+            {
+                "info": {
+                    "datasetAssertion": {
+                        "nativeType": "column_completeness_green_property",
+                        "nativeParameters": [{"key": "column_name", "value": name}],
+                    }
+                },
+                "runEvents": {"runEvents": [{"result": {"type": "SUCCESS"}}]},
+            }
+            for name in ["col1", "col2"]
+        ]
+        entity = {
+            "schemaMetadata": {"fields": fields, "primaryKeys": [], "foreignKeys": []},
+            "assertions": {"total": 2, "assertions": assertions},
+        }
+
+        col1, col2, col3, col4 = parser.parse_columns(entity)
+
+        assert col1.quality_metrics.completeness == "good"
+        assert col1.quality_metrics is col2.quality_metrics
+        assert col3.quality_metrics == ColumnQualityMetrics()
+        assert col3.quality_metrics is col4.quality_metrics
+        with pytest.raises(ValidationError):
+            col1.quality_metrics.completeness = "poor"
+
     def test_parse_columns_with_primary_key_and_foreign_key(self, parser):
         entity = {
             "schemaMetadata": {
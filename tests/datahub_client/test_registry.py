@@ -0,0 +1,96 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from datahub_client.registry import CatalogueClientRegistry, ClientPoolConfig
+
+
+@pytest.fixture
+def mock_client_class():
+    with patch("datahub_client.registry.DataHubCatalogueClient") as client_class:
+        client_class.side_effect = lambda **kwargs: MagicMock(graph=MagicMock(_session=requests.Session()))
+        yield client_class
+
+
+@pytest.fixture
+def registry():
+    return CatalogueClientRegistry()
+
+
+def test_client_is_created_lazily_and_reused(mock_client_class, registry):
+    assert mock_client_class.call_count == 0
+
+    first = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms")
+    second = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms")
+
+    assert first is second
+    assert mock_client_class.call_count == 1
+
+
+def test_separate_clients_per_endpoint_and_token(mock_client_class, registry):
+    first = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms")
+    second = registry.get_client(jwt_token="def", api_url="http://example.com/api/gms")
+    third = registry.get_client(jwt_token="abc", api_url="http://other.com/api/gms")
+
+    assert len({id(first), id(second), id(third)}) == 3
+
+
+def test_client_is_created_once_across_threads(mock_client_class, registry):
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def get_client():
+        barrier.wait()
+        clients.append(registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms"))
+
+    threads = [threading.Thread(target=get_client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_client_class.call_count == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_reset_reconnects(mock_client_class, registry):
+    first = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms")
+    registry.reset()
+    second = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms")
+
+    assert first is not second
+
+
+def test_client_is_recycled_after_max_age(mock_client_class, registry):
+    pool_config = ClientPoolConfig(max_age_seconds=60)
+    with patch("datahub_client.registry.time.monotonic", return_value=1000):
+        first = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms", pool_config=pool_config)
+    with patch("datahub_client.registry.time.monotonic", return_value=1030):
+        second = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms", pool_config=pool_config)
+    with patch("datahub_client.registry.time.monotonic", return_value=1061):
+        third = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms", pool_config=pool_config)
+
+    assert first is second
+    assert third is not first
+
+
+def test_pool_settings_are_applied(mock_client_class, registry):
+    pool_config = ClientPoolConfig(
+        pool_connections=3, pool_maxsize=16, async_max_connections=50, timeout_sec=5, retry_max_times=2
+    )
+    client = registry.get_client(jwt_token="abc", api_url="http://example.com/api/gms", pool_config=pool_config)
+
+    mock_client_class.assert_called_once_with(
+        jwt_token="abc",
+        api_url="http://example.com/api/gms",
+        timeout_sec=5,
+        retry_max_times=2,
+        details_cache=None,
+        persisted_queries=False,
+        async_max_connections=50,
+    )
+    adapter = client.graph._session.get_adapter("https://example.com")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 16
@@ -0,0 +1,66 @@
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from datahub_client import response_logging
+from datahub_client.graphql.executor import GraphQLExecutor
+from datahub_client.response_logging import ResponseLoggingConfig, log_response
+
+LOGGER = "datahub_client.response_logging"
+
+
+@pytest.fixture(autouse=True)
+def reset_config():
+    yield
+    response_logging.configure(ResponseLoggingConfig())
+
+
+def test_responses_are_not_serialised_above_debug_level(caplog):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+
+    with patch("datahub_client.response_logging.json.dumps") as dumps:
+        log_response("getTags", {"count": 2000}, {"searchAcrossEntities": {}})
+
+    dumps.assert_not_called()
+    assert not caplog.records
+
+
+def test_debug_responses_are_cut_to_max_chars(caplog):
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+    response_logging.configure(ResponseLoggingConfig(max_chars=20))
+
+    log_response("search", {"query": "prisons"}, {"results": ["x" * 100]})
+
+    assert caplog.messages == [
+        'GMS response to search {"query": "prisons"}: {"results": ["xxxxxx... (97 more characters)'
+    ]
+
+
+def test_debug_responses_are_sampled(caplog):
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+    response_logging.configure(ResponseLoggingConfig(sample_rate=0.0))
+
+    log_response("search", {}, {"results": []})
+
+    assert not caplog.records
+
+
+def test_named_queries_are_dumped_in_full_at_info_level(caplog):
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    response_logging.configure(ResponseLoggingConfig(max_chars=5, sample_rate=0.0, dump_queries=frozenset({"getTags"})))
+
+    log_response("getTags", {"count": 2000}, {"tags": ["prisons"]})
+    log_response("search", {}, {"results": []})
+
+    assert caplog.messages == ['GMS response to getTags {"count": 2000}: {"tags": ["prisons"]}']
+
+
+def test_executor_logs_responses(caplog):
+    caplog.set_level(logging.DEBUG, logger=LOGGER)
+    graph = MagicMock()
+    graph.execute_graphql.return_value = {"a": 1}
+
+    GraphQLExecutor(graph).execute("query A { a }", {"urn": "x"})
+
+    assert caplog.messages == ['GMS response to unknown {"urn": "x"}: {"a": 1}']
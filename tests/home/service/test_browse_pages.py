@@ -0,0 +1,108 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+
+from home.forms.search import SearchForm
+from home.service.browse_pages import claim_browse_page, is_browse
+from home.service.cached_fetcher import CachedFetcher
+from home.service.catalogue_version import CACHE_KEY, get_catalogue_version
+from home.service.search import SearchService
+from home.service.subject_area_fetcher import SubjectAreaFetcher
+
+
+def browse(subject_area=""):
+    form = SearchForm({"subject_area": subject_area} if subject_area else {})
+    assert form.is_valid(), form.errors
+    return SearchService(form, "1")
+
+
+def test_only_searches_without_a_query_or_other_filters_are_browses():
+    assert is_browse({"query": "", "subject_area": "urn:li:tag:Prison", "tags": []})
+    assert not is_browse({"query": "prison"})
+    assert not is_browse({"entity_types": ["TABLE"]})
+    assert not is_browse({"tags": ["dc_cadet"]})
+
+
+def test_browse_pages_are_served_without_querying_the_catalogue(mock_catalogue, settings):
+    settings.CATALOGUE_BROWSE_PRECOMPUTE_PAGES = 2
+    mock_catalogue.get_catalogue_version.return_value = "10-1000"
+    subject_area = SubjectAreaFetcher().fetch()[0].urn
+
+    call_command("precompute_browse_pages", stdout=StringIO())
+    assert get_catalogue_version() == "10-1000"
+    searches = mock_catalogue.search.call_count
+
+    home = browse()
+    subject_area_browse = browse(subject_area)
+
+    assert mock_catalogue.search.call_count == searches
+    assert home.results == mock_catalogue.search.return_value
+    assert subject_area_browse.query_timings == {}
+
+
+def test_existing_pages_are_only_rebuilt_for_a_new_version(mock_catalogue):
+    mock_catalogue.get_catalogue_version.return_value = "10-1000"
+    call_command("precompute_browse_pages", stdout=StringIO())
+    searches = mock_catalogue.search.call_count
+
+    call_command("precompute_browse_pages", stdout=StringIO())
+    assert mock_catalogue.search.call_count == searches
+
+    mock_catalogue.get_catalogue_version.return_value = "11-2000"
+    call_command("precompute_browse_pages", stdout=StringIO())
+    assert mock_catalogue.search.call_count == 2 * searches
+
+
+def test_searches_are_not_served_from_browse_pages(mock_catalogue):
+    mock_catalogue.get_catalogue_version.return_value = "10-1000"
+    call_command("precompute_browse_pages", stdout=StringIO())
+    searches = mock_catalogue.search.call_count
+
+    form = SearchForm({"query": "prison"})
+    assert form.is_valid()
+    SearchService(form, "1")
+
+    assert mock_catalogue.search.call_count == searches + 1
+
+
+def test_pages_roll_over_with_the_catalogue_version(mock_catalogue):
+    mock_catalogue.get_catalogue_version.return_value = "10-1000"
+    call_command("precompute_browse_pages", stdout=StringIO())
+    searches = mock_catalogue.search.call_count
+
+    cache.delete(CACHE_KEY, version=CachedFetcher.version)
+    mock_catalogue.get_catalogue_version.return_value = "11-2000"
+    browse()
+
+    assert mock_catalogue.search.call_count == searches + 1
+
+
+def test_missing_browse_pages_are_stored_by_the_first_request(mock_catalogue, settings, polled_catalogue_version):
+    settings.CATALOGUE_BROWSE_PRECOMPUTE_PAGES = 1
+
+    browse()
+    searches = mock_catalogue.search.call_count
+    browse()
+    assert mock_catalogue.search.call_count == searches
+
+    form = SearchForm({})
+    assert form.is_valid()
+    SearchService(form, "2")
+    SearchService(form, "2")
+    assert mock_catalogue.search.call_count == searches + 2
+
+
+def test_only_one_request_stores_a_missing_browse_page(polled_catalogue_version):
+    assert claim_browse_page({}, "1", 20) is not None
+    assert claim_browse_page({}, "1", 20) is None
+    assert claim_browse_page({"query": "prison"}, "1", 20) is None
+
+
+def test_precomputing_warms_the_counts_once_per_browse(mock_catalogue, settings):
+    settings.CATALOGUE_BROWSE_PRECOMPUTE_PAGES = 2
+    mock_catalogue.get_catalogue_version.return_value = "10-1000"
+
+    call_command("precompute_browse_pages", stdout=StringIO())
+
+    assert mock_catalogue.get_entity_type_counts.call_count == len(SubjectAreaFetcher().fetch()) + 1
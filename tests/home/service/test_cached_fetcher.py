@@ -0,0 +1,122 @@
+from unittest.mock import MagicMock, patch
+
+from home.service.cached_fetcher import CachedFetcher
+
+
+def make_fetcher(fetch, **kwargs):
+    return CachedFetcher(key="test_options", fetch=fetch, soft_ttl_seconds=60, hard_ttl_seconds=600, **kwargs)
+
+
+def test_fresh_value_is_served_from_cache():
+    fetch = MagicMock(return_value=["a", "b"])
+    fetcher = make_fetcher(fetch)
+
+    assert fetcher.get() == ["a", "b"]
+    assert fetcher.get() == ["a", "b"]
+    fetch.assert_called_once()
+
+
+def test_empty_value_is_cached():
+    fetch = MagicMock(return_value=[])
+    fetcher = make_fetcher(fetch)
+
+    assert fetcher.get() == []
+    assert fetcher.get() == []
+    fetch.assert_called_once()
+
+
+def test_stale_value_is_refreshed():
+    fetch = MagicMock(side_effect=[["old"], ["new"]])
+    fetcher = make_fetcher(fetch)
+
+    with patch("home.service.cached_fetcher.time.time", return_value=1000):
+        fetcher.get()
+    with patch("home.service.cached_fetcher.time.time", return_value=1061):
+        assert fetcher.get() == ["new"]
+
+    assert fetch.call_count == 2
+
+
+def test_value_goes_stale_when_the_catalogue_version_changes():
+    fetch = MagicMock(side_effect=[["old"], ["new"]])
+    version = MagicMock(return_value="1-1000")
+    fetcher = make_fetcher(fetch, catalogue_version=version)
+
+    assert fetcher.get() == ["old"]
+    assert fetcher.get() == ["old"]
+    version.return_value = "2-2000"
+    assert fetcher.get() == ["new"]
+    assert fetcher.get() == ["new"]
+
+    assert fetch.call_count == 2
+
+
+def test_stale_value_is_served_while_another_worker_refreshes():
+    fetch = MagicMock(side_effect=[["old"], ["new"]])
+    fetcher = make_fetcher(fetch)
+
+    with patch("home.service.cached_fetcher.time.time", return_value=1000):
+        fetcher.get()
+    other_worker_lock = fetcher._acquire_lock()
+    with patch("home.service.cached_fetcher.time.time", return_value=1061):
+        assert fetcher.get() == ["old"]
+
+    assert other_worker_lock is not None
+    fetch.assert_called_once()
+
+
+def test_stale_value_is_served_if_refresh_fails():
+    fetch = MagicMock(side_effect=[["old"], Exception("GMS unavailable")])
+    fetcher = make_fetcher(fetch)
+
+    with patch("home.service.cached_fetcher.time.time", return_value=1000):
+        fetcher.get()
+    with patch("home.service.cached_fetcher.time.time", return_value=1061):
+        assert fetcher.get() == ["old"]
+
+    # The lock is released, so the next request tries again
+    assert fetcher._acquire_lock() is not None
+
+
+def test_background_refresh_returns_stale_value():
+    fetch = MagicMock(side_effect=[["old"], ["new"]])
+    fetcher = make_fetcher(fetch, background_refresh=True)
+
+    with patch("home.service.cached_fetcher.time.time", return_value=1000):
+        fetcher.get()
+    with (
+        patch("home.service.cached_fetcher.time.time", return_value=1061),
+        patch("home.service.cached_fetcher.run_in_background") as run_in_background,
+    ):
+        assert fetcher.get() == ["old"]
+
+    run_in_background.assert_called_once()
+    run_in_background.call_args.args[0]()
+    assert fetcher.get() == ["new"]
+
+
+def test_background_miss_returns_none_without_waiting():
+    fetch = MagicMock(return_value=["value"])
+    fetcher = make_fetcher(fetch, background_miss=True)
+
+    with patch("home.service.cached_fetcher.run_in_background") as run_in_background:
+        assert fetcher.get() is None
+        assert fetcher.get() is None
+
+    # Only the worker holding the lock fetches the value
+    run_in_background.assert_called_once()
+    fetch.assert_not_called()
+    run_in_background.call_args.args[0]()
+    assert fetcher.get() == ["value"]
+
+
+def test_miss_waits_for_another_worker():
+    fetch = MagicMock(return_value=["mine"])
+    fetcher = make_fetcher(fetch, miss_wait_seconds=1)
+    fetcher._acquire_lock()
+    other_worker = make_fetcher(MagicMock(return_value=["theirs"]))
+
+    with patch("home.service.cached_fetcher.time.sleep", side_effect=lambda _: other_worker.refresh()):
+        assert fetcher.get() == ["theirs"]
+
+    fetch.assert_not_called()
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from core.request_memo import request_memo
+from home.service.catalogue_version import get_catalogue_version, refresh_catalogue_version
+
+
+def test_version_is_polled_once_and_shared(mock_catalogue):
+    refresh_catalogue_version()
+
+    assert get_catalogue_version() == "100-1705990502353"
+    assert get_catalogue_version() == "100-1705990502353"
+    mock_catalogue.get_catalogue_version.assert_called_once()
+
+
+def test_requests_do_not_wait_for_the_first_poll(mock_catalogue):
+    with patch("home.service.cached_fetcher.run_in_background") as run_in_background:
+        assert get_catalogue_version() is None
+        assert get_catalogue_version() is None
+
+    run_in_background.assert_called_once()
+    mock_catalogue.get_catalogue_version.assert_not_called()
+
+    run_in_background.call_args.args[0]()
+    assert get_catalogue_version() == "100-1705990502353"
+
+
+def test_refresh_polls_regardless_of_the_cache(mock_catalogue):
+    get_catalogue_version()
+    mock_catalogue.get_catalogue_version.return_value = "101-1705990600000"
+
+    assert refresh_catalogue_version() == "101-1705990600000"
+    assert get_catalogue_version() == "101-1705990600000"
+
+
+def test_version_is_read_once_per_request(mock_catalogue, polled_catalogue_version):
+    with request_memo():
+        first = get_catalogue_version()
+        refresh_catalogue_version()
+        mock_catalogue.get_catalogue_version.return_value = "101-1705990600000"
+        refresh_catalogue_version()
+
+        assert get_catalogue_version() == first
+
+
+def test_caches_fall_back_to_their_ttls_when_the_version_is_unavailable(mock_catalogue):
+    mock_catalogue.get_catalogue_version.side_effect = ConnectionError
+
+    assert get_catalogue_version() is None
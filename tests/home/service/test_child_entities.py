@@ -0,0 +1,79 @@
+import pytest
+from django.core.paginator import EmptyPage, PageNotAnInteger
+
+from datahub_client.entities import EntityRef, EntitySummary, EntitySummaryPage
+from home.service.child_entities import ChildEntitiesService, iter_container_entities
+
+
+def summary(name, entity_type="Table"):
+    return EntitySummary(
+        entity_ref=EntityRef(urn=f"urn:li:dataset:{name}", display_name=name),
+        description="",
+        entity_type=entity_type,
+        tags=[],
+    )
+
+
+def test_schema_tables_are_paged_by_gms(mock_catalogue):
+    mock_catalogue.list_container_entities.return_value = EntitySummaryPage(total=25, entities=[summary("c")])
+
+    service = ChildEntitiesService("schema", "urn:li:container:schema", page="3", items_per_page=10)
+
+    mock_catalogue.list_container_entities.assert_called_once_with(
+        "urn:li:container:schema", start=20, count=10, entity_type="TABLE"
+    )
+    assert list(service.page) == [summary("c")]
+    assert service.page.paginator.num_pages == 3
+    assert service.name_column == "Table name"
+
+
+def test_database_of_schemas(mock_catalogue):
+    mock_catalogue.list_container_entities.return_value = EntitySummaryPage(
+        total=2, entities=[summary("a", "Schema"), summary("b", "Schema")]
+    )
+
+    service = ChildEntitiesService("database", "urn:li:container:database")
+
+    assert service.has_schemas
+    assert service.name_column == "Schema name"
+
+
+def test_empty_database_is_listed_as_schemas(mock_catalogue):
+    # As before entities were paged, when every one of no entities counted as a schema
+    mock_catalogue.list_container_entities.return_value = EntitySummaryPage(total=0, entities=[])
+
+    service = ChildEntitiesService("database", "urn:li:container:database")
+
+    assert service.has_schemas
+
+
+def test_dashboard_charts_are_sorted_and_paged(mock_catalogue):
+    charts = [summary(name, "Chart") for name in ["d", "b", "a", "c"]]
+
+    service = ChildEntitiesService("dashboard", "urn:li:dashboard:test", page="2", charts=charts, items_per_page=3)
+
+    assert list(service.page) == [summary("d", "Chart")]
+    assert service.name_column == "Chart name"
+    mock_catalogue.get_dashboard_details.assert_not_called()
+
+
+@pytest.mark.parametrize("page, error", [("4", EmptyPage), ("0", EmptyPage), ("last", PageNotAnInteger)])
+def test_invalid_pages(mock_catalogue, page, error):
+    mock_catalogue.list_container_entities.return_value = EntitySummaryPage(total=25, entities=[])
+
+    with pytest.raises(error):
+        ChildEntitiesService("schema", "urn:li:container:schema", page=page, items_per_page=10)
+
+
+def test_iter_container_entities_fetches_every_page(mock_catalogue, settings):
+    settings.DETAILS_ENTITIES_PER_PAGE = 2
+    mock_catalogue.list_container_entities.side_effect = [
+        EntitySummaryPage(total=5, entities=[summary("a"), summary("b")]),
+        EntitySummaryPage(total=5, entities=[summary("c"), summary("d")]),
+        EntitySummaryPage(total=5, entities=[summary("e")]),
+    ]
+
+    entities = list(iter_container_entities(mock_catalogue, "urn:li:container:database"))
+
+    assert [entity.entity_ref.display_name for entity in entities] == ["a", "b", "c", "d", "e"]
+    assert [call.kwargs["start"] for call in mock_catalogue.list_container_entities.call_args_list] == [0, 2, 4]
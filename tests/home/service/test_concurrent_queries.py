@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from datahub_client.exceptions import CatalogueError
+from home.service.concurrent_queries import arun_queries, run_queries
+
+
+def test_run_queries_returns_results_and_timings():
+    results, timings = run_queries({"first": lambda: 1, "second": lambda: "two"})
+
+    assert results == {"first": 1, "second": "two"}
+    assert set(timings) == {"first", "second"}
+    assert all(timing >= 0 for timing in timings.values())
+
+
+def test_run_queries_runs_queries_in_parallel():
+    # Each query waits for the other to start, which would time out if they ran sequentially
+    barrier = threading.Barrier(2, timeout=5)
+
+    def query():
+        barrier.wait()
+        return threading.current_thread().name
+
+    results, _ = run_queries({"first": query, "second": query})
+
+    assert results["first"] != results["second"]
+
+
+def test_run_queries_raises_catalogue_error():
+    def failing_query():
+        raise CatalogueError("Unable to execute search query")
+
+    with pytest.raises(CatalogueError):
+        run_queries({"search": failing_query, "entity_type_counts": lambda: {}})
+
+
+def test_run_queries_sequentially_when_disabled(settings):
+    settings.CATALOGUE_CONCURRENT_QUERIES = False
+
+    results, timings = run_queries(
+        {
+            "first": lambda: threading.current_thread().name,
+            "second": lambda: threading.current_thread().name,
+        }
+    )
+
+    assert results["first"] == results["second"] == threading.current_thread().name
+    assert set(timings) == {"first", "second"}
+
+
+def test_bulk_queries_run_on_their_own_pool():
+    def query():
+        return threading.current_thread().name
+
+    results, _ = run_queries({"first": query, "second": query}, bulk=True)
+
+    assert all(name.startswith("catalogue-bulk-query") for name in results.values())
+
+
+def test_arun_queries_runs_queries_concurrently():
+    # Each query waits for the other to start, which would time out if they ran sequentially
+    async def run():
+        started = {"first": asyncio.Event(), "second": asyncio.Event()}
+
+        async def query(name, other):
+            started[name].set()
+            await asyncio.wait_for(started[other].wait(), timeout=5)
+            return name
+
+        return await arun_queries(
+            {"first": lambda: query("first", "second"), "second": lambda: query("second", "first")}
+        )
+
+    results, timings = async_to_sync(run)()
+
+    assert results == {"first": "first", "second": "second"}
+    assert set(timings) == {"first", "second"}
+
+
+def test_arun_queries_cancels_the_other_queries_when_one_fails():
+    cancelled = []
+
+    async def slow_query():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def failing_query():
+        raise CatalogueError("Unable to execute search query")
+
+    async def run():
+        with pytest.raises(CatalogueError):
+            await arun_queries({"search": failing_query, "entity_type_counts": slow_query})
+        # Let the cancellation be delivered before the event loop is closed
+        await asyncio.sleep(0)
+        return list(cancelled)
+
+    assert async_to_sync(run)() == [True]
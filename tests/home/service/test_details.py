@@ -1,4 +1,5 @@
 import pytest
+from asgiref.sync import async_to_sync
 
 from datahub_client.entities import (
     AccessInformation,
@@ -6,6 +7,7 @@ from datahub_client.entities import (
     CustomEntityProperties,
     Dashboard,
     Database,
+    EntityHeader,
     EntityRef,
     EntitySummary,
     FurtherInformation,
@@ -19,6 +21,8 @@ from home.service.details import (
     DashboardDetailsService,
     DatabaseDetailsService,
     DatasetDetailsService,
+    PublicationCollectionDetailsService,
+    PublicationDatasetDetailsService,
     _parse_parent,
     is_access_requirements_a_url,
 )
@@ -28,6 +32,8 @@ from tests.conftest import (
     generate_dashboard_metadata,
     generate_database_metadata,
     generate_table_metadata,
+    mock_get_entity_headers_response,
+    mock_list_container_entities_response,
 )
 
 
@@ -125,6 +131,53 @@ class TestDatasetDetailsService:
         context = service.context
         assert context["parent_entity"] == EntityRef(urn="urn:li:container:parent", display_name="parent")
 
+    def test_get_context_uses_parent_readable_name(self, mock_catalogue):
+        parent = {
+            RelationshipType.PARENT: [
+                EntitySummary(
+                    entity_ref=EntityRef(urn="urn:li:container:parent", display_name="parent"),
+                    description="",
+                    tags=[],
+                    entity_type="DATABASE",
+                )
+            ],
+        }
+        mock_catalogue.get_table_details.return_value = generate_table_metadata(relations=parent)
+        mock_get_entity_headers_response(
+            mock_catalogue,
+            [
+                EntityHeader(
+                    urn="urn:li:container:parent",
+                    name="parent",
+                    display_name="parent",
+                    readable_name="Parent database",
+                )
+            ],
+        )
+
+        context = DatasetDetailsService("urn:li:datsset:test").context
+
+        assert context["parent_entity_friendly_name"] == "Parent database"
+        mock_catalogue.get_entity_headers.assert_called_once_with(["urn:li:container:parent"])
+        mock_catalogue.get_database_details.assert_not_called()
+
+    def test_get_context_falls_back_to_parent_display_name(self, mock_catalogue):
+        parent = {
+            RelationshipType.PARENT: [
+                EntitySummary(
+                    entity_ref=EntityRef(urn="urn:li:container:parent", display_name="parent"),
+                    description="",
+                    tags=[],
+                    entity_type="DATABASE",
+                )
+            ],
+        }
+        mock_catalogue.get_table_details.return_value = generate_table_metadata(relations=parent)
+
+        context = DatasetDetailsService("urn:li:datsset:test").context
+
+        assert context["parent_entity_friendly_name"] == "parent"
+
     def test_get_context_contains_slack(self, mock_catalogue):
         custom_properties = CustomEntityProperties(
             further_information=FurtherInformation(
@@ -204,11 +257,7 @@ class TestDatabaseDetailsService:
                 )
             ]
         }
-        mock_database = generate_database_metadata(
-            name="database_with_schemas",
-            relations=schema_relations,
-        )
-        mock_catalogue.get_database_details.return_value = mock_database
+        mock_list_container_entities_response(mock_catalogue, schema_relations[RelationshipType.CHILD])
 
         service = DatabaseDetailsService("database_with_schemas")
         context = service.context
@@ -237,11 +286,7 @@ class TestDatabaseDetailsService:
                 ),
             ]
         }
-        mock_database = generate_database_metadata(
-            name="database_with_multiple_schemas",
-            relations=schema_relations,
-        )
-        mock_catalogue.get_database_details.return_value = mock_database
+        mock_list_container_entities_response(mock_catalogue, schema_relations[RelationshipType.CHILD])
 
         service = DatabaseDetailsService("database_with_multiple_schemas")
         context = service.context
@@ -250,6 +295,19 @@ class TestDatabaseDetailsService:
         assert "tables" not in context
         assert len(context["schemas"]) == 2
 
+    def test_database_entities_are_listed_a_page_at_a_time(self, mock_catalogue, example_database: Database):
+        tables = example_database.relationships[RelationshipType.CHILD]
+        mock_list_container_entities_response(mock_catalogue, tables, total=120)
+
+        context = DatabaseDetailsService("example_database", page="2").context
+
+        mock_catalogue.list_container_entities.assert_called_once_with(
+            "example_database", start=50, count=50, entity_type=None
+        )
+        assert context["tables"] == tables
+        assert context["child_entities"].number == 2
+        assert context["child_entities"].paginator.num_pages == 3
+
 
 class TestChartDetailsService:
     def test_get_context(self, mock_catalogue):
@@ -336,3 +394,29 @@ class TestDashboardDetailsService:
         context = service.context
 
         assert context["entity"].custom_properties == custom_properties
+
+
+@pytest.mark.parametrize(
+    "service_class, metadata_method",
+    [
+        (DatasetDetailsService, "get_table_details"),
+        (DatabaseDetailsService, "get_database_details"),
+        (ChartDetailsService, "get_chart_details"),
+        (DashboardDetailsService, "get_dashboard_details"),
+        (PublicationCollectionDetailsService, "get_publication_collection_details"),
+        (PublicationDatasetDetailsService, "get_publication_dataset_details"),
+    ],
+)
+def test_async_services_build_the_same_page(mock_catalogue, service_class, metadata_method):
+    service = service_class("urn:li:test")
+    async_service = async_to_sync(service_class.acreate)("urn:li:test")
+
+    async_method = getattr(mock_catalogue, f"a{metadata_method}")
+    async_method.assert_awaited_once()
+    assert async_method.call_args.args[0] == "urn:li:test"
+    assert async_service.template == service.template
+    assert async_service.context.keys() == service.context.keys()
+    assert async_service.context["entity"] == service.context["entity"]
+    assert async_service.context.get("parent_entity_friendly_name") == service.context.get(
+        "parent_entity_friendly_name"
+    )
@@ -50,7 +50,7 @@ def test_dataset_details_csv_formatter(example_table):
         "type",
         "description",
     ]
-    assert csv_formatter.data() == [
+    assert list(csv_formatter.data()) == [
         (
             "foo",
             "Foo",
@@ -88,7 +88,7 @@ def test_database_details_csv_formatter(example_database):
     csv_formatter = DatabaseDetailsCsvFormatter(details_service)
 
     assert csv_formatter.headers() == ["urn", "display_name", "description"]
-    assert csv_formatter.data() == [
+    assert list(csv_formatter.data()) == [
         ("urn:foo", "foo", "an example"),
         ("urn:bar", "bar", "another example"),
     ]
@@ -116,7 +116,7 @@ def test_dashboard_details_csv_formatter(example_dashboard):
     csv_formatter = DashboardDetailsCsvFormatter(details_service)
 
     assert csv_formatter.headers() == ["urn", "display_name", "description"]
-    assert csv_formatter.data() == [
+    assert list(csv_formatter.data()) == [
         ("urn:foo", "foo", "an example"),
         ("urn:bar", "bar", "another example"),
     ]
@@ -0,0 +1,78 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from datahub_client.entities import FindMoJdataEntityType
+from datahub_client.search.search_types import MultiSelectFilter
+from home.service.entity_type_counts import get_entity_type_counts, search_fingerprint
+from home.service.subject_area_fetcher import SubjectAreaFetcher
+
+
+def test_fingerprint_ignores_filter_order_and_whitespace():
+    first = search_fingerprint(
+        "prison  population",
+        [MultiSelectFilter("tags", ["urn:li:tag:b", "urn:li:tag:a"]), MultiSelectFilter("customProperties", ["x"])],
+    )
+    second = search_fingerprint(
+        " prison population ",
+        [MultiSelectFilter("customProperties", ["x"]), MultiSelectFilter("tags", ["urn:li:tag:a", "urn:li:tag:b"])],
+    )
+
+    assert first == second
+
+
+def test_fingerprint_distinguishes_queries_and_filters():
+    assert search_fingerprint("prison", []) != search_fingerprint("probation", [])
+    assert search_fingerprint("prison", []) != search_fingerprint("prison", [MultiSelectFilter("tags", ["a"])])
+
+
+def test_counts_are_cached_per_search(mock_catalogue, polled_catalogue_version):
+    filters = [MultiSelectFilter("tags", ["urn:li:tag:Prison"])]
+
+    first = get_entity_type_counts(mock_catalogue, query="prison", filters=filters)
+    second = get_entity_type_counts(mock_catalogue, query="prison", filters=filters)
+    get_entity_type_counts(mock_catalogue, query="probation", filters=filters)
+
+    assert first == second
+    assert first[FindMoJdataEntityType.TABLE] == 50
+    assert mock_catalogue.get_entity_type_counts.call_count == 2
+
+
+def test_counts_are_counted_again_when_the_catalogue_version_changes(mock_catalogue, polled_catalogue_version):
+    get_entity_type_counts(mock_catalogue, query="prison")
+    get_entity_type_counts(mock_catalogue, query="prison")
+    with patch("home.service.entity_type_counts.get_catalogue_version", return_value="101-1705990600000"):
+        get_entity_type_counts(mock_catalogue, query="prison")
+
+    assert mock_catalogue.get_entity_type_counts.call_count == 2
+
+
+def test_zero_ttl_disables_caching(mock_catalogue, settings):
+    settings.CATALOGUE_ENTITY_TYPE_COUNTS_CACHE_TTL_SECONDS = 0
+
+    get_entity_type_counts(mock_catalogue, query="prison")
+    get_entity_type_counts(mock_catalogue, query="prison")
+
+    assert mock_catalogue.get_entity_type_counts.call_count == 2
+
+
+def test_paging_through_results_counts_once(mock_catalogue, search_service):
+    search_service._get_search_results(page="2", items_per_page=20)
+    search_service._get_search_results(page="3", items_per_page=20)
+
+    assert mock_catalogue.search.call_count == 3
+    assert mock_catalogue.get_entity_type_counts.call_count == 1
+
+
+def test_warm_command_caches_browse_pages(mock_catalogue):
+    subject_areas = SubjectAreaFetcher().fetch()
+    call_command("warm_entity_type_counts", stdout=StringIO())
+    calls = mock_catalogue.get_entity_type_counts.call_count
+    subject_area = subject_areas[0]
+
+    get_entity_type_counts(mock_catalogue, query="", filters=[MultiSelectFilter("tags", [subject_area.urn])])
+    get_entity_type_counts(mock_catalogue, query="", filters=[])
+
+    assert calls == len(subject_areas) + 1
+    assert mock_catalogue.get_entity_type_counts.call_count == calls
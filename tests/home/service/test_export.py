@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from datahub_client.entities import TableEntityMapping
+from datahub_client.exceptions import EntityDoesNotExist
+from datahub_client.search.search_types import SearchResponse
+from home.forms.search import SearchForm
+from home.service.export import CatalogueExportService
+from tests.conftest import generate_search_result, generate_table_metadata
+
+
+def table_results(names, last_ingested=1):
+    results = []
+    for name in names:
+        result = generate_search_result(result_type=TableEntityMapping, urn=f"urn:li:dataset:{name}")
+        result.last_ingested = last_ingested
+        results.append(result)
+    return results
+
+
+def valid_form(**data):
+    form = SearchForm(data)
+    assert form.is_valid(), form.errors
+    return form
+
+
+@pytest.fixture
+def tables(mock_catalogue):
+    mock_catalogue.search.return_value = SearchResponse(total_results=2, page_results=table_results(["a", "b"]))
+    mock_catalogue.get_table_details.side_effect = lambda urn, **kwargs: generate_table_metadata(
+        name=urn.split(":")[-1]
+    )
+    return mock_catalogue
+
+
+def test_search_is_paged_through(mock_catalogue, settings):
+    settings.MAX_RESULTS = 1000
+    mock_catalogue.search.side_effect = [
+        SearchResponse(total_results=150, page_results=table_results(f"a{i}" for i in range(100))),
+        SearchResponse(total_results=150, page_results=table_results(f"b{i}" for i in range(50))),
+    ]
+
+    service = CatalogueExportService(valid_form(query="prisons"), "csv")
+    mock_catalogue.search.assert_not_called()
+
+    assert len(list(service._list_tables())) == 150
+    assert [call.kwargs["page"] for call in mock_catalogue.search.call_args_list] == ["0", "1"]
+    assert all(call.kwargs["result_types"] == (TableEntityMapping,) for call in mock_catalogue.search.call_args_list)
+
+
+def test_csv_has_a_row_per_column(tables):
+    content = "".join(CatalogueExportService(valid_form(), "csv").stream())
+
+    rows = content.splitlines()
+    assert rows[0].startswith("table_urn,table_name,table_description,column_name")
+    assert len(rows) == 3
+    assert rows[1].startswith("urn:li:Dataset:fake,Foo.a,")
+    assert rows[2].startswith("urn:li:Dataset:fake,Foo.b,")
+
+
+def test_ndjson_has_a_line_per_table(tables):
+    content = "".join(CatalogueExportService(valid_form(), "ndjson").stream())
+
+    lines = [json.loads(line) for line in content.splitlines()]
+    assert [line["name"] for line in lines] == ["Foo.a", "Foo.b"]
+    assert lines[0]["columns"][0]["name"] == "urn"
+
+
+def test_tables_deleted_since_the_search_are_left_out(tables):
+    def get_table_details(urn, **kwargs):
+        if urn == "urn:li:dataset:a":
+            raise EntityDoesNotExist(urn)
+        return generate_table_metadata(name="b")
+
+    tables.get_table_details.side_effect = get_table_details
+
+    content = "".join(CatalogueExportService(valid_form(), "ndjson").stream())
+
+    assert [json.loads(line)["name"] for line in content.splitlines()] == ["Foo.b"]
+
+
+def test_search_pages_are_fetched_as_the_export_is_written(mock_catalogue, settings):
+    settings.CATALOGUE_EXPORT_BATCH_SIZE = 100
+    mock_catalogue.search.side_effect = [
+        SearchResponse(total_results=150, page_results=table_results(f"a{i}" for i in range(100))),
+        SearchResponse(total_results=150, page_results=table_results(f"b{i}" for i in range(50))),
+    ]
+    mock_catalogue.get_table_details.side_effect = lambda urn, **kwargs: generate_table_metadata()
+
+    stream = CatalogueExportService(valid_form(), "ndjson").stream()
+    next(stream)
+
+    assert mock_catalogue.search.call_count == 1
+
+
+def test_table_details_are_not_cached(tables):
+    "".join(CatalogueExportService(valid_form(), "csv").stream())
+
+    assert all(call.kwargs["use_cache"] is False for call in tables.get_table_details.call_args_list)
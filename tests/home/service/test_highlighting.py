@@ -0,0 +1,97 @@
+import random
+import re
+import string
+
+import pytest
+
+from home.service.highlighting import (
+    HighlightedDescriptions,
+    QueryHighlighter,
+    add_mark_tags,
+    get_highlighter,
+    highlight_description,
+)
+from tests.conftest import generate_search_result
+
+
+def test_highlight_description_marks_matches():
+    highlighter = QueryHighlighter("test")
+
+    assert highlight_description("This is a test", highlighter) == "This is a <mark>test</mark>"
+    assert highlight_description("No match here", highlighter) == ""
+    assert highlight_description("No match here", None) == "No match here"
+
+
+def test_highlighted_descriptions_do_not_modify_results():
+    results = [generate_search_result(urn="urn:li:dataset:a"), generate_search_result(urn="urn:li:dataset:b")]
+    results[0].description = "Prison population statistics"
+    original_descriptions = [result.description for result in results]
+
+    highlighted = HighlightedDescriptions(results, QueryHighlighter("prison"))
+
+    assert list(highlighted) == ["urn:li:dataset:a", "urn:li:dataset:b"]
+    assert "<mark>" in highlighted["urn:li:dataset:a"]
+    assert [result.description for result in results] == original_descriptions
+
+
+def test_single_word_pattern():
+    assert get_highlighter("test").pattern == re.compile(r"((\w*test\w*))", flags=re.IGNORECASE)
+
+
+def test_highlighters_are_reused():
+    assert get_highlighter("prison population") is get_highlighter("prison population")
+
+
+@pytest.mark.parametrize(
+    "query, description, marked_description",
+    [
+        ("test", "This is a test description", "This is a <mark>test</mark> description"),
+        (
+            "OFF",
+            "This is a offence description of offences",
+            "This is a <mark>offence</mark> description of <mark>offences</mark>",
+        ),
+        ("OFF", "offence description of offences", "<mark>offence</mark> description of <mark>offences</mark>"),
+        (
+            "offence description",
+            "offence description of offences",
+            "<mark>offence description</mark> of <mark>offences</mark>",
+        ),
+        ("offence description", "offence abc", "<mark>offence</mark> abc"),
+        (
+            "offence description banana",
+            "offence description of offences",
+            "<mark>offence</mark> <mark>description</mark> of <mark>offences</mark>",
+        ),
+        (
+            "data",
+            "database_data, metadata; DATA!",
+            "<mark>database_data</mark>, <mark>metadata</mark>; <mark>DATA</mark>!",
+        ),
+        ("aa", "aaaaa aa-aa", "<mark>aaaaa</mark> <mark>aa</mark>-<mark>aa</mark>"),
+        ("prison", "Prisión prison", "Prisión <mark>prison</mark>"),
+    ],
+)
+def test_mark_matches_regex(query, description, marked_description):
+    highlighter = QueryHighlighter(query)
+
+    assert highlighter.mark(description) == marked_description
+    assert add_mark_tags(description, highlighter.pattern) == marked_description
+
+
+def test_mark_is_equivalent_to_regex_for_random_text():
+    rng = random.Random(1234)
+    alphabet = "abcde" + "ABC" + "_- .,'\n" + string.digits[:2]
+    words = ["data", "prison", "offences", "court", "a b", "ab", "Ab_c"]
+
+    for _ in range(2000):
+        query = " ".join(
+            rng.choice(words + ["".join(rng.choices("abcAB", k=rng.randint(1, 3)))]) for _ in range(rng.randint(1, 3))
+        )
+        description = "".join(
+            rng.choice([rng.choice(alphabet), rng.choice(words), " "]) for _ in range(rng.randint(0, 60))
+        )
+        highlighter = QueryHighlighter(query)
+
+        assert highlighter.matches(description) == bool(highlighter.pattern.search(description)), (query, description)
+        assert highlighter.mark(description) == add_mark_tags(description, highlighter.pattern), (query, description)
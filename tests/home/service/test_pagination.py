@@ -0,0 +1,43 @@
+from django.core.paginator import Paginator
+
+from home.service.pagination import CountPaginator
+
+
+def test_count_paginator_matches_django_paginator():
+    count_paginator = CountPaginator(95, 20)
+    list_paginator = Paginator(list(range(95)), 20)
+
+    for number in ["1", "3", "5", "6", "not-a-number"]:
+        count_page = count_paginator.get_page(number)
+        list_page = list_paginator.get_page(number)
+        assert count_page.number == list_page.number
+        assert count_page.has_next() == list_page.has_next()
+        assert count_page.has_previous() == list_page.has_previous()
+        assert list(count_page.object_list) == list_page.object_list
+
+    assert count_paginator.num_pages == list_paginator.num_pages
+    assert list(count_paginator.get_elided_page_range(3, on_each_side=1, on_ends=1)) == list(
+        list_paginator.get_elided_page_range(3, on_each_side=1, on_ends=1)
+    )
+
+
+def test_count_paginator_does_not_materialise_results():
+    paginator = CountPaginator(10**12, 20)
+
+    assert isinstance(paginator.object_list, range)
+    assert paginator.num_pages == 5 * 10**10
+
+
+def test_count_paginator_caps_pages():
+    paginator = CountPaginator(1_000_000, 20, max_count=10_000)
+
+    assert paginator.count == 10_000
+    assert paginator.num_pages == 500
+    assert paginator.get_page(501).number == 500
+
+
+def test_count_paginator_with_no_results():
+    paginator = CountPaginator(0, 20)
+
+    assert paginator.num_pages == 1
+    assert not paginator.get_page(1).has_next()
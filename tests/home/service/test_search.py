@@ -1,8 +1,7 @@
 import os
-import re
 from urllib.parse import quote
 
-import pytest
+from asgiref.sync import async_to_sync
 
 from datahub_client.entities import FindMoJdataEntityType
 from home.forms.search import SearchForm
@@ -23,6 +22,9 @@ class TestSearchService:
         assert search_context["page_obj"].number == 1
         assert search_context["page_obj"].paginator.num_pages == 5
 
+    def test_query_timings_recorded(self, search_service):
+        assert set(search_service.query_timings) == {"search", "entity_type_counts", "aggregations"}
+
     def test_get_context_h1_value(self, search_context):
         assert search_context["h1_value"] == "Search for data assets"
 
@@ -88,64 +90,15 @@ class TestSearchService:
             )
         }
 
-    def test__compile_query_word_highlighting_pattern(self, search_service):
-        query = "test"
-        pattern = search_service._compile_query_word_highlighting_pattern(query)
-
-        assert pattern == re.compile(rf"((\w*{query}\w*))", flags=re.IGNORECASE)
-
-    @pytest.mark.parametrize(
-        "query, description, marked_description",
-        [
-            (
-                "test",
-                "This is a test description",
-                "This is a <mark>test</mark> description",
-            ),
-            (
-                "OFF",
-                "This is a offence description of offences",
-                "This is a <mark>offence</mark> description of <mark>offences</mark>",
-            ),
-            (
-                "OFF",
-                "offence description of offences",
-                "<mark>offence</mark> description of <mark>offences</mark>",
-            ),
-            (
-                "offence description",
-                "offence description of offences",
-                "<mark>offence description</mark> of <mark>offences</mark>",
-            ),
-            (
-                "offence description",
-                "offence abc",
-                "<mark>offence</mark> abc",
-            ),
-            (
-                "offence description banana",
-                "offence description of offences",
-                "<mark>offence</mark> <mark>description</mark> of <mark>offences</mark>",
-            ),
-        ],
-    )
-    def test__add_mark_tags(self, query, description, marked_description, search_service):
-        pattern = search_service._compile_query_word_highlighting_pattern(query)
-        assert (
-            search_service._add_mark_tags(
-                description,
-                pattern,
-            )
-            == marked_description
-        )
-
     def test_highlight_results_no_query(self):
         form = SearchForm(data={"query": ""})
         assert form.is_valid()
 
         search_service = SearchService(form=form, page="1")
 
-        assert search_service.results.page_results == search_service.highlighted_results.page_results
+        assert {result.urn: result.description for result in search_service.results.page_results} == dict(
+            search_service.highlighted_descriptions
+        )
 
     def test_highlight_results_with_query(self, search_service):
         form = SearchForm(data={"query": "a"})
@@ -153,7 +106,29 @@ class TestSearchService:
 
         search_service = SearchService(form=form, page="1")
 
-        assert search_service.results.page_results != search_service.highlighted_results.page_results
+        assert {result.urn: result.description for result in search_service.results.page_results} != dict(
+            search_service.highlighted_descriptions
+        )
+
+    def test_deep_page_is_clamped_to_the_search_window(self, mock_catalogue, valid_form, settings):
+        settings.MAX_RESULTS = 10_000
+        mock_catalogue.search.return_value.total_results = 20_000
+
+        search_service = SearchService(form=valid_form, page="600")
+
+        assert mock_catalogue.search.call_args.kwargs["page"] == "499"
+        assert search_service.context["page_obj"].number == 500
+
+    def test_async_service_runs_the_same_search(self, mock_catalogue, valid_form):
+        search_service = SearchService(form=valid_form, page="2", use_precomputed=False)
+        sync_call = mock_catalogue.search.call_args
+
+        async_service = async_to_sync(SearchService.acreate)(form=valid_form, page="2", use_precomputed=False)
+
+        mock_catalogue.asearch.assert_awaited_once_with(*sync_call.args, **sync_call.kwargs)
+        assert async_service.results == search_service.results
+        assert async_service.entity_type_counts == search_service.entity_type_counts
+        assert async_service.context["page_obj"].number == search_service.context["page_obj"].number == 2
 
 
 # Disbabled to test search without manipulation
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from datahub_client.entities import ChartEntityMapping, TableEntityMapping
+from datahub_client.search.search_types import MultiSelectFilter, SearchAggregations, TagItem
+from home.service.search import SearchService
+from home.service.search_aggregations import get_search_aggregations
+from home.service.subject_area_fetcher import SubjectAreaFetcher
+
+
+def test_aggregations_are_cached_per_search_and_entity_types(mock_catalogue, polled_catalogue_version):
+    filters = [MultiSelectFilter("tags", ["urn:li:tag:Prison"])]
+
+    get_search_aggregations(mock_catalogue, "prison", (TableEntityMapping,), filters)
+    get_search_aggregations(mock_catalogue, "prison", (TableEntityMapping,), filters)
+    get_search_aggregations(mock_catalogue, "prison", (TableEntityMapping, ChartEntityMapping), filters)
+    get_search_aggregations(mock_catalogue, "probation", (TableEntityMapping,), filters)
+
+    assert mock_catalogue.get_search_aggregations.call_count == 3
+
+
+def test_paging_through_results_fetches_facets_once(mock_catalogue, search_service):
+    search_service._get_search_results(page="2", items_per_page=20)
+    search_service._get_search_results(page="3", items_per_page=20)
+
+    assert mock_catalogue.search.call_count == 3
+    assert all(call.kwargs["include_facets"] is False for call in mock_catalogue.search.call_args_list)
+    assert mock_catalogue.get_search_aggregations.call_count == 1
+
+
+def test_search_tags_come_from_the_aggregations(mock_catalogue, valid_form):
+    tags = [TagItem(name="Prison", slug="Prison", count=3)]
+    mock_catalogue.get_search_aggregations.return_value = SearchAggregations(tags=tags)
+
+    assert SearchService(form=valid_form, page="1").context["tags"] == tags
+
+
+def test_zero_ttl_fetches_facets_with_each_page(mock_catalogue, valid_form, settings):
+    settings.CATALOGUE_SEARCH_AGGREGATIONS_CACHE_TTL_SECONDS = 0
+    tags = [TagItem(name="Prison", slug="Prison", count=3)]
+    mock_catalogue.search.return_value.tags = tags
+
+    context = SearchService(form=valid_form, page="1").context
+
+    assert context["tags"] == tags
+    assert mock_catalogue.search.call_args.kwargs["include_facets"] is True
+    mock_catalogue.get_search_aggregations.assert_not_called()
+
+
+def test_warm_command_caches_browse_facets(mock_catalogue):
+    subject_areas = SubjectAreaFetcher().fetch()
+    call_command("warm_entity_type_counts", stdout=StringIO())
+    calls = mock_catalogue.get_search_aggregations.call_count
+    result_types = SearchService._build_entity_types([])
+
+    get_search_aggregations(mock_catalogue, "", result_types, [MultiSelectFilter("tags", [subject_areas[0].urn])])
+    get_search_aggregations(mock_catalogue, "", result_types, [])
+
+    assert calls == len(subject_areas) + 1
+    assert mock_catalogue.get_search_aggregations.call_count == calls
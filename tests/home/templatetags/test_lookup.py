@@ -1,6 +1,6 @@
 import pytest
 
-from home.templatetags.lookup import lookup
+from home.templatetags.lookup import get_item, lookup
 
 
 @pytest.mark.parametrize(
@@ -14,3 +14,8 @@ from home.templatetags.lookup import lookup
 )
 def test_lookup(input_list, lookup_dict, output_list):
     assert lookup(input_list, lookup_dict) == output_list
+
+
+def test_get_item():
+    assert get_item({"urn:li:dataset:a": "description"}, "urn:li:dataset:a") == "description"
+    assert get_item({}, "urn:li:dataset:a") is None
@@ -1,10 +1,25 @@
 import pytest
+from asgiref.sync import async_to_sync
 from django.template.loader import render_to_string
 from django.urls import reverse
 from waffle.testutils import override_switch
 
 from datahub_client.entities import EntityRef, EntitySummary, RelationshipType
-from tests.conftest import generate_table_metadata
+from datahub_client.exceptions import CatalogueError
+from datahub_client.graphql.profiles import QueryProfile
+from tests.conftest import generate_table_metadata, mock_list_container_entities_response
+
+
+def generate_entities(count):
+    return [
+        EntitySummary(
+            entity_ref=EntityRef(urn=f"urn:li:dataset:table_{i}", display_name=f"table_{i}"),
+            description="",
+            entity_type="Table",
+            tags=[],
+        )
+        for i in range(count)
+    ]
 
 
 @pytest.mark.django_db
@@ -45,6 +60,37 @@ class TestSearchView:
         response = client.get(reverse("home:search"), data={"subject_area": "fake"})
         assert response.status_code == 400
 
+    def test_served_asynchronously(self, async_client, mock_catalogue):
+        response = async_to_sync(async_client.get)(reverse("home:search"), data={"query": "foo"})
+        assert response.status_code == 200
+        assert len(response.context["results"]) == 20
+        mock_catalogue.asearch.assert_awaited_once()
+
+
+@pytest.mark.django_db
+class TestExportView:
+    def test_csv_export(self, client):
+        response = client.get(reverse("home:export"), data={"query": "foo"})
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "text/csv"
+        assert response.headers["Content-Disposition"] == 'attachment; filename="catalogue-export.csv"'
+        assert response.getvalue().decode().startswith("table_urn,")
+
+    def test_unsupported_format(self, client):
+        response = client.get(reverse("home:export"), data={"format": "xlsx"})
+        assert response.status_code == 400
+
+    def test_unsupported_format_is_not_reflected(self, client):
+        response = client.get(reverse("home:export"), data={"format": "<script>alert(1)</script>"})
+
+        assert response.status_code == 400
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert b"<script>" not in response.content
+
+    def test_bad_form(self, client):
+        response = client.get(reverse("home:export"), data={"subject_area": "fake"})
+        assert response.status_code == 400
+
 
 class TestTableView:
     @pytest.mark.parametrize("switch_bool", [True, False])
@@ -56,6 +102,21 @@ class TestTableView:
         assert response.status_code == 200
         assert response.headers["Cache-Control"] == "max-age=60, private"
 
+    @pytest.mark.django_db
+    def test_details_served_asynchronously(self, async_client, mock_catalogue):
+        response = async_to_sync(async_client.get)(
+            reverse("home:details", kwargs={"urn": "fake", "result_type": "table"})
+        )
+
+        assert response.status_code == 200
+        mock_catalogue.aget_table_details.assert_awaited_once_with("fake", profile=QueryProfile.FULL)
+
+    @pytest.mark.django_db
+    def test_csv_only_fetches_columns(self, client, mock_catalogue):
+        client.get(reverse("home:details_csv", kwargs={"urn": "fake", "result_type": "table"}))
+
+        mock_catalogue.get_table_details.assert_called_once_with("fake", profile=QueryProfile.COLUMNS)
+
     @pytest.mark.django_db
     def test_csv_output(self, client):
         response = client.get(
@@ -66,7 +127,7 @@ class TestTableView:
         )
         assert response.status_code == 200
         assert response.headers["Content-Disposition"] == 'attachment; filename="Foo.example_table.csv"'
-        assert response.content == (
+        assert response.getvalue() == (
             b"name,display_name,type,description\r\n" + b"urn,urn,string,description **with markdown**\r\n"
         )
 
@@ -100,6 +161,30 @@ class TestTableView:
         assert "parent_database" in rendered
         assert 'href="' not in rendered
 
+    @pytest.mark.django_db
+    def test_csv_etag_is_the_last_ingested_time(self, client, mock_catalogue):
+        mock_catalogue.get_last_ingested.return_value = 1710426920000
+        url = reverse("home:details_csv", kwargs={"urn": "fake", "result_type": "table"})
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"table-1710426920000"'
+
+        mock_catalogue.get_table_details.reset_mock()
+        response = client.get(url, headers={"If-None-Match": '"table-1710426920000"'})
+        assert response.status_code == 304
+        mock_catalogue.get_table_details.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_csv_is_sent_without_etag_when_last_ingested_fails(self, client, mock_catalogue):
+        mock_catalogue.get_last_ingested.side_effect = CatalogueError("GMS unavailable")
+        url = reverse("home:details_csv", kwargs={"urn": "fake", "result_type": "table"})
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
 
 class TestDatabaseView:
     @pytest.mark.django_db
@@ -112,10 +197,50 @@ class TestDatabaseView:
         )
         assert response.status_code == 200
         assert response.headers["Content-Disposition"] == 'attachment; filename="Foo.example_database.csv"'
-        assert response.content == (
+        assert response.getvalue() == (
             b"urn,display_name,description\r\n" + b"urn:li:dataset:fake_table,fake_table,table description\r\n"
         )
 
+    @pytest.mark.django_db
+    def test_csv_fetches_each_page_of_entities_once(self, client, mock_catalogue):
+        response = client.get(reverse("home:details_csv", kwargs={"urn": "fake", "result_type": "database"}))
+        response.getvalue()
+
+        mock_catalogue.list_container_entities.assert_called_once()
+
+    @pytest.mark.django_db
+    def test_entities_page_is_a_partial_for_htmx(self, client, mock_catalogue):
+        mock_list_container_entities_response(mock_catalogue, generate_entities(50), total=120)
+        url = reverse("home:details_entities", kwargs={"urn": "fake", "result_type": "database", "page": "2"})
+
+        response = client.get(url, headers={"HX-Request": "true"})
+
+        assert response.status_code == 200
+        assert response.text.strip().startswith('<div id="child-entities">')
+        assert "Showing 51 to 100 of 120" in response.text
+        assert "HX-Request" in response.headers["Vary"]
+
+    @pytest.mark.django_db
+    def test_entities_page_without_htmx_renders_the_details_page(self, client, mock_catalogue):
+        mock_list_container_entities_response(mock_catalogue, generate_entities(50), total=120)
+        url = reverse("home:details_entities", kwargs={"urn": "fake", "result_type": "database", "page": "2"})
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.context["entity"].urn == mock_catalogue.get_database_details.return_value.urn
+        assert response.context["child_entities"].number == 2
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("result_type, page", [("database", "4"), ("database", "x"), ("table", "1")])
+    def test_entities_page_not_found(self, client, mock_catalogue, result_type, page):
+        mock_list_container_entities_response(mock_catalogue, [], total=120)
+        url = reverse("home:details_entities", kwargs={"urn": "fake", "result_type": result_type, "page": page})
+
+        response = client.get(url, headers={"HX-Request": "true"})
+
+        assert response.status_code == 404
+
 
 class TestDashboardView:
     @pytest.mark.django_db
@@ -128,7 +253,7 @@ class TestDashboardView:
         )
         assert response.status_code == 200
         assert response.headers["Content-Disposition"] == 'attachment; filename="Foo.example_dashboard.csv"'
-        assert response.content == (
+        assert response.getvalue() == (
             b"urn,display_name,description\r\n" + b"urn:li:chart:fake_chart,fake_chart,chart description\r\n"
         )
 
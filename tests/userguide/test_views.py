@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from userguide import pages
+
+
+@pytest.fixture(autouse=True)
+def clear_compiled_user_guide():
+    pages._compiled = None
+    yield
+    pages._compiled = None
+
+
+@pytest.fixture
+def docs_dir(tmp_path, monkeypatch):
+    (tmp_path / "About.md").write_text("# About\n\n## Getting started\n\nSome *text*\n", encoding="utf-8")
+    (tmp_path / "Other sources.md").write_text("# Other sources\n\nMore text\n", encoding="utf-8")
+    monkeypatch.setattr(pages, "DOCS_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_userguide_page_is_rendered(client, docs_dir):
+    response = client.get(reverse("userguide:userguide_detail", kwargs={"slug": "other-sources"}))
+
+    assert response.status_code == 200
+    assert '<h1 class="govuk-heading-xl" id="other-sources">Other sources</h1>' in response.content.decode()
+    assert [header for header, _slug, _subheaders in response.context["sidebar"]] == ["About", "Other sources"]
+
+
+@pytest.mark.django_db
+def test_missing_userguide_page(client, docs_dir):
+    response = client.get(reverse("userguide:userguide_detail", kwargs={"slug": "missing"}))
+
+    assert response.status_code == 404
+
+
+def test_user_guide_is_rendered_once_per_version_of_the_content(docs_dir):
+    with patch.object(pages, "compile_user_guide", wraps=pages.compile_user_guide) as compile_user_guide:
+        pages.get_user_guide()
+        pages.get_user_guide()
+        pages._compiled = None
+        pages.get_user_guide()
+        assert compile_user_guide.call_count == 1
+
+        (docs_dir / "About.md").write_text("# About\n\nChanged\n", encoding="utf-8")
+        user_guide = pages.get_user_guide()
+
+    assert compile_user_guide.call_count == 2
+    assert "Changed" in user_guide.pages["About"]
+
+
+def test_build_userguide_command_renders_every_page(docs_dir, capsys):
+    call_command("build_userguide")
+
+    assert "Rendered 2 user guide pages" in capsys.readouterr().out
+    assert set(pages._compiled[1].pages) == {"About", "Other sources"}
+
+
+def test_changed_content_replaces_the_cached_user_guide(docs_dir):
+    pages.get_user_guide()
+    (docs_dir / "About.md").write_text("# About\n\nChanged\n", encoding="utf-8")
+    pages.get_user_guide()
+
+    fingerprint, user_guide = cache.get(pages.CACHE_KEY)
+    assert fingerprint == pages.content_fingerprint()
+    assert "Changed" in user_guide.pages["About"]
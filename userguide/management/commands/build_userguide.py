@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from userguide.pages import get_user_guide
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the user guide pages and sidebar and store them in the cache. "
+        "Run this on deploy so the first request for each page does not have to render it."
+    )
+
+    def handle(self, *args, **options):
+        user_guide = get_user_guide(refresh=True)
+        self.stdout.write(f"Rendered {len(user_guide.pages)} user guide pages")
@@ -0,0 +1,174 @@
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import markdown
+from django.core.cache import cache
+from django.utils.text import slugify
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "content")
+
+CACHE_KEY = "userguide"
+
+
+@dataclass
+class SidebarItem:
+    header: str
+    header_slug: str
+    subheader: list
+
+
+@dataclass
+class Sidebar:
+    sidebar: list[SidebarItem] = field(default_factory=list)
+    slug_to_header: dict = field(default_factory=dict)
+
+    def add_item(self, item: SidebarItem):
+        """Appends a SidebarItem to the sidebar list."""
+        self.sidebar.append(item)
+        self.slug_to_header[item.header_slug] = item.header
+
+    def __iter__(self) -> Iterator[tuple[str, str, list[str]]]:
+        """Makes the Sidebar iterable."""
+        for item in self.sidebar:
+            yield (
+                item.header,
+                item.header_slug,
+                item.subheader,
+            )
+
+
+class CustomClassProcessor(Treeprocessor):
+    """
+    Adds gov.uk classes to elements in the markdown file contents.
+    """
+
+    def generate_id(self, text):
+        return re.sub(r"[^a-zA-Z0-9]+", "-", text).strip("-").lower()
+
+    def run(self, root):
+        for element in root.iter():
+            tag_class_map = {
+                "h1": "govuk-heading-xl",
+                "h2": "govuk-heading-l",
+                "h3": "govuk-heading-m",
+                "ul": "govuk-list govuk-list--bullet govuk-list--spaced",
+                "a": "govuk-link govuk-link--no-visited-state govuk-link--no-underline",
+                "table": "govuk-table",
+                "thead": "govuk-table__header",
+                "tr": "govuk-table__row",
+                "td": "govuk-table__cell govuk-body-s",
+                "tbody": "govuk-table__body",
+            }
+
+            if element.tag in tag_class_map:
+                element.set("class", tag_class_map[element.tag])
+                if element.tag in ["h1", "h2", "h3"]:
+                    element.set("id", self.generate_id(element.text))
+
+
+class CustomClassExtension(Extension):
+    def extendMarkdown(self, md):
+        md.treeprocessors.register(CustomClassProcessor(md), "govuk_class", 5)
+
+
+def make_side_bar_items() -> Sidebar:
+    """
+    Loads all markdown files in the content directory
+    and creates the sidebar object
+    """
+    sidebar = Sidebar()
+    for file in _list_docs():
+        with open(os.path.join(DOCS_DIR, file), encoding="utf-8") as f:
+            content = f.read()
+            subheader = []
+            for line in content.split("\n"):
+                if line.startswith("# "):  # Header level 1
+                    header = line[2:].strip()
+                elif line.startswith("##"):  # Header level 2 or higher
+                    subheader.append(line[3:].strip())
+
+            sidebar.add_item(
+                SidebarItem(
+                    header=header,
+                    header_slug=slugify(header),
+                    subheader=subheader,
+                )
+            )
+    return sidebar
+
+
+def _list_docs() -> list[str]:
+    return sorted(doc for doc in os.listdir(DOCS_DIR) if doc.endswith(".md"))
+
+
+def render_markdown(content: str) -> str:
+    return markdown.markdown(
+        content,
+        extensions=[
+            "fenced_code",
+            "attr_list",
+            CustomClassExtension(),
+            "tables",
+        ],
+    )
+
+
+@dataclass
+class UserGuide:
+    sidebar: Sidebar
+    # Rendered pages keyed by their file name without the .md extension
+    pages: dict[str, str]
+
+
+def content_fingerprint() -> str:
+    """
+    Identifies the current version of the content from the name, size and modification
+    time of each file, so it can be checked on every request without reading the files.
+    """
+    parts = []
+    for doc in _list_docs():
+        stat = os.stat(os.path.join(DOCS_DIR, doc))
+        parts.append(f"{doc}:{stat.st_size}:{stat.st_mtime_ns}")
+    return ";".join(parts)
+
+
+def compile_user_guide() -> UserGuide:
+    """
+    Render the sidebar and every page of the user guide
+    """
+    pages = {}
+    for doc in _list_docs():
+        with open(os.path.join(DOCS_DIR, doc), encoding="utf-8") as f:
+            pages[doc.removesuffix(".md")] = render_markdown(f.read())
+    return UserGuide(sidebar=make_side_bar_items(), pages=pages)
+
+
+_compiled: tuple[str, UserGuide] | None = None
+
+
+def get_user_guide(refresh: bool = False) -> UserGuide:
+    """
+    Return the rendered user guide. The content only changes on deploy, so it is rendered
+    once per version of the content and kept in memory and in the shared cache, where
+    other workers and the build_userguide command can reuse it. The cache holds a single
+    entry alongside the fingerprint it was rendered from, so a deploy replaces it rather
+    than leaving the previous version behind.
+    """
+    global _compiled
+    fingerprint = content_fingerprint()
+    if not refresh and _compiled is not None and _compiled[0] == fingerprint:
+        return _compiled[1]
+
+    cached = None if refresh else cache.get(CACHE_KEY)
+    if cached is not None and cached[0] == fingerprint:
+        user_guide = cached[1]
+    else:
+        user_guide = compile_user_guide()
+        cache.set(CACHE_KEY, (fingerprint, user_guide), timeout=None)
+
+    _compiled = (fingerprint, user_guide)
+    return user_guide